@@ -13,12 +13,16 @@ Estructura modular en src/:
 - ui/: Interfaz gráfica (componentes, diálogos)
 """
 
+# Primero: fija el instante de referencia de los tiempos de arranque
+from src import arranque
+
 import tkinter as tk
 from src.app import VivasPlayApp
 
 
 def main():
     """Punto de entrada principal de la aplicación."""
+    arranque.marcar("modulos_importados")
     root = tk.Tk()
     app = VivasPlayApp(root)
     root.mainloop()
@@ -0,0 +1 @@
+"""Benchmarks de rendimiento de VivasPlay (se ejecutan desde la raíz del repositorio)."""
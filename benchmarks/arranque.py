@@ -0,0 +1,147 @@
+"""
+Benchmark del tiempo de importación en el arranque.
+
+Ejecuta varias veces `python -X importtime -c "import src.app"` en un
+proceso nuevo, toma la mediana del tiempo total de importación y la
+compara con el presupuesto guardado en presupuesto_arranque.json.
+También comprueba que los módulos que deben cargarse bajo demanda
+(diálogos, menú contextual, filedialog) no se importen al arrancar.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/arranque.py [--repeticiones N] [--actualizar]
+
+Termina con código 1 si se excede el presupuesto o si algún módulo
+diferido se importa durante el arranque.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVO_PRESUPUESTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'presupuesto_arranque.json')
+
+# Módulos que no deben importarse al arrancar
+MODULOS_DIFERIDOS = [
+    'src.ui.dialogs.edicion',
+    'src.ui.dialogs.edicion_lote',
+    'src.ui.dialogs.importar',
+    'src.ui.dialogs.resultado',
+    'src.ui.dialogs.exportar',
+    'src.ui.dialogs.diferencia',
+    'src.ui.dialogs.rendimiento',
+    'src.ui.dialogs.memoria',
+    'src.ui.dialogs.similares',
+    'src.ui.dialogs.plantillas',
+    'src.ui.components.menus',
+    'src.services.conjuntos',
+    'src.services.hll',
+    'src.services.similares',
+    'src.services.plantillas',
+    'src.services.memoria',
+    'tracemalloc',
+    'tkinter.filedialog',
+]
+
+# Margen sobre la medición al actualizar el presupuesto
+MARGEN_PRESUPUESTO = 1.8
+
+
+def medir_importacion() -> Tuple[float, Dict[str, int]]:
+    """
+    Importa src.app en un proceso nuevo con -X importtime.
+    
+    Returns:
+        Tupla con (milisegundos totales, {módulo: microsegundos propios}).
+    """
+    proceso = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import src.app'],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    
+    total_us = 0
+    propios: Dict[str, int] = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        modulo = nombre.strip()
+        propios[modulo] = int(propio)
+        # Solo las importaciones de primer nivel suman al total
+        if not nombre[1:].startswith(' '):
+            total_us += int(acumulado)
+    return total_us / 1000, propios
+
+
+def cargar_presupuesto() -> dict:
+    """Lee el presupuesto guardado (vacío si no existe)."""
+    if not os.path.exists(ARCHIVO_PRESUPUESTO):
+        return {}
+    with open(ARCHIVO_PRESUPUESTO, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def guardar_presupuesto(presupuesto: dict):
+    """Escribe el presupuesto en disco."""
+    with open(ARCHIVO_PRESUPUESTO, 'w', encoding='utf-8') as f:
+        json.dump(presupuesto, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main(argumentos: List[str] = None) -> int:
+    """Punto de entrada del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=5, help="procesos a medir (mediana)")
+    parser.add_argument('--top', type=int, default=10, help="módulos más lentos a listar")
+    parser.add_argument('--actualizar', action='store_true', help="guardar la medición como nuevo presupuesto")
+    args = parser.parse_args(argumentos)
+    
+    tiempos = []
+    propios: Dict[str, int] = {}
+    for _ in range(args.repeticiones):
+        total, propios = medir_importacion()
+        tiempos.append(total)
+    mediana = statistics.median(tiempos)
+    
+    print(f"Importación de src.app: mediana {mediana:.1f} ms "
+          f"(mín {min(tiempos):.1f}, máx {max(tiempos):.1f}, {len(tiempos)} procesos)")
+    print("\nMódulos con más tiempo propio (última medición):")
+    for modulo, us in sorted(propios.items(), key=lambda p: -p[1])[:args.top]:
+        print(f"  {us / 1000:7.2f} ms  {modulo}")
+    
+    correcto = True
+    
+    importados = [m for m in MODULOS_DIFERIDOS if m in propios]
+    if importados:
+        correcto = False
+        print("\nERROR: módulos diferidos importados durante el arranque:")
+        for modulo in importados:
+            print(f"  {modulo}")
+    
+    presupuesto = cargar_presupuesto()
+    if args.actualizar:
+        presupuesto['medido_ms'] = round(mediana)
+        presupuesto['presupuesto_ms'] = round(mediana * MARGEN_PRESUPUESTO)
+        guardar_presupuesto(presupuesto)
+        print(f"\nPresupuesto actualizado: {presupuesto['presupuesto_ms']} ms")
+    elif 'presupuesto_ms' in presupuesto:
+        limite = presupuesto['presupuesto_ms']
+        if mediana > limite:
+            correcto = False
+            print(f"\nERROR: {mediana:.1f} ms excede el presupuesto de {limite} ms")
+        else:
+            print(f"\nDentro del presupuesto ({limite} ms)")
+    
+    return 0 if correcto else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Generador de corpus sintético para los benchmarks.
+
+Produce líneas en todos los formatos que acepta ParserCorreos:
+- correo:puerto | VPN: PAIS notas
+- correo — PAIS
+- correo | VPN: PAIS1 PAIS2
+- correo:puerto notas
+- correo solo
+más líneas de ruido (sin correo válido) y duplicados (mismo email base
+con otro puerto o en mayúsculas). Con la misma semilla el corpus es
+idéntico entre ejecuciones, de modo que los resultados son comparables.
+"""
+
+import random
+from typing import List, Optional
+
+from src.models.registro import RegistroCorreo
+
+
+DOMINIOS = [
+    'gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com', 'proton.me',
+    'icloud.com', 'mail.ru', 'gmx.de', 'empresa.com.br', 'correo.es',
+]
+
+# Países frecuentes (pesan más) seguidos de algunos menos comunes
+PAISES = ['BR', 'US', 'AR', 'MX', 'ES', 'CO', 'CL', 'PE', 'DE', 'FR', 'GB', 'JP', 'CA', 'IT', 'PT']
+
+NOTAS = ['membresia', 'premium', 'revisar', 'familia', 'anual', 'prueba gratis', 'pago pendiente']
+
+RUIDO = [
+    '',
+    '-----------------------------',
+    'Lista de cuentas actualizada',
+    'n/a',
+    'usuario sin correo | VPN: BR',
+    'contacto@invalido',
+    '=== LOTE ===',
+]
+
+SEMILLA = 20240601
+
+
+def _email(aleatorio: random.Random, n: int) -> str:
+    """Construye un email único para el número n."""
+    nombre = aleatorio.choice(['ana', 'joao', 'maria', 'pedro', 'lucia', 'user', 'cliente', 'play'])
+    separador = aleatorio.choice(['', '.', '_'])
+    return f"{nombre}{separador}{n}@{aleatorio.choice(DOMINIOS)}"
+
+
+def _paises(aleatorio: random.Random, maximo: int = 3) -> List[str]:
+    """Elige entre 1 y maximo países sin repetir."""
+    return aleatorio.sample(PAISES[:8] if aleatorio.random() < 0.8 else PAISES, aleatorio.randint(1, maximo))
+
+
+def _linea(aleatorio: random.Random, email: str) -> str:
+    """Formatea un email con uno de los formatos soportados."""
+    formato = aleatorio.randrange(5)
+    puerto = f":{aleatorio.randint(1000, 65000)}"
+    if formato == 0:
+        return f"{email}{puerto} | VPN: {_paises(aleatorio, 1)[0]} {aleatorio.choice(NOTAS)}"
+    if formato == 1:
+        return f"{email} — {_paises(aleatorio, 1)[0]}"
+    if formato == 2:
+        return f"{email} | VPN: {' '.join(_paises(aleatorio))}"
+    if formato == 3:
+        return f"{email}{puerto} {aleatorio.choice(NOTAS)}"
+    return email
+
+
+def generar_lineas(
+    cantidad: int,
+    semilla: int = SEMILLA,
+    proporcion_duplicados: float = 0.05,
+    proporcion_ruido: float = 0.03,
+    desplazamiento: int = 0
+) -> List[str]:
+    """
+    Genera líneas de texto sintéticas.
+    
+    Args:
+        cantidad: Líneas con correo a generar (el ruido se añade aparte).
+        semilla: Semilla del generador.
+        proporcion_duplicados: Fracción de líneas que repiten un email anterior.
+        proporcion_ruido: Fracción de líneas de ruido añadidas.
+        desplazamiento: Primer número de email (para corpus disjuntos).
+    
+    Returns:
+        Lista de líneas.
+    """
+    aleatorio = random.Random(semilla)
+    lineas: List[str] = []
+    emails: List[str] = []
+    
+    for n in range(cantidad):
+        if emails and aleatorio.random() < proporcion_duplicados:
+            email = aleatorio.choice(emails)
+            if aleatorio.random() < 0.5:
+                email = email.upper()
+        else:
+            email = _email(aleatorio, desplazamiento + n)
+            emails.append(email)
+        lineas.append(_linea(aleatorio, email))
+        
+        if aleatorio.random() < proporcion_ruido:
+            lineas.append(aleatorio.choice(RUIDO))
+    
+    return lineas
+
+
+def generar_texto(cantidad: int, semilla: int = SEMILLA, **opciones) -> str:
+    """Genera el corpus como un único texto (como al pegar o leer un archivo)."""
+    return "\n".join(generar_lineas(cantidad, semilla, **opciones))
+
+
+def generar_registros(
+    cantidad: int,
+    semilla: int = SEMILLA,
+    desplazamiento: int = 0,
+    aleatorio: Optional[random.Random] = None
+) -> List[RegistroCorreo]:
+    """
+    Genera registros ya construidos (sin pasar por el parser ni duplicados).
+    
+    Args:
+        cantidad: Registros a generar.
+        semilla: Semilla del generador.
+        desplazamiento: Primer número de email.
+        aleatorio: Generador a usar en lugar de uno nuevo.
+    
+    Returns:
+        Lista de registros con emails únicos.
+    """
+    aleatorio = aleatorio or random.Random(semilla)
+    registros = []
+    for n in range(desplazamiento, desplazamiento + cantidad):
+        email = _email(aleatorio, n)
+        if aleatorio.random() < 0.4:
+            email += f":{aleatorio.randint(1000, 65000)}"
+        registros.append(RegistroCorreo(
+            correo=email,
+            vpn=aleatorio.random() < 0.35,
+            paises=_paises(aleatorio) if aleatorio.random() < 0.7 else [],
+            notas=aleatorio.choice(NOTAS) if aleatorio.random() < 0.3 else ""
+        ))
+    return registros
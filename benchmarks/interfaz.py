@@ -0,0 +1,318 @@
+"""
+Benchmark de respuesta de la interfaz bajo un servidor X virtual.
+
+Arranca VivasPlayApp con una lista sintética y la maneja con secuencias
+de eventos generados (carga, seleccionar todo, arrastre, edición,
+eliminación y copia). Mientras tanto un latido con after() mide el
+retraso del bucle de eventos: cada retraso por encima de UMBRAL_BLOQUEO
+cuenta como un bloqueo (frames perdidos).
+
+Si no hay DISPLAY se lanza Xvfb (debe estar instalado); también se puede
+usar `xvfb-run python benchmarks/interfaz.py`.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/interfaz.py [--tamaños 10000 100000] [--salida res.json]
+"""
+
+import argparse
+import json
+import os
+import select
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+from typing import Callable, Dict, List, Optional
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from benchmarks.corpus import generar_registros  # noqa: E402
+from src.services.storage import StorageJSON  # noqa: E402
+
+
+TAMAÑOS = [10_000, 100_000]
+
+# Intervalo del latido que mide el retraso del bucle de eventos (ms)
+INTERVALO_LATIDO = 10
+
+# Retraso a partir del cual se considera que la interfaz se bloqueó (ms)
+UMBRAL_BLOQUEO = 50
+
+# Tiempo máximo de espera de cada paso (s)
+LIMITE_PASO = 300
+
+# Segundos que se espera a que Xvfb esté listo
+ESPERA_XVFB = 10
+
+
+class MonitorLatencia:
+    """Latido periódico que registra cuánto se retrasa respecto a lo programado."""
+    
+    def __init__(self, root: tk.Tk):
+        self.root = root
+        self.retrasos: List[float] = []
+        self._esperado = 0.0
+        self._after_id = None
+    
+    def iniciar(self):
+        """Empieza a medir."""
+        self._esperado = time.perf_counter() + INTERVALO_LATIDO / 1000
+        self._after_id = self.root.after(INTERVALO_LATIDO, self._latido)
+    
+    def detener(self):
+        """Deja de medir."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _latido(self):
+        ahora = time.perf_counter()
+        self.retrasos.append(max(0.0, (ahora - self._esperado) * 1000))
+        self._esperado = ahora + INTERVALO_LATIDO / 1000
+        self._after_id = self.root.after(INTERVALO_LATIDO, self._latido)
+    
+    def tramo(self) -> Dict[str, float]:
+        """Resume y descarta los retrasos registrados desde el último tramo."""
+        retrasos, self.retrasos = sorted(self.retrasos), []
+        bloqueos = [r for r in retrasos if r > UMBRAL_BLOQUEO]
+        return {
+            'latencia_max_ms': round(retrasos[-1], 1) if retrasos else 0.0,
+            'latencia_p95_ms': round(retrasos[int(len(retrasos) * 0.95)], 1) if retrasos else 0.0,
+            'bloqueos': len(bloqueos),
+            'tiempo_bloqueado_ms': round(sum(bloqueos), 1),
+        }
+
+
+def esperar(root: tk.Tk, condicion: Callable[[], bool], limite: float = LIMITE_PASO):
+    """Procesa eventos hasta que se cumpla la condición."""
+    fin = time.perf_counter() + limite
+    while not condicion():
+        if time.perf_counter() > fin:
+            raise TimeoutError("La interfaz no terminó el paso a tiempo")
+        root.update()
+        time.sleep(0.001)
+    # Un último ciclo para que se dibujen los cambios
+    root.update()
+
+
+def _widgets(widget: tk.Misc) -> List[tk.Misc]:
+    """Recorre recursivamente los descendientes de un widget."""
+    resultado = []
+    for hijo in widget.winfo_children():
+        resultado.append(hijo)
+        resultado.extend(_widgets(hijo))
+    return resultado
+
+
+def _automatizar_messagebox() -> Callable[[], None]:
+    """Hace que los messagebox respondan solos; retorna la función que lo deshace."""
+    from tkinter import messagebox
+    originales = {nombre: getattr(messagebox, nombre) for nombre in (
+        'askyesno', 'askyesnocancel', 'showinfo', 'showwarning', 'showerror'
+    )}
+    messagebox.askyesno = lambda *a, **k: True
+    messagebox.askyesnocancel = lambda *a, **k: False
+    for nombre in ('showinfo', 'showwarning', 'showerror'):
+        setattr(messagebox, nombre, lambda *a, **k: 'ok')
+    
+    def restaurar():
+        for nombre, funcion in originales.items():
+            setattr(messagebox, nombre, funcion)
+    return restaurar
+
+
+def ejecutar_escenario(cantidad: int) -> Dict[str, Dict[str, float]]:
+    """
+    Arranca la aplicación con `cantidad` registros y ejecuta los pasos.
+    
+    Returns:
+        Por paso: duración y métricas de latencia.
+    """
+    from src.app import VivasPlayApp
+    
+    resultados: Dict[str, Dict[str, float]] = {}
+    directorio_original = os.getcwd()
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        restaurar = _automatizar_messagebox()
+        root = tk.Tk()
+        root.geometry("1000x700")
+        try:
+            StorageJSON().guardar_registros(generar_registros(cantidad))
+            monitor = MonitorLatencia(root)
+            monitor.iniciar()
+            
+            def paso(nombre: str, accion: Callable[[], None], hasta: Callable[[], bool]):
+                root.update()
+                monitor.tramo()
+                inicio = time.perf_counter()
+                accion()
+                esperar(root, hasta)
+                metricas = {'duracion_ms': round((time.perf_counter() - inicio) * 1000, 1)}
+                metricas.update(monitor.tramo())
+                resultados[nombre] = metricas
+            
+            contenedor: Dict[str, VivasPlayApp] = {}
+            paso(
+                'carga',
+                lambda: contenedor.setdefault('app', VivasPlayApp(root)),
+                lambda: contenedor['app'].cargado and not contenedor['app'].tabla.esta_cargando()
+            )
+            app = contenedor['app']
+            arbol = app.tabla.tabla
+            
+            def seleccionar_todo():
+                arbol.focus_force()
+                root.update()
+                arbol.event_generate('<Control-a>')
+            
+            paso('seleccionar_todo', seleccionar_todo, lambda: True)
+            paso('deseleccionar', lambda: arbol.event_generate('<Escape>'), lambda: True)
+            
+            def arrastrar():
+                filas = arbol.get_children()
+                caja = arbol.bbox(filas[0]) if filas else None
+                if not caja:
+                    return
+                x, y = caja[0] + 20, caja[1] + caja[3] // 2
+                arbol.event_generate('<ButtonPress-1>', x=x, y=y)
+                destino = y
+                for destino in range(y, arbol.winfo_height() - 5, max(1, caja[3] // 2)):
+                    arbol.event_generate('<Motion>', x=x, y=destino, state=0x100)
+                    root.update()
+                arbol.event_generate('<ButtonRelease-1>', x=x, y=destino, state=0x100)
+            
+            paso('arrastre', arrastrar, lambda: True)
+            
+            def editar():
+                app._editar_registro(0)
+                root.update()
+                dialogo = [w for w in root.winfo_children() if isinstance(w, tk.Toplevel)][-1]
+                entradas = [w for w in _widgets(dialogo) if w.winfo_class() == 'TEntry']
+                entradas[-1].insert(tk.END, " editado")
+                boton = next(
+                    w for w in _widgets(dialogo)
+                    if w.winfo_class() == 'TButton' and w.cget('text') == "Guardar"
+                )
+                boton.invoke()
+            
+            paso('editar', editar, lambda: not app.tabla.esta_cargando())
+            
+            def eliminar():
+                arbol.selection_set(arbol.get_children()[:50])
+                app._eliminar_seleccion()
+            
+            paso('eliminar', eliminar, lambda: not app.tabla.esta_cargando())
+            
+            def copiar():
+                seleccionar_todo()
+                arbol.event_generate('<Control-c>')
+            
+            paso('copiar', copiar, lambda: root.cget('cursor') == '')
+            
+            monitor.detener()
+        finally:
+            root.destroy()
+            restaurar()
+            os.chdir(directorio_original)
+    
+    return resultados
+
+
+def _iniciar_xvfb() -> Optional[subprocess.Popen]:
+    """
+    Lanza Xvfb si no hay DISPLAY; retorna el proceso (None si ya había pantalla).
+    
+    Con -displayfd, Xvfb elige una pantalla libre y escribe su número en
+    el pipe cuando está lista para aceptar conexiones.
+    """
+    if os.environ.get('DISPLAY'):
+        return None
+    ejecutable = shutil.which('Xvfb')
+    if not ejecutable:
+        raise RuntimeError("No hay DISPLAY ni Xvfb instalado (prueba con xvfb-run)")
+    
+    lectura, escritura = os.pipe()
+    errores = tempfile.TemporaryFile()
+    try:
+        proceso = subprocess.Popen(
+            [ejecutable, '-displayfd', str(escritura), '-screen', '0', '1280x1024x24', '-nolisten', 'tcp'],
+            stdout=subprocess.DEVNULL,
+            stderr=errores,
+            pass_fds=(escritura,)
+        )
+        os.close(escritura)
+        escritura = None
+        
+        salida = b''
+        fin = time.perf_counter() + ESPERA_XVFB
+        while not salida.endswith(b'\n'):
+            restante = fin - time.perf_counter()
+            if restante <= 0 or not select.select([lectura], [], [], restante)[0]:
+                proceso.kill()
+                raise RuntimeError(f"Xvfb no indicó su pantalla en {ESPERA_XVFB} s")
+            bloque = os.read(lectura, 64)
+            if not bloque:
+                # Pipe cerrado sin número: Xvfb terminó al arrancar
+                proceso.wait()
+                errores.seek(0)
+                error = errores.read().decode(errors='replace').strip()
+                raise RuntimeError(
+                    f"Xvfb terminó al arrancar (código {proceso.returncode})"
+                    + (f": {error.splitlines()[-1]}" if error else "")
+                )
+            salida += bloque
+    finally:
+        os.close(lectura)
+        if escritura is not None:
+            os.close(escritura)
+        errores.close()
+    
+    os.environ['DISPLAY'] = f":{salida.decode().strip()}"
+    return proceso
+
+
+def main(argumentos: List[str] = None) -> int:
+    """Punto de entrada del benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamaños', type=int, nargs='+', default=TAMAÑOS, help="registros en la lista")
+    parser.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argumentos)
+    
+    try:
+        xvfb = _iniciar_xvfb()
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 2
+    
+    resultado = {'umbral_bloqueo_ms': UMBRAL_BLOQUEO, 'resultados': {}}
+    try:
+        for cantidad in args.tamaños:
+            pasos = ejecutar_escenario(cantidad)
+            resultado['resultados'][str(cantidad)] = pasos
+            
+            print(f"\n{cantidad} registros:")
+            print(f"  {'paso':<18}{'duración':>12}{'lat. máx':>12}{'lat. p95':>12}{'bloqueos':>10}")
+            for nombre, m in pasos.items():
+                print(f"  {nombre:<18}{m['duracion_ms']:>10.1f}ms{m['latencia_max_ms']:>10.1f}ms"
+                      f"{m['latencia_p95_ms']:>10.1f}ms{m['bloqueos']:>10}")
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\nResultados guardados en {args.salida}")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+Suite de benchmarks de extremo a extremo (sin interfaz).
+
+Mide parseo, índices, deduplicación, añadir, eliminar, contar, casi
+duplicados, guardar, cargar, exportar y comparar con archivo sobre un corpus sintético (ver corpus.py) de 10k, 100k
+y 1M registros, con el mismo código que usa la aplicación. Los
+resultados se escriben en JSON para compararlos entre commits.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/suite.py [--tamaños 10000 100000] [--salida res.json]
+    python benchmarks/suite.py --comparar base.json [--umbral 0.25]
+
+Con --comparar termina con código 1 si alguna operación es más lenta que
+la base en más del umbral (y de UMBRAL_ABSOLUTO segundos).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from benchmarks.corpus import generar_registros, generar_texto  # noqa: E402
+from src.services.conjuntos import ejecutar_operacion  # noqa: E402
+from src.services.diferencias import (  # noqa: E402
+    calcular_diferencia_añadir,
+    calcular_diferencia_eliminar,
+    posibles_existentes
+)
+from src.services.estadisticas import contar_registros  # noqa: E402
+from src.services.exportador import ExportadorRegistros  # noqa: E402
+from src.services.indices import IndiceRegistros  # noqa: E402
+from src.services.parser import ParserCorreos  # noqa: E402
+from src.services.similares import buscar_similares  # noqa: E402
+from src.services.storage import StorageJSON  # noqa: E402
+
+
+TAMAÑOS = [10_000, 100_000, 1_000_000]
+
+# Diferencias menores que esto (segundos) no cuentan como regresión
+UMBRAL_ABSOLUTO = 0.005
+
+
+def cronometrar(
+    funcion: Callable[[object], object],
+    preparar: Optional[Callable[[], object]] = None,
+    repeticiones: int = 3
+) -> float:
+    """
+    Mide la mejor de varias ejecuciones.
+    
+    Args:
+        funcion: Operación a medir; recibe lo que retorne preparar.
+        preparar: Preparación no cronometrada antes de cada ejecución.
+        repeticiones: Ejecuciones a realizar.
+    
+    Returns:
+        Segundos de la ejecución más rápida.
+    """
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        datos = preparar() if preparar else None
+        inicio = time.perf_counter()
+        funcion(datos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def medir_tamaño(cantidad: int, repeticiones: int, directorio: str) -> Dict[str, float]:
+    """
+    Ejecuta todas las operaciones para un tamaño de corpus.
+    
+    Args:
+        cantidad: Líneas del corpus de entrada.
+        repeticiones: Ejecuciones por operación (se toma la mejor).
+        directorio: Carpeta temporal para los archivos.
+    
+    Returns:
+        Segundos por operación.
+    """
+    texto = generar_texto(cantidad)
+    entrantes = ParserCorreos.procesar_texto_a_registros(texto)
+    # La mitad de la lista existente coincide con la entrada
+    existentes = entrantes[::2] + generar_registros(len(entrantes) // 2, desplazamiento=10 * cantidad)
+    resultados: Dict[str, float] = {}
+    
+    resultados['parsear'] = cronometrar(
+        lambda _: ParserCorreos.procesar_texto_a_registros(texto), repeticiones=repeticiones
+    )
+    resultados['indexar'] = cronometrar(
+        lambda _: IndiceRegistros().reconstruir(existentes), repeticiones=repeticiones
+    )
+    indice_existentes = IndiceRegistros(existentes)
+    resultados['deduplicar'] = cronometrar(
+        lambda _: calcular_diferencia_añadir(
+            existentes, entrantes, 0, posibles_existentes(entrantes, indice_existentes.emails())
+        ),
+        repeticiones=repeticiones
+    )
+    # Caso típico de añadir a mano o desde un archivo pequeño: todo es nuevo
+    pocos = generar_registros(100, desplazamiento=20 * cantidad)
+    resultados['deduplicar_100_nuevos'] = cronometrar(
+        lambda _: calcular_diferencia_añadir(
+            existentes, pocos, 0, posibles_existentes(pocos, indice_existentes.emails())
+        ),
+        repeticiones=repeticiones
+    )
+    
+    diferencia = calcular_diferencia_añadir(existentes, entrantes)
+    
+    def preparar_lista():
+        indice = IndiceRegistros()
+        indice.reconstruir(existentes)
+        return list(existentes), indice
+    
+    def añadir(datos):
+        lista, indice = datos
+        lista.extend(diferencia.nuevos)
+        indice.agregar(diferencia.nuevos)
+    
+    def eliminar(datos):
+        lista, indice = datos
+        candidatos = posibles_existentes(entrantes, indice.emails())
+        posiciones = set(calcular_diferencia_eliminar(lista, entrantes, 0, candidatos).a_eliminar)
+        indice.eliminar(posiciones)
+        lista[:] = [reg for i, reg in enumerate(lista) if i not in posiciones]
+    
+    resultados['añadir'] = cronometrar(añadir, preparar_lista, repeticiones)
+    resultados['eliminar'] = cronometrar(eliminar, preparar_lista, repeticiones)
+    resultados['contar'] = cronometrar(
+        lambda indice: contar_registros(entrantes, indice.emails()),
+        lambda: IndiceRegistros(existentes),
+        repeticiones
+    )
+    resultados['casi_duplicados'] = cronometrar(
+        lambda _: buscar_similares(existentes), repeticiones=repeticiones
+    )
+    
+    storage = StorageJSON(os.path.join(directorio, 'correos.json'))
+    resultados['guardar'] = cronometrar(
+        lambda _: storage.guardar_registros(existentes), repeticiones=repeticiones
+    )
+    resultados['cargar'] = cronometrar(lambda _: storage.cargar_registros(), repeticiones=repeticiones)
+    
+    for formato in ('txt', 'csv', 'jsonl'):
+        ruta = os.path.join(directorio, f'exportado.{formato}')
+        resultados[f'exportar_{formato}'] = cronometrar(
+            lambda _: ExportadorRegistros.exportar(existentes, ruta, formato), repeticiones=repeticiones
+        )
+    
+    
+    ruta_entrada = os.path.join(directorio, 'entrada.txt')
+    with open(ruta_entrada, 'w', encoding='utf-8') as f:
+        f.write(texto)
+    indice = IndiceRegistros(existentes)
+    for operacion in ('no_en_lista', 'faltan_en_archivo'):
+        ruta = os.path.join(directorio, f'{operacion}.txt')
+        resultados[f'comparar_{operacion}'] = cronometrar(
+            lambda _: ejecutar_operacion(operacion, ruta_entrada, ruta, indice.emails(), existentes),
+            repeticiones=repeticiones
+        )
+    
+    return resultados
+
+
+def _commit_actual() -> Optional[str]:
+    """Hash corto del commit actual, si hay git disponible."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(base: dict, actual: dict, umbral: float) -> List[str]:
+    """
+    Compara dos resultados y lista las regresiones.
+    
+    Args:
+        base: Resultados de referencia.
+        actual: Resultados nuevos.
+        umbral: Empeoramiento relativo tolerado (0.25 = 25%).
+    
+    Returns:
+        Descripción de cada operación que empeoró más del umbral.
+    """
+    regresiones = []
+    for tamaño, operaciones in actual['resultados'].items():
+        referencia = base.get('resultados', {}).get(tamaño, {})
+        for operacion, segundos in operaciones.items():
+            anterior = referencia.get(operacion)
+            if anterior is None:
+                continue
+            if segundos > anterior * (1 + umbral) and segundos - anterior > UMBRAL_ABSOLUTO:
+                regresiones.append(
+                    f"{operacion} @ {tamaño}: {anterior:.4f}s -> {segundos:.4f}s "
+                    f"(+{(segundos / anterior - 1) * 100:.0f}%)"
+                )
+    return regresiones
+
+
+def main(argumentos: List[str] = None) -> int:
+    """Punto de entrada de la suite."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tamaños', type=int, nargs='+', default=TAMAÑOS, help="tamaños del corpus")
+    parser.add_argument('--repeticiones', type=int, default=3, help="ejecuciones por operación (mejor tiempo)")
+    parser.add_argument('--salida', help="archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', help="JSON de referencia para detectar regresiones")
+    parser.add_argument('--umbral', type=float, default=0.25, help="empeoramiento relativo tolerado")
+    args = parser.parse_args(argumentos)
+    
+    resultado = {
+        'meta': {
+            'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _commit_actual(),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'repeticiones': args.repeticiones,
+        },
+        'resultados': {},
+    }
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        for cantidad in args.tamaños:
+            # Con 1M de registros una sola ejecución ya es representativa
+            repeticiones = 1 if cantidad >= 1_000_000 else args.repeticiones
+            tiempos = medir_tamaño(cantidad, repeticiones, directorio)
+            resultado['resultados'][str(cantidad)] = {op: round(s, 6) for op, s in tiempos.items()}
+            
+            print(f"\n{cantidad} registros:")
+            for operacion, segundos in tiempos.items():
+                print(f"  {operacion:<26} {segundos * 1000:10.1f} ms")
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\nResultados guardados en {args.salida}")
+    
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        regresiones = comparar(base, resultado, args.umbral)
+        if regresiones:
+            print(f"\nREGRESIONES (umbral {args.umbral:.0%}):")
+            for linea in regresiones:
+                print(f"  {linea}")
+            return 1
+        print(f"\nSin regresiones respecto a {args.comparar} (umbral {args.umbral:.0%})")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
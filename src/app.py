@@ -4,22 +4,51 @@ Clase principal de la aplicación VivasPlay.
 Coordina los componentes UI con los servicios de negocio.
 """
 
+import os
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-from typing import List, Optional
+from tkinter import ttk, messagebox
+from typing import TYPE_CHECKING, AbstractSet, List, Optional, Sequence, Tuple
 
+from . import arranque
 from .models.registro import RegistroCorreo
+from .models import normalizacion
 from .services.parser import ParserCorreos
 from .services.storage import StorageJSON
-from .config import PATRON_EMAIL, MENSAJES
+from .services.preferencias import AlmacenPreferencias
+from .services.indices import IndiceRegistros
+from .services.estadisticas import EstadisticasRegistros, contar_registros
+from .services.exportador import ExportadorRegistros
+from .services.edicion_lote import EdicionLote
+from .services.historial import Cambio, Historial, Insertados, Quitados, Reemplazado
+from .services import instrumentacion
+from .services.diferencias import (
+    DiferenciaImportacion,
+    calcular_diferencia_añadir,
+    calcular_diferencia_eliminar,
+    posibles_existentes
+)
+from .config import (
+    PATRON_EMAIL,
+    MENSAJES,
+    UMBRAL_COPIA_ARCHIVO,
+    UMBRAL_CONTEO_APROXIMADO,
+    VARIABLE_MEMORIA
+)
 from .ui.styles import configurar_estilos
+from .ui.tareas import TareaSegundoPlano
 from .ui.components.tabla import TablaCorreos
 from .ui.components.toolbar import BarraHerramientas
 from .ui.components.entrada import PanelEntrada
-from .ui.components.menus import MenuContextual
-from .ui.dialogs.edicion import DialogoEdicion
-from .ui.dialogs.importar import DialogoImportar
-from .ui.dialogs.resultado import mostrar_resultado
+from .ui.components.filtros import BarraFiltros
+# Los diálogos se cargan al usarlos por primera vez (ver ui/dialogs/__init__.py)
+from .ui import dialogs
+
+# Los servicios de acciones concretas del menú (conteo aproximado, comparar
+# con archivo, casi duplicados, formatos de línea, memoria) se importan en su
+# manejador para no alargar el arranque (ver benchmarks/arranque.py)
+if TYPE_CHECKING:
+    from .services.plantillas import PlantillaFormato
+    from .services.similares import ResultadoSimilares
 
 
 class VivasPlayApp:
@@ -43,19 +72,59 @@ class VivasPlayApp:
         
         # Servicios
         self.storage = StorageJSON()
+        self.almacen_preferencias = AlmacenPreferencias()
+        
+        # Preferencias guardadas: se aplican antes de cargar los registros,
+        # que calculan sus claves con las reglas de normalización activas
+        self.preferencias, error_preferencias = self.almacen_preferencias.cargar()
+        if 'normalizar_proveedores' in self.preferencias:
+            normalizacion.set_reglas_proveedor(bool(self.preferencias['normalizar_proveedores']))
+        
+        # Formatos de línea definidos por el usuario (se leen al primer uso)
+        self.almacen_plantillas = None
+        self._plantillas: Optional[List['PlantillaFormato']] = None
+        
+        # El diagnóstico de memoria (tracemalloc) se carga solo si se pide
+        self._diagnostico_memoria = bool(os.environ.get(VARIABLE_MEMORIA))
+        if self._diagnostico_memoria:
+            from .services import memoria
+            memoria.iniciar()
         
         # Lista de registros en memoria
         self.registros: List[RegistroCorreo] = []
         
+        # Índices de búsqueda sobre los registros
+        self.indice = IndiceRegistros()
+        
+        # Totales agregados de la lista (VPN, países, notas, dominios)
+        self.estadisticas = EstadisticasRegistros()
+        
+        # Se incrementa en cada mutación; invalida diferencias precalculadas
+        self._revision = 0
+        
+        # Cambios de cada acción para deshacer/rehacer (Ctrl+Z / Ctrl+Y)
+        self.historial = Historial()
+        
+        # True mientras una operación larga corre en segundo plano
+        self._ocupado = False
+        
+        # False mientras los registros se cargan en segundo plano
+        self.cargado = False
+        
         # Configurar estilos antes de crear UI
         configurar_estilos()
         
         # Crear interfaz
         self._crear_interfaz()
+        self._configurar_atajos()
+        arranque.marcar("interfaz_creada")
+        if error_preferencias:
+            messagebox.showwarning("Preferencias", f"{error_preferencias}\nSe usarán los valores por defecto.")
+        self._instantanea_memoria("inicio")
         
-        # Cargar datos
+        # Cargar datos sin bloquear: la ventana se pinta mientras tanto
+        self.root.after_idle(arranque.marcar, "ventana_visible")
         self._cargar_registros()
-        self._actualizar_vista()
     
     def _crear_interfaz(self):
         """Crea todos los componentes de la interfaz."""
@@ -74,19 +143,41 @@ class VivasPlayApp:
             'contar_archivo': self.contar_desde_archivo,
             'contar_portapapeles': self.contar_desde_portapapeles,
             'contar_ventana': self.contar_desde_ventana,
+            'conjunto_no_en_lista': lambda: self.comparar_con_archivo('no_en_lista'),
+            'conjunto_en_lista': lambda: self.comparar_con_archivo('en_lista'),
+            'conjunto_faltan': lambda: self.comparar_con_archivo('faltan_en_archivo'),
+            'similares': self.buscar_casi_duplicados,
             'exportar': self.exportar_registros,
-            'ver_patron': lambda: messagebox.showinfo("Patrón Email", f"Patrón actual:\n{PATRON_EMAIL}")
+            'exportar_particionado': self.exportar_particionado,
+            'ver_patron': lambda: messagebox.showinfo("Patrón Email", f"Patrón actual:\n{PATRON_EMAIL}"),
+            'plantillas': self.mostrar_plantillas,
+            'normalizacion': self._alternar_normalizacion,
+            'instrumentacion': self._alternar_instrumentacion,
+            'rendimiento': self.mostrar_rendimiento,
+            'memoria': self.mostrar_memoria
         })
+        self.toolbar.var_instrumentacion.set(instrumentacion.esta_activa())
+        self.toolbar.var_normalizacion.set(normalizacion.get_reglas().reglas_proveedor)
         self.toolbar.grid(row=0, column=0, sticky='w', pady=(0, 5))
         
+        # Barra de filtros
+        self.barra_filtros = BarraFiltros(
+            self.marco,
+            on_cambio=self._actualizar_vista,
+            obtener_dominios=lambda: self.indice.get_dominios(),
+            obtener_paises=lambda: self.indice.get_paises()
+        )
+        self.barra_filtros.grid(row=1, column=0, sticky='ew', pady=(0, 5))
+        
         # Tabla de correos
         self.tabla = TablaCorreos(
             self.marco,
             on_doble_click=self._editar_registro,
             on_seleccion_cambio=self._on_seleccion_cambio,
-            on_click_derecho=self._mostrar_menu_contextual
+            on_click_derecho=self._mostrar_menu_contextual,
+            on_copiar=self._copiar_seleccion
         )
-        self.tabla.grid(row=1, column=0, sticky='nsew')
+        self.tabla.grid(row=2, column=0, sticky='nsew')
         
         # Panel de entrada
         self.panel_entrada = PanelEntrada(
@@ -96,30 +187,107 @@ class VivasPlayApp:
         )
         self.panel_entrada.pack(fill=tk.X, padx=5, pady=5)
         
-        # Menú contextual
-        self.menu_contextual = MenuContextual(
-            self.root,
-            on_copiar=self._copiar_seleccion,
-            on_copiar_fila=self._copiar_fila_completa,
-            on_eliminar=self._eliminar_seleccion,
-            on_seleccionar_todos=self.tabla.seleccionar_todos,
-            on_deseleccionar=self.tabla.deseleccionar_todos
-        )
+        # Menú contextual (se construye al primer click derecho)
+        self.menu_contextual = None
         
         # Configurar grid
         self.marco.grid_columnconfigure(0, weight=1)
-        self.marco.grid_rowconfigure(1, weight=1)
+        self.marco.grid_rowconfigure(2, weight=1)
+    
+    def _configurar_atajos(self):
+        """Configura los atajos de teclado de la ventana principal."""
+        for secuencia in ("<Control-z>", "<Control-Z>"):
+            self.root.bind(secuencia, self.deshacer)
+        for secuencia in ("<Control-y>", "<Control-Y>"):
+            self.root.bind(secuencia, self.rehacer)
     
     # ==================== Carga y guardado ====================
     
     def _cargar_registros(self):
-        """Carga los registros desde el archivo."""
+        """
+        Carga los registros desde el archivo en un hilo auxiliar.
+        
+        Mientras dura la carga las acciones de edición quedan
+        deshabilitadas; al terminar la tabla se llena por lotes.
+        """
+        self._set_cargando(True)
+        TareaSegundoPlano(
+            self.root,
+            self._leer_registros,
+            on_terminado=self._carga_terminada,
+            on_error=self._carga_fallida
+        )
+    
+    def _leer_registros(self):
+        """Lee el archivo y construye los índices (se ejecuta en el hilo auxiliar)."""
         registros, error = self.storage.cargar_registros()
+        arranque.marcar("registros_leidos")
+        
+        # Índice nuevo: el actual puede consultarse desde la interfaz mientras tanto
+        indice = IndiceRegistros()
+        indice.reconstruir(registros)
+        estadisticas = EstadisticasRegistros(registros)
+        arranque.marcar("indice_construido")
+        return registros, indice, estadisticas, error
+    
+    def _carga_terminada(self, resultado):
+        """Instala los registros cargados y empieza a llenar la tabla."""
+        registros, indice, estadisticas, error = resultado
         self.registros = registros
+        self.indice = indice
+        self.estadisticas = estadisticas
+        self._revision += 1
+        self.historial.limpiar()
+        self._set_cargando(False)
+        self._instantanea_memoria("carga")
+        
+        self._actualizar_vista()
+        arranque.marcar("primera_pantalla")
+        self._esperar_tabla_completa()
         
         if error:
             messagebox.showwarning("Advertencia", f"{error}\nSe iniciará con una lista vacía.")
     
+    def _carga_fallida(self, error: BaseException):
+        """Arranca con una lista vacía si la carga falló de forma inesperada."""
+        self._set_cargando(False)
+        self._actualizar_vista()
+        messagebox.showwarning(
+            "Advertencia",
+            f"No se pudieron cargar los registros: {error}\nSe iniciará con una lista vacía."
+        )
+    
+    def _set_cargando(self, cargando: bool):
+        """Refleja el estado de carga en la interfaz."""
+        self.cargado = not cargando
+        self.toolbar.set_acciones_habilitadas(not cargando)
+        self.panel_entrada.set_habilitado(not cargando)
+        self.root.config(cursor='watch' if cargando else '')
+        if cargando:
+            self.panel_entrada.mostrar_mensaje("Cargando registros...")
+    
+    def _set_ocupado(self, ocupado: bool):
+        """
+        Bloquea las acciones mientras una operación larga corre en segundo plano.
+        
+        La operación puede estar leyendo la lista o el índice de emails:
+        además de la barra se deshabilita la entrada, y las acciones de la
+        tabla (editar, eliminar) no hacen nada hasta que termine.
+        """
+        self._ocupado = ocupado
+        self.toolbar.set_acciones_habilitadas(not ocupado)
+        self.panel_entrada.set_habilitado(not ocupado)
+        self.root.config(cursor='watch' if ocupado else '')
+    
+    def _esperar_tabla_completa(self):
+        """Registra el fin del llenado progresivo de la tabla."""
+        if self.tabla.esta_cargando():
+            self.root.after(100, self._esperar_tabla_completa)
+            return
+        arranque.marcar("tabla_completa")
+        arranque.informar()
+        self._instantanea_memoria("render")
+    
     def _guardar_registros(self) -> bool:
         """Guarda los registros en el archivo."""
         exito, error = self.storage.guardar_registros(self.registros)
@@ -128,99 +296,257 @@ class VivasPlayApp:
         return exito
     
     def _actualizar_vista(self):
-        """Actualiza la tabla y contadores."""
-        self.tabla.actualizar(self.registros)
+        """Actualiza la tabla y contadores aplicando los filtros activos."""
+        if not self.cargado:
+            return
+        
+        criterios = self.barra_filtros.get_criterios()
+        indices = self.indice.filtrar(**criterios)
+        
+        if self.barra_filtros.get_agrupado():
+            self.tabla.actualizar_agrupado(
+                self.registros,
+                self.indice.resumir_dominios(indices),
+                lambda dominio: self.indice.filtrar(**dict(criterios, dominio=dominio))
+            )
+        else:
+            self.tabla.actualizar(self.registros, indices, progresivo=True)
+        self.barra_filtros.mostrar_resultado(
+            None if indices is None else len(indices),
+            len(self.registros)
+        )
         self.panel_entrada.actualizar_contador(0, len(self.registros))
+        self.panel_entrada.mostrar_estadisticas(self.estadisticas.resumen())
     
     def _on_seleccion_cambio(self, cantidad: int):
         """Callback cuando cambia la selección."""
         self.panel_entrada.actualizar_contador(cantidad, len(self.registros))
     
+    # ==================== Mutaciones ====================
+    
+    def _insertar_registros(self, nuevos: List[RegistroCorreo]):
+        """Añade registros al final de la lista y de los índices."""
+        if not nuevos:
+            return
+        inicio = len(self.registros)
+        self.registros.extend(nuevos)
+        self.indice.agregar(nuevos)
+        self.estadisticas.agregar(nuevos)
+        self._revision += 1
+        self.historial.registrar(Insertados(range(inicio, len(self.registros))))
+    
+    def _insertar_en_posiciones(self, posiciones: Sequence[int], nuevos: List[RegistroCorreo]):
+        """
+        Inserta registros en posiciones concretas de la lista y de los índices.
+        
+        Args:
+            posiciones: Posiciones en la lista resultante, ascendentes.
+            nuevos: Registros a insertar, en el mismo orden.
+        """
+        if not nuevos:
+            return
+        registros = []
+        k = 0
+        for j, (posicion, reg) in enumerate(zip(posiciones, nuevos)):
+            registros.extend(self.registros[k:posicion - j])
+            registros.append(reg)
+            k = posicion - j
+        registros.extend(self.registros[k:])
+        self.registros = registros
+        self.indice.insertar(list(posiciones), nuevos)
+        self.estadisticas.agregar(nuevos)
+        self._revision += 1
+        self.historial.registrar(Insertados(posiciones))
+    
+    def _quitar_posiciones(self, posiciones: set):
+        """Quita de la lista y de los índices los registros en las posiciones dadas."""
+        if not posiciones:
+            return
+        ordenadas = sorted(posiciones)
+        self.historial.registrar(Quitados(ordenadas, [self.registros[p] for p in ordenadas]))
+        self.indice.eliminar(posiciones)
+        self.estadisticas.quitar(self.registros[p] for p in posiciones)
+        self.registros = [
+            reg for i, reg in enumerate(self.registros)
+            if i not in posiciones
+        ]
+        self._revision += 1
+    
+    def _reemplazar_registro(self, indice: int, registro: RegistroCorreo):
+        """Sustituye el registro de una posición manteniendo los índices."""
+        self.historial.registrar(Reemplazado(indice, self.registros[indice]))
+        self.estadisticas.reemplazar(self.registros[indice], registro)
+        self.registros[indice] = registro
+        self.indice.reemplazar(indice, registro)
+        self._revision += 1
+    
     # ==================== Operaciones CRUD ====================
     
-    def _obtener_emails_existentes(self) -> set:
-        """Obtiene el conjunto de emails base existentes."""
-        return {r.get_email_base().lower() for r in self.registros}
+    def _obtener_emails_existentes(self) -> AbstractSet[str]:
+        """Obtiene los emails base existentes (vista del índice, sin copiarlos)."""
+        return self.indice.emails()
     
     def _ejecutar_añadir(self, registros: List[RegistroCorreo], origen: str = ""):
-        """Añade registros a la lista."""
-        emails_existentes = self._obtener_emails_existentes()
+        """Añade registros a la lista tras mostrar la vista previa de cambios."""
+        self._ensayar('añadir', registros, origen)
+    
+    def _ejecutar_eliminar(self, registros: List[RegistroCorreo], origen: str = ""):
+        """Elimina registros de la lista tras mostrar la vista previa de cambios."""
+        self._ensayar('eliminar', registros, origen)
+    
+    def _ensayar(self, operacion: str, registros: List[RegistroCorreo], origen: str):
+        """
+        Calcula en segundo plano la diferencia (dry-run) de una operación.
         
-        registros_nuevos = []
-        for reg in registros:
-            email_base = reg.get_email_base().lower()
-            if email_base not in emails_existentes:
-                registros_nuevos.append(reg)
-                emails_existentes.add(email_base)
+        Args:
+            operacion: 'añadir' o 'eliminar'.
+            registros: Registros recibidos.
+            origen: Texto del origen para los títulos.
+        """
+        calcular = calcular_diferencia_añadir if operacion == 'añadir' else calcular_diferencia_eliminar
+        # Copia superficial: el hilo auxiliar no ve mutaciones posteriores
+        existentes = list(self.registros)
+        # Prefiltro con el índice de emails: los entrantes que no están son
+        # nuevos seguro y no se buscan en la lista (si ninguno está, no se recorre)
+        candidatos = posibles_existentes(registros, self.indice.emails())
         
-        duplicados = len(registros) - len(registros_nuevos)
+        self.root.config(cursor='watch')
+        TareaSegundoPlano(
+            self.root,
+            calcular,
+            existentes,
+            registros,
+            self._revision,
+            candidatos,
+            on_terminado=lambda dif: self._mostrar_diferencia(dif, existentes, registros, origen),
+            on_error=self._error_ensayo
+        )
+    
+    def _error_ensayo(self, error: BaseException):
+        """Informa de un fallo al calcular la vista previa."""
+        self.root.config(cursor='')
+        messagebox.showerror("Error", f"No se pudo calcular la vista previa: {error}")
+    
+    def _mostrar_diferencia(
+        self,
+        diferencia: DiferenciaImportacion,
+        existentes: List[RegistroCorreo],
+        registros: List[RegistroCorreo],
+        origen: str
+    ):
+        """Muestra la vista previa o avisa si no hay nada que cambiar."""
+        self.root.config(cursor='')
         
-        if not registros_nuevos:
+        if diferencia.operacion == 'añadir' and not (diferencia.nuevos or diferencia.modificados):
             messagebox.showinfo(
                 "Registros duplicados",
                 f"Todos los registros ({len(registros)}) ya existen en la lista."
             )
             return
+        if diferencia.operacion == 'eliminar' and not diferencia.a_eliminar:
+            messagebox.showinfo(
+                "Sin coincidencias",
+                f"Ninguno de los registros ({len(registros)}) existe en la lista."
+            )
+            return
+        
+        titulo = "Añadir" if diferencia.operacion == 'añadir' else "Eliminar"
+        dialogs.DialogoDiferencia(
+            self.root,
+            f"Vista previa - {titulo}{origen}",
+            diferencia,
+            existentes,
+            lambda dif, actualizar: self._aplicar_diferencia(dif, actualizar, registros, origen)
+        )
+    
+    def _aplicar_diferencia(
+        self,
+        diferencia: DiferenciaImportacion,
+        actualizar_modificados: bool,
+        registros: List[RegistroCorreo],
+        origen: str
+    ):
+        """Aplica una diferencia ya calculada, si la lista no cambió desde entonces."""
+        if diferencia.revision != self._revision:
+            messagebox.showinfo(
+                "Lista modificada",
+                "La lista cambió mientras se revisaba la vista previa. Se volverá a calcular."
+            )
+            self._ensayar(diferencia.operacion, registros, origen)
+            return
         
-        self.registros.extend(registros_nuevos)
+        if diferencia.operacion == 'añadir':
+            self._aplicar_añadir(diferencia, actualizar_modificados, origen)
+        else:
+            self._aplicar_eliminar(diferencia, origen)
+    
+    def _aplicar_añadir(self, diferencia: DiferenciaImportacion, actualizar_modificados: bool, origen: str):
+        """Inserta los nuevos y, opcionalmente, actualiza los que difieren."""
+        actualizados = 0
+        with self.historial.accion(f"Añadir {len(diferencia.nuevos)} registros{origen}"):
+            if actualizar_modificados:
+                for indice, actual, entrante, _ in diferencia.modificados:
+                    self._reemplazar_registro(indice, RegistroCorreo(
+                        correo=actual.correo,
+                        vpn=entrante.vpn,
+                        paises=list(entrante.paises),
+                        notas=entrante.notas,
+                        clave=actual.clave
+                    ))
+                    actualizados += 1
+            
+            self._insertar_registros(diferencia.nuevos)
         self._guardar_registros()
+        self._instantanea_memoria("importacion")
         self._actualizar_vista()
         
-        mensaje = f"Se insertaron {len(registros_nuevos)} registros."
-        if duplicados > 0:
-            mensaje += f"\n{duplicados} ya existían y se omitieron."
+        omitidos = len(diferencia.duplicados) + len(diferencia.modificados) - actualizados
+        mensaje = f"Se insertaron {len(diferencia.nuevos)} registros."
+        if actualizados:
+            mensaje += f"\nSe actualizaron {actualizados} registros existentes."
+        if omitidos > 0:
+            mensaje += f"\n{omitidos} ya existían y se omitieron."
         
-        mostrar_resultado(self.root, f"Resultado - Añadir{origen}", mensaje)
+        dialogs.mostrar_resultado(self.root, f"Resultado - Añadir{origen}", mensaje)
     
-    def _ejecutar_eliminar(self, registros: List[RegistroCorreo], origen: str = ""):
-        """Elimina registros de la lista."""
-        emails_a_eliminar = {r.get_email_base().lower() for r in registros}
-        
-        registros_originales = len(self.registros)
-        self.registros = [
-            r for r in self.registros
-            if r.get_email_base().lower() not in emails_a_eliminar
-        ]
-        
-        eliminados = registros_originales - len(self.registros)
-        no_encontrados = len(registros) - eliminados
-        
+    def _aplicar_eliminar(self, diferencia: DiferenciaImportacion, origen: str):
+        """Elimina las posiciones calculadas en la diferencia."""
+        with self.historial.accion(f"Eliminar {len(diferencia.a_eliminar)} registros{origen}"):
+            self._quitar_posiciones(set(diferencia.a_eliminar))
         self._guardar_registros()
         self._actualizar_vista()
         
-        mensaje = f"Se eliminaron {eliminados} registros."
-        if no_encontrados > 0:
-            mensaje += f"\n{no_encontrados} no existían en la lista."
+        mensaje = f"Se eliminaron {len(diferencia.a_eliminar)} registros."
+        if diferencia.no_encontrados:
+            mensaje += f"\n{len(diferencia.no_encontrados)} no existían en la lista."
         
-        mostrar_resultado(self.root, f"Resultado - Eliminar{origen}", mensaje)
+        dialogs.mostrar_resultado(self.root, f"Resultado - Eliminar{origen}", mensaje)
     
     def _ejecutar_contar(self, registros: List[RegistroCorreo], origen: str = ""):
         """Cuenta y muestra información sobre registros."""
-        emails_existentes = self._obtener_emails_existentes()
-        
-        total = len(registros)
-        con_vpn = sum(1 for r in registros if r.vpn)
-        con_paises = sum(1 for r in registros if r.paises)
-        existentes = sum(1 for r in registros if r.get_email_base().lower() in emails_existentes)
-        nuevos = total - existentes
+        conteo = contar_registros(registros, self._obtener_emails_existentes())
         
-        mensaje = f"Se encontraron {total} registros válidos."
-        mensaje += f"\n\n• Con VPN: {con_vpn}"
-        mensaje += f"\n• Con países: {con_paises}"
-        mensaje += f"\n• Ya existen: {existentes}"
-        mensaje += f"\n• Nuevos: {nuevos}"
+        mensaje = f"Se encontraron {conteo['total']} registros válidos."
+        mensaje += f"\n\n• Con VPN: {conteo['con_vpn']}"
+        mensaje += f"\n• Con países: {conteo['con_paises']}"
+        mensaje += f"\n• Ya existen: {conteo['existentes']}"
+        mensaje += f"\n• Nuevos: {conteo['nuevos']}"
         
-        mostrar_resultado(self.root, f"Resultado - Contar{origen}", mensaje)
+        dialogs.mostrar_resultado(self.root, f"Resultado - Contar{origen}", mensaje)
     
     # ==================== Desde archivo ====================
     
-    def _obtener_registros_desde_archivo(self) -> Optional[List[RegistroCorreo]]:
-        """Obtiene registros desde un archivo de texto."""
-        ruta = filedialog.askopenfilename(
+    def _pedir_archivo(self) -> Optional[str]:
+        """Pide al usuario un archivo de texto de entrada."""
+        from tkinter import filedialog
+        return filedialog.askopenfilename(
             title="Seleccionar archivo",
             filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
-        )
-        
+        ) or None
+    
+    def _obtener_registros_desde_archivo(self, ruta: Optional[str] = None) -> Optional[List[RegistroCorreo]]:
+        """Obtiene registros desde un archivo de texto (lo pide si no se indica)."""
+        ruta = ruta or self._pedir_archivo()
         if not ruta:
             return None
         
@@ -256,17 +582,222 @@ class VivasPlayApp:
             self._ejecutar_eliminar(registros, " (archivo)")
     
     def contar_desde_archivo(self):
-        """Cuenta registros desde un archivo."""
-        registros = self._obtener_registros_desde_archivo()
+        """
+        Cuenta registros desde un archivo.
+        
+        Con archivos mayores que UMBRAL_CONTEO_APROXIMADO se ofrece un
+        conteo aproximado (HyperLogLog) que no carga el archivo en memoria.
+        """
+        ruta = self._pedir_archivo()
+        if not ruta:
+            return
+        
+        try:
+            tamaño = os.path.getsize(ruta)
+        except OSError:
+            tamaño = 0
+        if tamaño > UMBRAL_CONTEO_APROXIMADO:
+            respuesta = messagebox.askyesnocancel(
+                "Archivo grande",
+                f"El archivo ocupa {tamaño / (1024 * 1024):.0f} MB.\n\n"
+                "¿Contar de forma aproximada? Usa memoria fija y es más rápido, "
+                "con un error de alrededor del 2%.\n\n"
+                "Sí: aproximado    No: exacto"
+            )
+            if respuesta is None:
+                return
+            if respuesta:
+                self._contar_aproximado(ruta)
+                return
+        
+        registros = self._obtener_registros_desde_archivo(ruta)
         if registros:
             self._ejecutar_contar(registros, " (archivo)")
     
+    def _contar_aproximado(self, ruta: str):
+        """Lanza el conteo aproximado de un archivo en un hilo auxiliar."""
+        from .services.hll import contar_archivo_aproximado
+        self._set_ocupado(True)
+        TareaSegundoPlano(
+            self.root,
+            contar_archivo_aproximado,
+            ruta,
+            self.indice.emails(),
+            on_terminado=self._conteo_aproximado_terminado,
+            on_error=lambda error: self._conteo_aproximado_terminado((None, str(error)))
+        )
+    
+    def _conteo_aproximado_terminado(self, resultado):
+        """Muestra las estimaciones del conteo aproximado con su margen."""
+        self._set_ocupado(False)
+        conteo, error = resultado
+        if error:
+            messagebox.showerror("Error", error)
+            return
+        
+        def linea(titulo: str, categoria: str) -> str:
+            return f"\n• {titulo}: ~{conteo.estimaciones[categoria]} (± {conteo.margen(categoria)})"
+        
+        mensaje = f"Se leyeron {conteo.lineas} líneas ({conteo.validas} con correo válido)."
+        mensaje += f"\n\nCorreos distintos: ~{conteo.estimaciones['unicos']} (± {conteo.margen('unicos')})"
+        mensaje += "\n"
+        mensaje += linea("Con VPN", 'con_vpn')
+        mensaje += linea("Con países", 'con_paises')
+        mensaje += linea("Ya existen", 'existentes')
+        mensaje += linea("Nuevos", 'nuevos')
+        mensaje += (
+            f"\n\nConteo aproximado (HyperLogLog, {conteo.memoria // 1024} KB): "
+            f"margen del {conteo.error_relativo:.1%} con ~95% de confianza."
+        )
+        dialogs.mostrar_resultado(self.root, "Resultado - Contar (archivo, aproximado)", mensaje)
+    
+    # ==================== Comparar con archivo ====================
+    
+    def comparar_con_archivo(self, operacion: str):
+        """
+        Compara un archivo con la lista y guarda el resultado en otro archivo.
+        
+        El archivo se procesa en streaming en un hilo auxiliar (ver
+        services/conjuntos.py), sin cargarlo entero en memoria.
+        
+        Args:
+            operacion: 'no_en_lista', 'en_lista' o 'faltan_en_archivo'.
+        """
+        from tkinter import filedialog
+        from .services.conjuntos import OPERACIONES, ejecutar_operacion
+        entrada = filedialog.askopenfilename(
+            title="Archivo a comparar",
+            filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
+        )
+        if not entrada:
+            return
+        
+        # Las líneas del archivo se copian tal cual; los registros de la lista
+        # se escriben en el formato de exportación que indique la extensión
+        tipos = (
+            ExportadorRegistros.TIPOS_ARCHIVO if operacion == 'faltan_en_archivo'
+            else [("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
+        )
+        salida = filedialog.asksaveasfilename(
+            title=f"Guardar resultado - {OPERACIONES[operacion]}",
+            defaultextension=".txt",
+            filetypes=tipos
+        )
+        if not salida:
+            return
+        if os.path.abspath(salida) == os.path.abspath(entrada):
+            messagebox.showerror("Error", "El archivo de salida debe ser distinto del de entrada.")
+            return
+        
+        # Los emails se consultan en el índice vivo; los registros se copian
+        # porque se recorren después de leer todo el archivo
+        registros = list(self.registros) if operacion == 'faltan_en_archivo' else ()
+        self._set_ocupado(True)
+        TareaSegundoPlano(
+            self.root,
+            ejecutar_operacion,
+            operacion,
+            entrada,
+            salida,
+            self.indice.emails(),
+            registros,
+            on_terminado=lambda resultado: self._comparacion_terminada(resultado, salida),
+            on_error=lambda error: self._comparacion_terminada((None, str(error)), salida)
+        )
+    
+    def _comparacion_terminada(self, resultado, salida: str):
+        """Muestra el resumen de una comparación con archivo."""
+        from .services.conjuntos import OPERACIONES
+        self._set_ocupado(False)
+        conjunto, error = resultado
+        if error:
+            messagebox.showerror("Error", error)
+            return
+        
+        unidad = "registros" if conjunto.operacion == 'faltan_en_archivo' else "líneas"
+        mensaje = f"{OPERACIONES[conjunto.operacion]}."
+        mensaje += f"\n\nSe leyeron {conjunto.lineas} líneas ({conjunto.unicos} correos distintos)."
+        mensaje += f"\nSe escribieron {conjunto.escritos} {unidad} en:\n{salida}"
+        dialogs.mostrar_resultado(self.root, "Resultado - Comparar con archivo", mensaje)
+    
+    # ==================== Casi duplicados ====================
+    
+    def buscar_casi_duplicados(self):
+        """
+        Busca grupos de correos casi iguales (erratas) en segundo plano.
+        
+        La búsqueda usa bloqueo por dominio y vecindario de borrados (ver
+        services/similares.py), por lo que escala casi linealmente.
+        """
+        if not self.registros:
+            messagebox.showinfo("Sin datos", "No hay registros en la lista.")
+            return
+        
+        from .services.similares import buscar_similares
+        registros = list(self.registros)
+        self._set_ocupado(True)
+        TareaSegundoPlano(
+            self.root,
+            buscar_similares,
+            registros,
+            on_terminado=lambda resultado: self._similares_encontrados(resultado, registros),
+            on_error=self._error_similares
+        )
+    
+    def _similares_encontrados(self, resultado: 'ResultadoSimilares', registros: List[RegistroCorreo]):
+        """Muestra los grupos de casi duplicados encontrados."""
+        self._set_ocupado(False)
+        if not resultado.grupos:
+            messagebox.showinfo("Sin casi duplicados", "No se encontraron correos casi iguales en la lista.")
+            return
+        
+        # El diálogo trabaja con los registros, no con posiciones, porque
+        # la lista puede cambiar entre una acción y la siguiente
+        dialogs.DialogoSimilares(
+            self.root,
+            [[registros[i] for i in grupo] for grupo in resultado.grupos],
+            on_fusionar=self._fusionar_similares,
+            on_eliminar=self._eliminar_similares
+        )
+    
+    def _error_similares(self, error: Exception):
+        """Informa de un error en la búsqueda de casi duplicados."""
+        self._set_ocupado(False)
+        messagebox.showerror("Error", f"No se pudo completar la búsqueda: {error}")
+    
+    def _fusionar_similares(self, fusiones: List[Tuple[RegistroCorreo, List[RegistroCorreo]]]):
+        """Fusiona cada grupo en su registro conservado con un solo guardado."""
+        from .services.similares import fusionar_registros
+        posiciones = {id(reg): i for i, reg in enumerate(self.registros)}
+        quitar = set()
+        with self.historial.accion(f"Fusionar {len(fusiones)} grupos de casi duplicados"):
+            for conservar, otros in fusiones:
+                posicion = posiciones.get(id(conservar))
+                if posicion is None:
+                    continue
+                vivos = [reg for reg in otros if id(reg) in posiciones]
+                self._reemplazar_registro(posicion, fusionar_registros(conservar, vivos))
+                quitar.update(posiciones[id(reg)] for reg in vivos)
+            
+            self._quitar_posiciones(quitar)
+        self._guardar_registros()
+        self._actualizar_vista()
+    
+    def _eliminar_similares(self, registros: List[RegistroCorreo]):
+        """Elimina los registros elegidos en el diálogo de casi duplicados."""
+        ids = {id(reg) for reg in registros}
+        with self.historial.accion(f"Eliminar {len(registros)} casi duplicados"):
+            self._quitar_posiciones({i for i, reg in enumerate(self.registros) if id(reg) in ids})
+        self._guardar_registros()
+        self._actualizar_vista()
+    
     # ==================== Desde portapapeles ====================
     
     def _obtener_registros_desde_portapapeles(self) -> Optional[List[RegistroCorreo]]:
         """Obtiene registros desde el portapapeles."""
         try:
-            texto = self.root.clipboard_get()
+            with instrumentacion.medir('portapapeles.leer'):
+                texto = self.root.clipboard_get()
         except tk.TclError:
             texto = ""
         
@@ -304,32 +835,40 @@ class VivasPlayApp:
     
     def añadir_desde_ventana(self):
         """Abre ventana para añadir registros."""
-        DialogoImportar(
+        dialogs.DialogoImportar(
             self.root,
             "Añadir Registros",
-            lambda regs: self._ejecutar_añadir(regs, " (ventana)")
+            lambda regs: self._ejecutar_añadir(regs, " (ventana)"),
+            obtener_existentes=self._obtener_emails_existentes,
+            plantillas=self._obtener_plantillas()
         )
     
     def eliminar_desde_ventana(self):
         """Abre ventana para eliminar registros."""
-        DialogoImportar(
+        dialogs.DialogoImportar(
             self.root,
             "Eliminar Registros",
-            lambda regs: self._ejecutar_eliminar(regs, " (ventana)")
+            lambda regs: self._ejecutar_eliminar(regs, " (ventana)"),
+            obtener_existentes=self._obtener_emails_existentes,
+            plantillas=self._obtener_plantillas()
         )
     
     def contar_desde_ventana(self):
         """Abre ventana para contar registros."""
-        DialogoImportar(
+        dialogs.DialogoImportar(
             self.root,
             "Contar Registros",
-            lambda regs: self._ejecutar_contar(regs, " (ventana)")
+            lambda regs: self._ejecutar_contar(regs, " (ventana)"),
+            obtener_existentes=self._obtener_emails_existentes,
+            plantillas=self._obtener_plantillas()
         )
     
     # ==================== Entrada individual ====================
     
     def agregar_correo(self):
         """Agrega un registro desde el campo de entrada."""
+        if self._ocupado:
+            return
         texto = self.panel_entrada.get_texto()
         
         if not texto:
@@ -341,18 +880,20 @@ class VivasPlayApp:
             messagebox.showwarning("Entrada inválida", "No se encontró un correo electrónico válido.")
             return
         
-        email_base = registro.get_email_base().lower()
-        if email_base in self._obtener_emails_existentes():
+        if self.indice.contiene_email(registro.get_clave()):
             messagebox.showinfo("Duplicado", "Este correo ya existe en la lista.")
             return
         
-        self.registros.append(registro)
+        with self.historial.accion(f"Agregar {registro.correo}"):
+            self._insertar_registros([registro])
         self._guardar_registros()
         self._actualizar_vista()
         self.panel_entrada.limpiar()
     
     def eliminar_correo(self):
         """Elimina registros según contexto."""
+        if self._ocupado:
+            return
         seleccion = self.tabla.get_seleccion()
         
         # Si hay selección, eliminar seleccionados
@@ -374,11 +915,9 @@ class VivasPlayApp:
         if not email:
             return
         
-        email_base = email.split(':')[0].lower() if ':' in email else email.lower()
+        clave = normalizacion.clave_email(email.split(':')[0])
         
-        existe = any(r.get_email_base().lower() == email_base for r in self.registros)
-        
-        if not existe:
+        if not self.indice.contiene_email(clave):
             messagebox.showinfo("No encontrado", "El correo no existe en la lista.")
             return
         
@@ -388,10 +927,11 @@ class VivasPlayApp:
         ):
             return
         
-        self.registros = [
-            r for r in self.registros
-            if r.get_email_base().lower() != email_base
-        ]
+        with self.historial.accion(f"Eliminar {email}"):
+            self._quitar_posiciones({
+                i for i, r in enumerate(self.registros)
+                if r.get_clave() == clave
+            })
         
         self._guardar_registros()
         self._actualizar_vista()
@@ -400,42 +940,280 @@ class VivasPlayApp:
     # ==================== Exportar ====================
     
     def exportar_registros(self):
-        """Exporta los registros a archivo de texto."""
+        """Exporta los registros a archivo (TXT, CSV o JSONL según la extensión)."""
         if not self.registros:
             messagebox.showinfo("Sin datos", "No hay registros para exportar.")
             return
         
+        from tkinter import filedialog
         ruta = filedialog.asksaveasfilename(
             title="Exportar registros",
             defaultextension=".txt",
-            filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
+            filetypes=ExportadorRegistros.TIPOS_ARCHIVO
         )
         
         if not ruta:
             return
         
-        try:
-            with open(ruta, 'w', encoding='utf-8') as f:
-                for reg in self.registros:
-                    linea = reg.correo
-                    if reg.vpn or reg.paises:
-                        linea += " | VPN:" if reg.vpn else " |"
-                        if reg.paises:
-                            linea += " " + " ".join(reg.paises)
-                    if reg.notas:
-                        linea += " " + reg.notas
-                    f.write(linea.strip() + "\n")
-            
+        exito, error = ExportadorRegistros.exportar(self.registros, ruta)
+        if exito:
             messagebox.showinfo("Éxito", f"Se exportaron {len(self.registros)} registros correctamente.")
-        except IOError as e:
-            messagebox.showerror("Error", f"No se pudo exportar los registros: {e}")
+        else:
+            messagebox.showerror("Error", error)
+    
+    def exportar_particionado(self):
+        """Exporta los registros repartidos por país, dominio o bloques."""
+        if not self.registros:
+            messagebox.showinfo("Sin datos", "No hay registros para exportar.")
+            return
+        
+        dialogs.DialogoExportarParticionado(self.root, self._ejecutar_exportar_particionado)
+    
+    def _ejecutar_exportar_particionado(self, criterio: str, formato: str, tamaño_bloque: int):
+        """Pide la carpeta de destino y escribe las particiones."""
+        from tkinter import filedialog
+        directorio = filedialog.askdirectory(title="Carpeta de destino")
+        if not directorio:
+            return
+        
+        conteos, error = ExportadorRegistros.exportar_particionado(
+            self.registros,
+            directorio,
+            criterio,
+            formato=formato,
+            tamaño_bloque=tamaño_bloque
+        )
+        if error:
+            messagebox.showerror("Error", error)
+            return
+        
+        mensaje = f"Se exportaron {len(self.registros)} registros en {len(conteos)} archivos."
+        mensaje += f"\nManifiesto: {ExportadorRegistros.NOMBRE_MANIFIESTO}"
+        dialogs.mostrar_resultado(self.root, "Resultado - Exportar particionado", mensaje)
+    
+    # ==================== Normalización ====================
+    
+    def _alternar_normalizacion(self, activa: bool):
+        """Activa o desactiva las reglas de proveedor y renormaliza la lista."""
+        if not self.cargado or self._ocupado:
+            # Otra operación usa las claves actuales: se deja la opción como estaba
+            self.toolbar.var_normalizacion.set(normalizacion.get_reglas().reglas_proveedor)
+            return
+        self.toolbar.var_normalizacion.set(activa)
+        reglas = normalizacion.con_reglas_proveedor(activa)
+        if reglas != normalizacion.get_reglas():
+            self._renormalizar_registros(reglas)
+    
+    def _renormalizar_registros(self, reglas: normalizacion.ReglasNormalizacion):
+        """
+        Recalcula de una vez la clave de todos los registros con nuevas reglas.
+        
+        Las claves se calculan en segundo plano sobre una copia de la lista.
+        Hasta asignarlas, en el hilo de la interfaz y junto con el índice de
+        emails, siguen activas las reglas anteriores: así las altas y
+        ediciones de mientras tanto se comparan con claves coherentes.
+        
+        Args:
+            reglas: Reglas a activar.
+        """
+        registros = list(self.registros)
+        
+        def calcular():
+            with instrumentacion.medir('normalizacion.claves'):
+                return [normalizacion.clave_email(reg.get_email_base(), reglas) for reg in registros]
+        
+        self._set_ocupado(True)
+        TareaSegundoPlano(
+            self.root,
+            calcular,
+            on_terminado=lambda claves: self._claves_recalculadas(registros, claves, reglas),
+            on_error=self._error_renormalizacion
+        )
+    
+    def _claves_recalculadas(
+        self,
+        registros: List[RegistroCorreo],
+        claves: List[str],
+        reglas: normalizacion.ReglasNormalizacion
+    ):
+        """Activa las reglas, asigna las claves recalculadas y reindexa los emails."""
+        for reg, clave in zip(registros, claves):
+            reg.clave = clave
+        normalizacion.set_reglas(reglas)
+        
+        # Los registros añadidos o editados durante el cálculo tienen la
+        # clave de las reglas anteriores
+        copiados = {id(reg) for reg in registros}
+        for reg in self.registros:
+            if id(reg) not in copiados:
+                reg.clave = normalizacion.clave_email(reg.get_email_base())
+        self.indice.reindexar_emails()
+        self._revision += 1
+        self._set_ocupado(False)
+        self._guardar_preferencia('normalizar_proveedores', reglas.reglas_proveedor)
+        
+        repetidos = len(self.registros) - len(self.indice.emails())
+        if repetidos:
+            messagebox.showinfo(
+                "Normalización",
+                f"Con las reglas actuales, {repetidos} registro(s) repiten el correo de otro.\n"
+                "Se conservan en la lista; las próximas importaciones los tratarán como duplicados."
+            )
+    
+    def _guardar_preferencia(self, clave: str, valor):
+        """Guarda una preferencia para las próximas sesiones."""
+        self.preferencias[clave] = valor
+        exito, error = self.almacen_preferencias.guardar(self.preferencias)
+        if not exito:
+            messagebox.showwarning("Preferencias", error)
+    
+    def _error_renormalizacion(self, error: Exception):
+        """Informa de un error al recalcular las claves."""
+        self._set_ocupado(False)
+        self.toolbar.var_normalizacion.set(normalizacion.get_reglas().reglas_proveedor)
+        messagebox.showerror("Error", f"No se pudieron recalcular las claves de los correos: {error}")
+    
+    # ==================== Formatos de línea ====================
+    
+    def _obtener_plantillas(self) -> List['PlantillaFormato']:
+        """Retorna los formatos de línea, leyéndolos del archivo la primera vez."""
+        if self._plantillas is None:
+            from .services.plantillas import AlmacenPlantillas
+            self.almacen_plantillas = AlmacenPlantillas()
+            self._plantillas, error = self.almacen_plantillas.cargar()
+            if error:
+                messagebox.showwarning("Formatos de línea", error)
+        return self._plantillas
+    
+    def mostrar_plantillas(self):
+        """Abre el gestor de formatos de línea."""
+        dialogs.DialogoPlantillas(
+            self.root,
+            self._obtener_plantillas(),
+            on_guardar=self._guardar_plantillas
+        )
+    
+    def _guardar_plantillas(self, plantillas: List['PlantillaFormato']) -> bool:
+        """Guarda los formatos de línea; retorna True si se pudieron guardar."""
+        exito, error = self.almacen_plantillas.guardar(plantillas)
+        if not exito:
+            messagebox.showerror("Error", error)
+            return False
+        self._plantillas = list(plantillas)
+        return True
+    
+    # ==================== Rendimiento ====================
+    
+    def _alternar_instrumentacion(self, activa: bool):
+        """Activa o desactiva la medición de tiempos."""
+        instrumentacion.activar(activa)
+        self.toolbar.var_instrumentacion.set(activa)
+    
+    def mostrar_rendimiento(self):
+        """Abre la ventana con los tiempos de las operaciones medidas."""
+        dialogs.DialogoRendimiento(self.root, on_alternar=self._alternar_instrumentacion)
+    
+    def mostrar_memoria(self):
+        """Abre el informe de memoria (tracemalloc y estimación de la tabla)."""
+        self._diagnostico_memoria = True
+        dialogs.DialogoMemoria(
+            self.root,
+            obtener_informe=self._generar_informe_memoria,
+            on_instantanea=lambda: self._instantanea_memoria("manual")
+        )
+    
+    def _instantanea_memoria(self, etiqueta: str):
+        """
+        Toma una instantánea de memoria si el diagnóstico está activo.
+        
+        Args:
+            etiqueta: Punto en el que se toma (ej: 'carga').
+        """
+        if self._diagnostico_memoria:
+            from .services import memoria
+            memoria.instantanea(etiqueta, len(self.registros))
+    
+    def _generar_informe_memoria(self) -> str:
+        """Construye el informe de memoria con los registros y la tabla actuales."""
+        from .services import memoria
+        total_items, muestra = self.tabla.muestra_items()
+        return memoria.generar_informe(self.registros, total_items, muestra)
+    
+    # ==================== Deshacer y rehacer ====================
+    
+    def deshacer(self, event: Optional[tk.Event] = None):
+        """Deshace la última acción sobre la lista (Ctrl+Z)."""
+        return self._mover_historial(self.historial.deshacer, "Deshecho", "Nada que deshacer", event)
+    
+    def rehacer(self, event: Optional[tk.Event] = None):
+        """Rehace la última acción deshecha (Ctrl+Y)."""
+        return self._mover_historial(self.historial.rehacer, "Rehecho", "Nada que rehacer", event)
+    
+    def _mover_historial(self, mover, verbo: str, vacio: str, event: Optional[tk.Event]):
+        """
+        Deshace o rehace un paso con un solo guardado y refresco.
+        
+        Si el paso solo reemplazó registros, las filas se repintan en su
+        sitio; si insertó o quitó, se rehace la vista.
+        
+        Args:
+            mover: historial.deshacer o historial.rehacer.
+            verbo: Texto del mensaje de estado ('Deshecho' o 'Rehecho').
+            vacio: Mensaje de estado si no hay nada que mover.
+            event: Evento del atajo de teclado (None si no viene de uno).
+        """
+        # En los campos de texto el atajo deshace la escritura, no la lista
+        if event is not None and isinstance(event.widget, (tk.Entry, tk.Text)):
+            return None
+        if not self.cargado or self._ocupado:
+            return "break"
+        
+        reemplazados = []
+        solo_reemplazos = True
+        
+        def revertir(cambio: Cambio):
+            nonlocal solo_reemplazos
+            if isinstance(cambio, Reemplazado):
+                self._reemplazar_registro(cambio.posicion, self._con_clave_vigente(cambio.anterior))
+                reemplazados.append(cambio.posicion)
+            elif isinstance(cambio, Insertados):
+                solo_reemplazos = False
+                self._quitar_posiciones(set(cambio.posiciones))
+            else:
+                solo_reemplazos = False
+                self._insertar_en_posiciones(
+                    cambio.posiciones,
+                    [self._con_clave_vigente(reg) for reg in cambio.registros]
+                )
+        
+        with instrumentacion.medir('historial.mover'):
+            descripcion = mover(revertir)
+        if descripcion is None:
+            self.panel_entrada.mostrar_mensaje(vacio)
+            return "break"
+        
+        self._guardar_registros()
+        if solo_reemplazos:
+            self._refrescar_filas(reemplazados)
+        else:
+            self._actualizar_vista()
+        self.panel_entrada.mostrar_mensaje(f"{verbo}: {descripcion}")
+        return "break"
+    
+    @staticmethod
+    def _con_clave_vigente(registro: RegistroCorreo) -> RegistroCorreo:
+        """Recalcula la clave de un registro restaurado (las reglas pudieron cambiar)."""
+        registro.clave = normalizacion.clave_email(registro.get_email_base())
+        return registro
     
     # ==================== Edición y selección ====================
     
     def _editar_registro(self, indice: int):
         """Abre el diálogo de edición para un registro."""
+        if self._ocupado:
+            return
         if 0 <= indice < len(self.registros):
-            DialogoEdicion(
+            dialogs.DialogoEdicion(
                 self.root,
                 self.registros[indice],
                 on_guardar=lambda reg: self._guardar_edicion(indice, reg),
@@ -444,18 +1222,85 @@ class VivasPlayApp:
     
     def _guardar_edicion(self, indice: int, registro: RegistroCorreo):
         """Guarda los cambios de edición."""
-        self.registros[indice] = registro
+        with self.historial.accion(f"Editar {registro.correo}"):
+            self._reemplazar_registro(indice, registro)
         self._guardar_registros()
         self._actualizar_vista()
     
     def _eliminar_registro(self, indice: int):
         """Elimina un registro por índice."""
-        self.registros.pop(indice)
+        with self.historial.accion(f"Eliminar {self.registros[indice].correo}"):
+            self._quitar_posiciones({indice})
         self._guardar_registros()
         self._actualizar_vista()
     
+    def _editar_seleccion(self):
+        """Abre la edición en lote de los registros seleccionados."""
+        if self._ocupado:
+            return
+        indices = self.tabla.get_indices_seleccion()
+        if not indices:
+            return
+        revision = self._revision
+        dialogs.DialogoEdicionLote(
+            self.root,
+            len(indices),
+            on_aplicar=lambda edicion: self._aplicar_edicion_lote(indices, edicion, revision)
+        )
+    
+    def _aplicar_edicion_lote(self, indices: List[int], edicion: EdicionLote, revision: int):
+        """
+        Aplica una edición a varios registros con un solo guardado.
+        
+        Sin filtros, las filas editadas se repintan en su sitio en lugar de
+        reconstruir la tabla (ver _refrescar_filas).
+        
+        Args:
+            indices: Posiciones de los registros seleccionados.
+            edicion: Cambio a aplicar.
+            revision: Revisión de la lista al abrir el diálogo.
+        """
+        if revision != self._revision:
+            messagebox.showwarning(
+                "Editar selección",
+                "La lista cambió mientras se editaba. Vuelve a seleccionar los registros."
+            )
+            return
+        
+        editados = []
+        with instrumentacion.medir('edicion.lote'), self.historial.accion(f"Editar {len(indices)} registros"):
+            for i in indices:
+                nuevo = edicion.aplicar(self.registros[i])
+                if nuevo is not None:
+                    self._reemplazar_registro(i, nuevo)
+                    editados.append(i)
+        if not editados:
+            messagebox.showinfo("Editar selección", "Los registros seleccionados ya tenían esos valores.")
+            return
+        
+        self._guardar_registros()
+        self._refrescar_filas(editados)
+    
+    def _refrescar_filas(self, posiciones: List[int]):
+        """
+        Repinta las filas editadas sin rehacer toda la tabla.
+        
+        Con un filtro activo o la vista agrupada, la edición puede cambiar
+        qué filas se muestran y los totales: se actualiza la vista completa.
+        
+        Args:
+            posiciones: Posiciones de los registros reemplazados.
+        """
+        if self.barra_filtros.get_agrupado() or self.barra_filtros.hay_filtro():
+            self._actualizar_vista()
+        else:
+            self.tabla.actualizar_filas(self.registros, posiciones)
+            self.panel_entrada.mostrar_estadisticas(self.estadisticas.resumen())
+    
     def _eliminar_seleccion(self):
         """Elimina los registros seleccionados."""
+        if self._ocupado:
+            return
         seleccion = self.tabla.get_seleccion()
         if not seleccion:
             return
@@ -468,18 +1313,15 @@ class VivasPlayApp:
             mensaje = f"¿Estás seguro de eliminar este correo?\n\n{correo}"
             titulo = "Confirmar eliminación"
         else:
-            mensaje = f"¿Estás seguro de eliminar {cantidad} correos seleccionados?\n\nEsta acción no se puede deshacer."
+            mensaje = f"¿Estás seguro de eliminar {cantidad} correos seleccionados?\n\nPuedes deshacerlo con Ctrl+Z."
             titulo = "Confirmar eliminación múltiple"
         
         if not messagebox.askyesno(titulo, mensaje):
             return
         
         # Eliminar por índices
-        indices_a_eliminar = {idx for idx, _ in seleccion}
-        self.registros = [
-            reg for i, reg in enumerate(self.registros)
-            if i not in indices_a_eliminar
-        ]
+        with self.historial.accion(f"Eliminar {cantidad} correos"):
+            self._quitar_posiciones({idx for idx, _ in seleccion})
         
         self._guardar_registros()
         self._actualizar_vista()
@@ -491,32 +1333,98 @@ class VivasPlayApp:
     
     def _mostrar_menu_contextual(self, event):
         """Muestra el menú contextual."""
+        if self.menu_contextual is None:
+            from .ui.components.menus import MenuContextual
+            self.menu_contextual = MenuContextual(
+                self.root,
+                on_copiar=self._copiar_seleccion,
+                on_copiar_fila=self._copiar_fila_completa,
+                on_eliminar=self._eliminar_seleccion,
+                on_editar_lote=self._editar_seleccion,
+                on_seleccionar_todos=self.tabla.seleccionar_todos,
+                on_deseleccionar=self.tabla.deseleccionar_todos
+            )
+        
         cantidad = self.tabla.get_cantidad_seleccionados()
         self.menu_contextual.mostrar(event, cantidad)
     
     def _copiar_seleccion(self):
         """Copia los correos seleccionados al portapapeles."""
-        seleccion = self.tabla.get_seleccion()
-        if seleccion:
-            correos = [correo for _, correo in seleccion]
-            self.root.clipboard_clear()
-            self.root.clipboard_append('\n'.join(correos))
+        self._copiar_registros(filas_completas=False)
     
     def _copiar_fila_completa(self):
         """Copia las filas completas seleccionadas."""
-        seleccion = self.tabla.get_seleccion()
-        if seleccion:
-            filas = []
-            for idx, _ in seleccion:
-                reg = self.registros[idx]
-                linea = reg.correo
-                if reg.vpn or reg.paises:
-                    linea += " | VPN:" if reg.vpn else " |"
-                    if reg.paises:
-                        linea += " " + " ".join(reg.paises)
-                if reg.notas:
-                    linea += " " + reg.notas
-                filas.append(linea.strip())
-            
+        self._copiar_registros(filas_completas=True)
+    
+    def _copiar_registros(self, filas_completas: bool):
+        """
+        Copia la selección formateando el texto en segundo plano.
+        
+        El portapapeles recibe un único texto ya construido; si supera
+        UMBRAL_COPIA_ARCHIVO se ofrece guardarlo en un archivo.
+        """
+        indices = self.tabla.get_indices_seleccion()
+        if not indices:
+            return
+        
+        registros = [self.registros[i] for i in indices]
+        
+        def construir_texto() -> str:
+            with instrumentacion.medir('portapapeles.construir'):
+                if filas_completas:
+                    lineas = ExportadorRegistros.formatear(registros)
+                else:
+                    lineas = [reg.correo for reg in registros]
+                return '\n'.join(lineas)
+        
+        self.root.config(cursor='watch')
+        TareaSegundoPlano(
+            self.root,
+            construir_texto,
+            on_terminado=self._entregar_copia,
+            on_error=self._error_copia
+        )
+    
+    def _entregar_copia(self, texto: str):
+        """Entrega al portapapeles (o a un archivo) el texto construido."""
+        self.root.config(cursor='')
+        
+        if len(texto) > UMBRAL_COPIA_ARCHIVO:
+            respuesta = messagebox.askyesnocancel(
+                "Copia grande",
+                f"La selección ocupa {len(texto) / (1024 * 1024):.1f} MB y copiarla "
+                "al portapapeles puede tardar.\n\n¿Guardarla en un archivo en su lugar?"
+            )
+            if respuesta is None:
+                return
+            if respuesta:
+                self._guardar_copia_en_archivo(texto)
+                return
+        
+        with instrumentacion.medir('portapapeles.escribir'):
             self.root.clipboard_clear()
-            self.root.clipboard_append('\n'.join(filas))
+            self.root.clipboard_append(texto)
+        instrumentacion.contar('portapapeles.caracteres', len(texto))
+    
+    def _error_copia(self, error: BaseException):
+        """Informa de un fallo al construir la copia."""
+        self.root.config(cursor='')
+        messagebox.showerror("Error", f"No se pudo copiar la selección: {error}")
+    
+    def _guardar_copia_en_archivo(self, texto: str):
+        """Guarda en un archivo el texto que no se copió al portapapeles."""
+        from tkinter import filedialog
+        ruta = filedialog.asksaveasfilename(
+            title="Guardar selección",
+            defaultextension=".txt",
+            filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        try:
+            with open(ruta, 'w', encoding='utf-8') as f:
+                f.write(texto)
+                f.write('\n')
+        except IOError as e:
+            messagebox.showerror("Error", f"No se pudo guardar la selección: {e}")
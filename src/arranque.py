@@ -0,0 +1,61 @@
+"""
+Puntos de control de tiempo del arranque de VivasPlay.
+
+Registra cuánto tarda cada fase del arranque (interfaz creada, ventana
+visible, registros leídos, índice construido, primera pantalla y tabla
+completa) desde que se importó este módulo. Con la variable de entorno
+VIVASPLAY_TIEMPOS definida, el resumen se escribe en stderr al terminar
+el arranque; así las regresiones se ven sin herramientas externas.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import List, Tuple
+
+
+# Variable de entorno que activa el informe de tiempos
+VARIABLE_ENTORNO = 'VIVASPLAY_TIEMPOS'
+
+_INICIO = time.perf_counter()
+_puntos: List[Tuple[str, float]] = []
+_cerrojo = threading.Lock()
+
+
+def marcar(nombre: str) -> float:
+    """
+    Registra un punto de control (se puede llamar desde cualquier hilo).
+    
+    Args:
+        nombre: Nombre de la fase alcanzada.
+    
+    Returns:
+        Milisegundos transcurridos desde el inicio.
+    """
+    transcurrido = (time.perf_counter() - _INICIO) * 1000
+    with _cerrojo:
+        _puntos.append((nombre, transcurrido))
+    return transcurrido
+
+
+def get_puntos() -> List[Tuple[str, float]]:
+    """Retorna los puntos registrados como (nombre, milisegundos desde el inicio)."""
+    with _cerrojo:
+        return list(_puntos)
+
+
+def resumen() -> str:
+    """Construye un resumen legible con el tiempo acumulado y el de cada fase."""
+    lineas = ["Tiempos de arranque (ms):"]
+    anterior = 0.0
+    for nombre, transcurrido in get_puntos():
+        lineas.append(f"  {nombre:<22} {transcurrido:9.1f}  (+{transcurrido - anterior:.1f})")
+        anterior = transcurrido
+    return "\n".join(lineas)
+
+
+def informar():
+    """Escribe el resumen en stderr si VIVASPLAY_TIEMPOS está definida."""
+    if os.environ.get(VARIABLE_ENTORNO):
+        print(resumen(), file=sys.stderr)
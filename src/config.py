@@ -8,12 +8,35 @@ facilitando su modificación y mantenimiento.
 # Archivo de persistencia de datos
 ARCHIVO_DATOS = 'correos.json'
 
+# Archivo con las plantillas de formato de línea definidas por el usuario
+ARCHIVO_PLANTILLAS = 'formatos.json'
+
+# Archivo con las preferencias cambiadas desde la interfaz
+ARCHIVO_PREFERENCIAS = 'preferencias.json'
+
 # Patrón para email con puerto opcional (ej: user@domain.com:12345)
 PATRON_EMAIL = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(:\d+)?$'
 
 # Patrón para solo el email (sin puerto) - usado en búsquedas
 PATRON_EMAIL_BASE = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
 
+# Normalización de emails para detectar duplicados (ver models/normalizacion.py).
+# Las mayúsculas y los dominios internacionales se normalizan siempre; las
+# reglas de proveedor se pueden activar desde Config
+NORMALIZAR_PROVEEDORES = False
+
+# Dominio -> dominio canónico del mismo buzón
+ALIAS_DOMINIOS = {'googlemail.com': 'gmail.com'}
+
+# Proveedores que ignoran los puntos de la parte local (john.doe == johndoe)
+DOMINIOS_SIN_PUNTOS = frozenset({'gmail.com'})
+
+# Proveedores que ignoran la "+etiqueta" de la parte local (john+x == john)
+DOMINIOS_ETIQUETA_MAS = frozenset({
+    'gmail.com', 'outlook.com', 'hotmail.com', 'live.com', 'icloud.com',
+    'proton.me', 'protonmail.com', 'fastmail.com'
+})
+
 # Códigos de país válidos (ISO 3166-1 alpha-2)
 CODIGOS_PAIS = {
     'AD', 'AE', 'AF', 'AG', 'AI', 'AL', 'AM', 'AO', 'AQ', 'AR', 'AS', 'AT', 'AU', 'AW', 'AX', 'AZ',
@@ -34,6 +57,103 @@ CODIGOS_PAIS = {
     'VI', 'VN', 'VU', 'WF', 'WS', 'YE', 'YT', 'ZA', 'ZM', 'ZW'
 }
 
+# Nombres de país (español, inglés y alias habituales) -> código de CODIGOS_PAIS.
+# Se buscan sin distinguir mayúsculas ni tildes y como palabras completas;
+# se omiten nombres que también son nombres de persona (ej: Chad, Jordan)
+NOMBRES_PAIS = {
+    'AR': ('Argentina',),
+    'AT': ('Austria',),
+    'AU': ('Australia',),
+    'BE': ('Bélgica', 'Belgium'),
+    'BO': ('Bolivia',),
+    'BR': ('Brasil', 'Brazil'),
+    'CA': ('Canadá', 'Canada'),
+    'CH': ('Suiza', 'Switzerland'),
+    'CL': ('Chile',),
+    'CN': ('China',),
+    'CO': ('Colombia',),
+    'CR': ('Costa Rica',),
+    'CU': ('Cuba',),
+    'CZ': ('República Checa', 'Chequia', 'Czech Republic', 'Czechia'),
+    'DE': ('Alemania', 'Germany'),
+    'DK': ('Dinamarca', 'Denmark'),
+    'DO': ('República Dominicana', 'Dominican Republic'),
+    'EC': ('Ecuador',),
+    'EG': ('Egipto', 'Egypt'),
+    'ES': ('España', 'Spain'),
+    'FI': ('Finlandia', 'Finland'),
+    'FR': ('Francia', 'France'),
+    'GB': ('Reino Unido', 'United Kingdom', 'Gran Bretaña', 'Great Britain', 'Inglaterra', 'England'),
+    'GR': ('Grecia', 'Greece'),
+    'GT': ('Guatemala',),
+    'HK': ('Hong Kong',),
+    'HN': ('Honduras',),
+    'HU': ('Hungría', 'Hungary'),
+    'ID': ('Indonesia',),
+    'IE': ('Irlanda', 'Ireland'),
+    'IL': ('Israel',),
+    'IN': ('India',),
+    'IT': ('Italia', 'Italy'),
+    'JP': ('Japón', 'Japan'),
+    'KR': ('Corea del Sur', 'South Korea', 'Korea'),
+    'MA': ('Marruecos', 'Morocco'),
+    'MX': ('México', 'Méjico', 'Mexico'),
+    'MY': ('Malasia', 'Malaysia'),
+    'NG': ('Nigeria',),
+    'NI': ('Nicaragua',),
+    'NL': ('Países Bajos', 'Holanda', 'Netherlands', 'Holland'),
+    'NO': ('Noruega', 'Norway'),
+    'NZ': ('Nueva Zelanda', 'New Zealand'),
+    'PA': ('Panamá', 'Panama'),
+    'PE': ('Perú', 'Peru'),
+    'PH': ('Filipinas', 'Philippines'),
+    'PK': ('Pakistán', 'Pakistan'),
+    'PL': ('Polonia', 'Poland'),
+    'PR': ('Puerto Rico',),
+    'PT': ('Portugal',),
+    'PY': ('Paraguay',),
+    'RO': ('Rumania', 'Rumanía', 'Romania'),
+    'RU': ('Rusia', 'Russia'),
+    'SA': ('Arabia Saudita', 'Arabia Saudí', 'Saudi Arabia'),
+    'SE': ('Suecia', 'Sweden'),
+    'SG': ('Singapur', 'Singapore'),
+    'SV': ('El Salvador',),
+    'TH': ('Tailandia', 'Thailand'),
+    'TR': ('Turquía', 'Turkey', 'Türkiye'),
+    'TW': ('Taiwán', 'Taiwan'),
+    'UA': ('Ucrania', 'Ukraine'),
+    'US': ('Estados Unidos', 'United States'),
+    'UY': ('Uruguay',),
+    'VE': ('Venezuela',),
+    'VN': ('Vietnam',),
+    'ZA': ('Sudáfrica', 'South Africa'),
+}
+
+# Nombres de NOMBRES_PAIS que también son palabras comunes (ej: "chile",
+# "turkey", "cuba"): solo cuentan como país si empiezan con mayúscula
+NOMBRES_PAIS_AMBIGUOS = ('Chile', 'China', 'Cuba', 'Ecuador', 'Honduras', 'India', 'Turkey')
+
+# Siglas de país -> código de CODIGOS_PAIS. Se buscan distinguiendo
+# mayúsculas: en minúsculas pueden ser palabras comunes (ej: "usa")
+SIGLAS_PAIS = {
+    'US': ('EEUU', 'EE.UU.', 'EE. UU.', 'USA', 'U.S.A.'),
+}
+
+# Tamaño (en caracteres) a partir del cual se ofrece copiar a un archivo
+# en lugar de al portapapeles, que es muy lento en Tk con textos grandes
+UMBRAL_COPIA_ARCHIVO = 8 * 1024 * 1024
+
+# Tamaño (en bytes) a partir del cual "Contar desde archivo" ofrece un
+# conteo aproximado con memoria fija (HyperLogLog) en lugar del exacto
+UMBRAL_CONTEO_APROXIMADO = 64 * 1024 * 1024
+
+# Acciones que se pueden deshacer con Ctrl+Z (el historial guarda solo
+# los cambios de cada acción, no copias de la lista)
+LIMITE_HISTORIAL = 100
+
+# Variable de entorno que activa el diagnóstico de memoria al arrancar
+VARIABLE_MEMORIA = 'VIVASPLAY_MEMORIA'
+
 # Rutas de iconos
 ICONOS = {
     'clip': 'assets/image/clip_2891632.png',
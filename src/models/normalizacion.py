@@ -0,0 +1,116 @@
+"""
+Normalización canónica de emails.
+
+La clave canónica de un email es la que se usa para detectar duplicados
+(al parsear, en el índice de la lista y al comparar). Se obtiene con:
+
+1. Plegado de mayúsculas (casefold) de todo el email.
+2. Dominios internacionales (IDN) a punycode.
+3. Opcionalmente, reglas de proveedor: alias de dominio (googlemail.com
+   es gmail.com), quitar los puntos de la parte local y la "+etiqueta"
+   en los proveedores que los ignoran.
+
+Cada registro guarda su clave (RegistroCorreo.clave) para no recalcularla
+en cada operación; al cambiar las reglas se recalculan todas de una vez
+(ver VivasPlayApp._renormalizar_registros).
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import FrozenSet, Mapping, Optional
+
+from ..config import (
+    ALIAS_DOMINIOS, DOMINIOS_SIN_PUNTOS, DOMINIOS_ETIQUETA_MAS, NORMALIZAR_PROVEEDORES
+)
+
+
+@dataclass(frozen=True)
+class ReglasNormalizacion:
+    """
+    Reglas de normalización de emails.
+    
+    Attributes:
+        reglas_proveedor: Aplicar alias de dominio, puntos y +etiquetas.
+        alias_dominios: Dominio -> dominio canónico del mismo buzón.
+        sin_puntos: Dominios donde los puntos de la parte local no cuentan.
+        sin_etiqueta: Dominios donde "+etiqueta" en la parte local no cuenta.
+    """
+    reglas_proveedor: bool = NORMALIZAR_PROVEEDORES
+    alias_dominios: Mapping[str, str] = field(default_factory=lambda: dict(ALIAS_DOMINIOS))
+    sin_puntos: FrozenSet[str] = DOMINIOS_SIN_PUNTOS
+    sin_etiqueta: FrozenSet[str] = DOMINIOS_ETIQUETA_MAS
+
+
+# Reglas activas (las de config hasta que se cambien con set_reglas)
+_reglas = ReglasNormalizacion()
+
+
+def get_reglas() -> ReglasNormalizacion:
+    """Retorna las reglas de normalización activas."""
+    return _reglas
+
+
+def set_reglas(reglas: ReglasNormalizacion) -> bool:
+    """
+    Cambia las reglas activas.
+    
+    Las claves ya guardadas en los registros no se actualizan solas:
+    quien cambia las reglas debe recalcularlas (renormalizar).
+    
+    Args:
+        reglas: Nuevas reglas.
+    
+    Returns:
+        True si las reglas cambiaron.
+    """
+    global _reglas
+    if reglas == _reglas:
+        return False
+    _reglas = reglas
+    return True
+
+
+def con_reglas_proveedor(activas: bool) -> ReglasNormalizacion:
+    """Retorna las reglas activas con las de proveedor activadas o no, sin aplicarlas."""
+    return replace(_reglas, reglas_proveedor=activas)
+
+
+def set_reglas_proveedor(activas: bool) -> bool:
+    """Activa o desactiva las reglas de proveedor; True si cambió algo."""
+    return set_reglas(con_reglas_proveedor(activas))
+
+
+def _dominio_ascii(dominio: str) -> str:
+    """Convierte un dominio internacional a punycode (o lo deja igual si no se puede)."""
+    if dominio.isascii():
+        return dominio
+    try:
+        return dominio.encode('idna').decode('ascii')
+    except UnicodeError:
+        return dominio
+
+
+def clave_email(email_base: str, reglas: Optional[ReglasNormalizacion] = None) -> str:
+    """
+    Calcula la clave canónica de un email (sin puerto).
+    
+    Args:
+        email_base: Email sin el puerto.
+        reglas: Reglas a aplicar (por defecto las activas).
+    
+    Returns:
+        Clave canónica (ej: 'John.Doe+x@GoogleMail.com' -> 'johndoe@gmail.com'
+        con las reglas de proveedor).
+    """
+    reglas = reglas or _reglas
+    local, arroba, dominio = email_base.casefold().rpartition('@')
+    if not arroba:
+        return dominio
+    dominio = _dominio_ascii(dominio)
+    
+    if reglas.reglas_proveedor:
+        dominio = reglas.alias_dominios.get(dominio, dominio)
+        if dominio in reglas.sin_etiqueta:
+            local = local.partition('+')[0]
+        if dominio in reglas.sin_puntos:
+            local = local.replace('.', '')
+    return f"{local}@{dominio}"
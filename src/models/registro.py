@@ -4,9 +4,11 @@ Modelo de datos para registro de correo electrónico.
 Define la estructura de datos principal de la aplicación.
 """
 
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from typing import List, Dict, Any
 
+from .normalizacion import clave_email
+
 
 @dataclass
 class RegistroCorreo:
@@ -18,15 +20,23 @@ class RegistroCorreo:
         vpn: Indica si tiene VPN activa
         paises: Lista de códigos de país (ej: ['BR', 'US'])
         notas: Texto adicional (ej: 'membresia')
+        clave: Clave canónica del email para deduplicar (ver get_clave);
+            no se serializa ni cuenta al comparar registros
     """
     correo: str
     vpn: bool = False
     paises: List[str] = field(default_factory=list)
     notas: str = ""
+    clave: str = field(default="", compare=False, repr=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convierte el registro a diccionario para serialización."""
-        return asdict(self)
+        return {
+            'correo': self.correo,
+            'vpn': self.vpn,
+            'paises': list(self.paises),
+            'notas': self.notas
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'RegistroCorreo':
@@ -56,3 +66,18 @@ class RegistroCorreo:
         if ':' in self.correo:
             return self.correo.split(':')[0]
         return self.correo
+    
+    def get_clave(self) -> str:
+        """
+        Obtiene la clave canónica del email (ver models/normalizacion.py).
+        
+        Se calcula la primera vez y queda guardada en el registro; al
+        cambiar las reglas de normalización se recalcula con renormalizar.
+        
+        Returns:
+            Clave canónica del email base.
+        """
+        if not self.clave:
+            self.clave = clave_email(self.get_email_base())
+        return self.clave
+
@@ -1,5 +1,8 @@
 """Servicios de negocio."""
 from .parser import ParserCorreos
 from .storage import StorageJSON
+from .indices import IndiceRegistros
+from .exportador import ExportadorRegistros
+from .estadisticas import EstadisticasRegistros
 
-__all__ = ['ParserCorreos', 'StorageJSON']
+__all__ = ['ParserCorreos', 'StorageJSON', 'IndiceRegistros', 'ExportadorRegistros', 'EstadisticasRegistros']
@@ -0,0 +1,104 @@
+"""
+Autómata de Aho-Corasick para buscar muchos patrones a la vez.
+
+Recorre el texto una sola vez, en tiempo lineal en su longitud más la
+cantidad de coincidencias, sin importar cuántos patrones haya. Los
+enlaces de fallo se resuelven al construirlo (autómata determinista),
+así que cada carácter cuesta una sola consulta a un diccionario.
+"""
+
+from collections import deque
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class AutomataAhoCorasick(Generic[T]):
+    """
+    Autómata construido a partir de un diccionario patrón -> valor.
+    
+    Los patrones se comparan tal cual: quien lo usa debe normalizar el
+    texto igual que los patrones (ej: en minúsculas).
+    """
+    
+    def __init__(self, patrones: Dict[str, T]):
+        """
+        Construye el autómata.
+        
+        Args:
+            patrones: Patrón (no vacío) -> valor que se retorna al encontrarlo.
+        """
+        # Por estado: transiciones, estado de fallo y (longitud, valor)
+        # de los patrones que terminan en él (incluidos sus sufijos).
+        # Tras construirlo, las transiciones de cada estado incluyen las
+        # heredadas por sus fallos
+        self._transiciones: List[Dict[str, int]] = [{}]
+        self._fallo: List[int] = [0]
+        self._salidas: List[Tuple[Tuple[int, T], ...]] = [()]
+        
+        for patron, valor in patrones.items():
+            if patron:
+                self._añadir(patron, valor)
+        self._enlazar_fallos()
+    
+    def _añadir(self, patron: str, valor: T):
+        """Añade un patrón al trie."""
+        estado = 0
+        for caracter in patron:
+            siguiente = self._transiciones[estado].get(caracter)
+            if siguiente is None:
+                siguiente = len(self._transiciones)
+                self._transiciones[estado][caracter] = siguiente
+                self._transiciones.append({})
+                self._fallo.append(0)
+                self._salidas.append(())
+            estado = siguiente
+        self._salidas[estado] = ((len(patron), valor),)
+    
+    def _enlazar_fallos(self):
+        """
+        Calcula los enlaces de fallo recorriendo el trie por niveles.
+        
+        Cada estado hereda las transiciones de su estado de fallo (ya
+        completo por estar en un nivel anterior), de modo que buscar no
+        necesita seguir los fallos.
+        """
+        transiciones = self._transiciones
+        cola = deque(transiciones[0].values())
+        while cola:
+            estado = cola.popleft()
+            propias = list(transiciones[estado].items())
+            for caracter, hijo in propias:
+                cola.append(hijo)
+                destino = transiciones[self._fallo[estado]].get(caracter, 0) if estado else 0
+                self._fallo[hijo] = destino
+                self._salidas[hijo] += self._salidas[destino]
+            if estado:
+                for caracter, destino in transiciones[self._fallo[estado]].items():
+                    transiciones[estado].setdefault(caracter, destino)
+    
+    def buscar(self, texto: str, inicio: int = 0, fin: Optional[int] = None) -> List[Tuple[int, int, T]]:
+        """
+        Encuentra todas las apariciones de los patrones (incluso solapadas).
+        
+        Args:
+            texto: Texto normalizado igual que los patrones.
+            inicio: Posición desde la que buscar.
+            fin: Posición hasta la que buscar (por defecto, el final).
+        
+        Returns:
+            Tuplas (inicio, fin, valor) con texto[inicio:fin] == patrón.
+        """
+        transiciones, salidas = self._transiciones, self._salidas
+        encontrados = []
+        estado = 0
+        for i in range(inicio, len(texto) if fin is None else fin):
+            estado = transiciones[estado].get(texto[i], 0)
+            if salidas[estado]:
+                for longitud, valor in salidas[estado]:
+                    encontrados.append((i + 1 - longitud, i + 1, valor))
+        return encontrados
+    
+    def __len__(self) -> int:
+        """Retorna la cantidad de estados del autómata."""
+        return len(self._transiciones)
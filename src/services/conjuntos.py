@@ -0,0 +1,122 @@
+"""
+Servicio de operaciones de conjuntos entre un archivo y la lista.
+
+Responde a preguntas como "qué líneas de este archivo no están en mi
+lista" sin cargar el archivo en memoria: las líneas pasan de una en una
+por el parser (con la deduplicación de procesar_texto_a_registros), se
+consultan en el índice de emails de la lista y el resultado se escribe
+directamente en el archivo de salida.
+"""
+
+from dataclasses import dataclass
+from typing import AbstractSet, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from ..models.registro import RegistroCorreo
+from .exportador import ExportadorRegistros
+from .parser import ParserCorreos
+from . import instrumentacion
+
+
+# Operación -> descripción para la interfaz
+OPERACIONES: Dict[str, str] = {
+    'no_en_lista': "Líneas del archivo que no están en la lista",
+    'en_lista': "Líneas del archivo que ya están en la lista",
+    'faltan_en_archivo': "Registros de la lista que no aparecen en el archivo",
+}
+
+# Cada cuántas líneas se comprueba si se pidió cancelar
+INTERVALO_CANCELACION = 5000
+
+
+@dataclass
+class ResultadoConjunto:
+    """
+    Resultado de una operación de conjuntos.
+    
+    Attributes:
+        operacion: Clave de la operación (ver OPERACIONES).
+        lineas: Líneas leídas del archivo de entrada.
+        unicos: Emails base distintos válidos en el archivo.
+        escritos: Líneas o registros escritos en la salida.
+        cancelado: True si la operación se interrumpió.
+    """
+    operacion: str
+    lineas: int = 0
+    unicos: int = 0
+    escritos: int = 0
+    cancelado: bool = False
+
+
+def _lineas(archivo, resultado: ResultadoConjunto, cancelado: Callable[[], bool]) -> Iterator[str]:
+    """Produce las líneas sin salto final, contándolas y atendiendo a la cancelación."""
+    for n, linea in enumerate(archivo, start=1):
+        if n % INTERVALO_CANCELACION == 0 and cancelado():
+            resultado.cancelado = True
+            return
+        resultado.lineas = n
+        yield linea.rstrip('\r\n')
+
+
+def ejecutar_operacion(
+    operacion: str,
+    ruta_entrada: str,
+    ruta_salida: str,
+    emails: AbstractSet[str],
+    registros: Sequence[RegistroCorreo] = (),
+    cancelado: Optional[Callable[[], bool]] = None
+) -> Tuple[Optional[ResultadoConjunto], Optional[str]]:
+    """
+    Ejecuta una operación de conjuntos en streaming.
+    
+    - no_en_lista / en_lista: escribe las líneas originales del archivo
+      (primera aparición de cada email base) según estén o no en la lista.
+    - faltan_en_archivo: escribe los registros de la lista cuyo email base
+      no aparece en el archivo, en el formato de exportación de la salida.
+    
+    Args:
+        operacion: Clave de OPERACIONES.
+        ruta_entrada: Archivo de texto a comparar.
+        ruta_salida: Archivo donde escribir el resultado.
+        emails: Claves de los emails de la lista (IndiceRegistros.emails()).
+        registros: Registros de la lista (solo para faltan_en_archivo).
+        cancelado: Función que indica si se pidió cancelar.
+    
+    Returns:
+        Tupla con (resultado o None si falló, mensaje de error o None).
+    """
+    if operacion not in OPERACIONES:
+        return None, f"Operación no soportada: {operacion}"
+    cancelado = cancelado or (lambda: False)
+    resultado = ResultadoConjunto(operacion)
+    
+    try:
+        with instrumentacion.medir(f'conjuntos.{operacion}'), \
+                open(ruta_entrada, 'r', encoding='utf-8') as entrada, \
+                open(ruta_salida, 'w', encoding='utf-8', buffering=ExportadorRegistros.TAMAÑO_BUFFER) as salida:
+            lineas = _lineas(entrada, resultado, cancelado)
+            
+            if operacion == 'faltan_en_archivo':
+                vistos = set()
+                for _, registro in ParserCorreos.iterar_registros(lineas):
+                    vistos.add(registro.get_clave())
+                resultado.unicos = len(vistos)
+                if not resultado.cancelado:
+                    resultado.escritos = ExportadorRegistros.escribir(
+                        salida,
+                        (reg for reg in registros if reg.get_clave() not in vistos),
+                        ExportadorRegistros.formato_desde_ruta(ruta_salida)
+                    )
+            else:
+                buscar_presentes = operacion == 'en_lista'
+                for linea, registro in ParserCorreos.iterar_registros(lineas):
+                    resultado.unicos += 1
+                    if (registro.get_clave() in emails) == buscar_presentes:
+                        salida.write(linea + "\n")
+                        resultado.escritos += 1
+    except UnicodeDecodeError as e:
+        return None, f"El archivo no es texto UTF-8: {e}"
+    except IOError as e:
+        return None, f"No se pudo completar la operación: {e}"
+    
+    instrumentacion.contar('conjuntos.lineas', resultado.lineas)
+    return resultado, None
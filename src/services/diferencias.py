@@ -0,0 +1,205 @@
+"""
+Servicio de cálculo de diferencias para importaciones.
+
+Calcula, sin modificar nada, qué cambiaría al añadir o eliminar un
+conjunto de registros, usando la misma deduplicación por clave canónica del email
+que el resto de la aplicación.
+"""
+
+from dataclasses import dataclass, field
+from typing import AbstractSet, Container, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.registro import RegistroCorreo
+from . import instrumentacion
+
+
+# Campos que se comparan entre un registro existente y uno entrante
+CAMPOS_COMPARABLES = ('vpn', 'paises', 'notas')
+
+
+@dataclass
+class DiferenciaImportacion:
+    """
+    Resultado de un ensayo (dry-run) de importación.
+    
+    Attributes:
+        operacion: 'añadir' o 'eliminar'.
+        revision: Revisión de la lista sobre la que se calculó.
+        total_entrada: Registros recibidos.
+        nuevos: Registros que no existen (se insertarían al añadir).
+        duplicados: Registros que ya existen con los mismos datos.
+        modificados: (índice, actual, entrante, campos distintos) de los
+            registros existentes cuyos datos difieren de los entrantes.
+        a_eliminar: Posiciones que se eliminarían.
+        no_encontrados: Registros a eliminar que no existen.
+    """
+    operacion: str
+    revision: int
+    total_entrada: int
+    nuevos: List[RegistroCorreo] = field(default_factory=list)
+    duplicados: List[RegistroCorreo] = field(default_factory=list)
+    modificados: List[Tuple[int, RegistroCorreo, RegistroCorreo, List[str]]] = field(default_factory=list)
+    a_eliminar: List[int] = field(default_factory=list)
+    no_encontrados: List[RegistroCorreo] = field(default_factory=list)
+
+
+def _indice_por_email(
+    registros: List[RegistroCorreo],
+    solo: Optional[AbstractSet[str]] = None
+) -> Dict[str, int]:
+    """
+    Mapea cada clave de email a la posición de su primera aparición.
+    
+    Con `solo` se limita a esos emails y el recorrido termina en cuanto
+    se han encontrado todos (sin recorrer nada si está vacío).
+    """
+    indice: Dict[str, int] = {}
+    if solo is None:
+        for i, reg in enumerate(registros):
+            indice.setdefault(reg.get_clave(), i)
+        return indice
+    
+    pendientes = len(solo)
+    if not pendientes:
+        return indice
+    for i, reg in enumerate(registros):
+        clave = reg.get_clave()
+        if clave in solo and clave not in indice:
+            indice[clave] = i
+            pendientes -= 1
+            if not pendientes:
+                break
+    return indice
+
+
+def posibles_existentes(entrantes: Iterable[RegistroCorreo], existe: Container[str]) -> Set[str]:
+    """
+    Prefiltra los emails entrantes que pueden existir en la lista.
+    
+    Los que no pasan el filtro son nuevos con seguridad y no hace falta
+    buscarlos en los registros.
+    
+    Args:
+        entrantes: Registros recibidos.
+        existe: Claves de los emails existentes (ej: IndiceRegistros.emails()).
+    
+    Returns:
+        Claves entrantes que sí aparecen en el filtro.
+    """
+    candidatos = set()
+    for reg in entrantes:
+        clave = reg.get_clave()
+        if clave in existe:
+            candidatos.add(clave)
+    return candidatos
+
+
+def campos_distintos(actual: RegistroCorreo, entrante: RegistroCorreo) -> List[str]:
+    """
+    Compara los campos de datos de dos registros con el mismo email.
+    
+    Args:
+        actual: Registro existente.
+        entrante: Registro recibido.
+    
+    Returns:
+        Nombres de los campos que difieren (el orden de países no cuenta).
+    """
+    distintos = []
+    if actual.vpn != entrante.vpn:
+        distintos.append('vpn')
+    if sorted(actual.paises) != sorted(entrante.paises):
+        distintos.append('paises')
+    if actual.notas != entrante.notas:
+        distintos.append('notas')
+    return distintos
+
+
+def calcular_diferencia_añadir(
+    existentes: List[RegistroCorreo],
+    entrantes: List[RegistroCorreo],
+    revision: int = 0,
+    candidatos: Optional[AbstractSet[str]] = None
+) -> DiferenciaImportacion:
+    """
+    Calcula qué pasaría al añadir registros.
+    
+    Args:
+        existentes: Registros actuales de la lista.
+        entrantes: Registros a añadir.
+        revision: Revisión actual de la lista.
+        candidatos: Emails entrantes que pueden existir (ver
+            posibles_existentes); None para buscarlos todos.
+    
+    Returns:
+        Diferencia con nuevos, duplicados y modificados.
+    """
+    diferencia = DiferenciaImportacion('añadir', revision, len(entrantes))
+    
+    with instrumentacion.medir('dedup.añadir'):
+        indice = _indice_por_email(existentes, candidatos)
+        vistos = set()
+        
+        for reg in entrantes:
+            clave = reg.get_clave()
+            if clave in vistos:
+                diferencia.duplicados.append(reg)
+                continue
+            vistos.add(clave)
+            
+            posicion = indice.get(clave)
+            if posicion is None:
+                diferencia.nuevos.append(reg)
+                continue
+            
+            actual = existentes[posicion]
+            distintos = campos_distintos(actual, reg)
+            if distintos:
+                diferencia.modificados.append((posicion, actual, reg, distintos))
+            else:
+                diferencia.duplicados.append(reg)
+    
+    instrumentacion.contar('dedup.duplicados', len(diferencia.duplicados))
+    return diferencia
+
+
+def calcular_diferencia_eliminar(
+    existentes: List[RegistroCorreo],
+    entrantes: List[RegistroCorreo],
+    revision: int = 0,
+    candidatos: Optional[AbstractSet[str]] = None
+) -> DiferenciaImportacion:
+    """
+    Calcula qué pasaría al eliminar registros.
+    
+    Args:
+        existentes: Registros actuales de la lista.
+        entrantes: Registros a eliminar.
+        revision: Revisión actual de la lista.
+        candidatos: Emails entrantes que pueden existir (ver
+            posibles_existentes); None para buscarlos todos.
+    
+    Returns:
+        Diferencia con las posiciones a eliminar y los no encontrados.
+    """
+    diferencia = DiferenciaImportacion('eliminar', revision, len(entrantes))
+    
+    with instrumentacion.medir('dedup.eliminar'):
+        if candidatos is None:
+            emails = {reg.get_clave() for reg in entrantes}
+        else:
+            emails = candidatos
+        
+        encontrados = set()
+        # Si ningún entrante puede existir no se recorre la lista
+        for i, reg in enumerate(existentes if emails else ()):
+            clave = reg.get_clave()
+            if clave in emails:
+                diferencia.a_eliminar.append(i)
+                encontrados.add(clave)
+        
+        diferencia.no_encontrados = [
+            reg for reg in entrantes
+            if reg.get_clave() not in encontrados
+        ]
+    return diferencia
@@ -0,0 +1,81 @@
+"""
+Servicio de edición en lote.
+
+Describe un cambio sobre los campos VPN, países y notas que se aplica
+por igual a muchos registros (ej: todos los seleccionados en la tabla).
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from ..models.registro import RegistroCorreo
+
+
+# Operaciones sobre un campo
+MANTENER = 'mantener'
+FIJAR = 'fijar'
+VACIAR = 'vaciar'
+AÑADIR = 'añadir'
+
+OPERACIONES = (MANTENER, FIJAR, VACIAR, AÑADIR)
+
+
+@dataclass(frozen=True)
+class EdicionLote:
+    """
+    Cambio a aplicar sobre varios registros.
+    
+    Attributes:
+        vpn: Nuevo valor de VPN, o None para mantenerlo.
+        op_paises: Operación sobre los países (ver OPERACIONES).
+        paises: Países a fijar o añadir.
+        op_notas: Operación sobre las notas (ver OPERACIONES).
+        notas: Texto a fijar o añadir al final.
+    """
+    vpn: Optional[bool] = None
+    op_paises: str = MANTENER
+    paises: Tuple[str, ...] = ()
+    op_notas: str = MANTENER
+    notas: str = ""
+    
+    def es_vacia(self) -> bool:
+        """Indica si la edición no cambia ningún campo."""
+        return self.vpn is None and self.op_paises == MANTENER and self.op_notas == MANTENER
+    
+    def aplicar(self, registro: RegistroCorreo) -> Optional[RegistroCorreo]:
+        """
+        Aplica la edición a un registro.
+        
+        Args:
+            registro: Registro a editar (no se modifica).
+        
+        Returns:
+            Nuevo registro con los cambios, o None si quedaría igual.
+        """
+        vpn = registro.vpn if self.vpn is None else self.vpn
+        
+        paises = registro.paises
+        if self.op_paises == FIJAR:
+            paises = list(self.paises)
+        elif self.op_paises == VACIAR:
+            paises = []
+        elif self.op_paises == AÑADIR:
+            paises = paises + [p for p in self.paises if p not in paises]
+        
+        notas = registro.notas
+        if self.op_notas == FIJAR:
+            notas = self.notas
+        elif self.op_notas == VACIAR:
+            notas = ""
+        elif self.op_notas == AÑADIR and self.notas:
+            notas = f"{notas} {self.notas}" if notas else self.notas
+        
+        if vpn == registro.vpn and paises == registro.paises and notas == registro.notas:
+            return None
+        return RegistroCorreo(
+            correo=registro.correo,
+            vpn=vpn,
+            paises=list(paises),
+            notas=notas,
+            clave=registro.clave
+        )
@@ -0,0 +1,154 @@
+"""
+Servicio de estadísticas agregadas sobre los registros.
+
+Mantiene de forma incremental los totales de la lista (con VPN, con
+países, con notas, por país y por dominio) para mostrarlos sin recorrer
+los registros, y cuenta registros de entrada en una sola pasada.
+"""
+
+from collections import Counter
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+from ..models.registro import RegistroCorreo
+
+
+class EstadisticasRegistros:
+    """
+    Agregados de la lista de registros, actualizados en cada mutación.
+    
+    Las consultas son O(1) (u O(k) para los k países o dominios más
+    frecuentes); las actualizaciones cuestan lo mismo que el cambio.
+    """
+    
+    def __init__(self, registros: Optional[List[RegistroCorreo]] = None):
+        """
+        Inicializa las estadísticas.
+        
+        Args:
+            registros: Registros iniciales (opcional).
+        """
+        self.reconstruir(registros or [])
+    
+    # ==================== Mantenimiento ====================
+    
+    def reconstruir(self, registros: Iterable[RegistroCorreo]):
+        """
+        Recalcula todos los agregados desde cero.
+        
+        Args:
+            registros: Lista completa de registros.
+        """
+        self.total = 0
+        self.con_vpn = 0
+        self.con_paises = 0
+        self.con_notas = 0
+        self.por_pais: Counter = Counter()
+        self.por_dominio: Counter = Counter()
+        self.agregar(registros)
+    
+    def agregar(self, registros: Iterable[RegistroCorreo]):
+        """
+        Suma registros añadidos a la lista.
+        
+        Args:
+            registros: Registros nuevos.
+        """
+        for reg in registros:
+            self._aplicar(reg, 1)
+    
+    def quitar(self, registros: Iterable[RegistroCorreo]):
+        """
+        Resta registros eliminados de la lista.
+        
+        Args:
+            registros: Registros eliminados.
+        """
+        for reg in registros:
+            self._aplicar(reg, -1)
+    
+    def reemplazar(self, anterior: RegistroCorreo, nuevo: RegistroCorreo):
+        """
+        Actualiza los agregados tras editar un registro.
+        
+        Args:
+            anterior: Contenido previo del registro.
+            nuevo: Contenido nuevo del registro.
+        """
+        self._aplicar(anterior, -1)
+        self._aplicar(nuevo, 1)
+    
+    def _aplicar(self, reg: RegistroCorreo, signo: int):
+        """Suma (signo 1) o resta (signo -1) un registro a los agregados."""
+        self.total += signo
+        if reg.vpn:
+            self.con_vpn += signo
+        if reg.paises:
+            self.con_paises += signo
+            for pais in reg.paises:
+                self.por_pais[pais] += signo
+                if self.por_pais[pais] <= 0:
+                    del self.por_pais[pais]
+        if reg.notas:
+            self.con_notas += signo
+        dominio = reg.get_email_base().rpartition('@')[2].lower()
+        self.por_dominio[dominio] += signo
+        if self.por_dominio[dominio] <= 0:
+            del self.por_dominio[dominio]
+    
+    # ==================== Consultas ====================
+    
+    def principales_paises(self, cantidad: int = 3) -> List[Tuple[str, int]]:
+        """Retorna los países más frecuentes con su cantidad de registros."""
+        return self.por_pais.most_common(cantidad)
+    
+    def principales_dominios(self, cantidad: int = 3) -> List[Tuple[str, int]]:
+        """Retorna los dominios más frecuentes con su cantidad de registros."""
+        return self.por_dominio.most_common(cantidad)
+    
+    def resumen(self) -> str:
+        """
+        Resume los agregados en una línea para la barra de estado.
+        
+        Returns:
+            Texto del tipo 'VPN: 10 · Con países: 20 · ...'.
+        """
+        if not self.total:
+            return ""
+        texto = (
+            f"VPN: {self.con_vpn} · Con países: {self.con_paises} · "
+            f"Con notas: {self.con_notas} · Dominios: {len(self.por_dominio)}"
+        )
+        principales = self.principales_paises()
+        if principales:
+            texto += " · " + ", ".join(f"{pais} {cantidad}" for pais, cantidad in principales)
+        return texto
+
+
+def contar_registros(registros: Iterable[RegistroCorreo], existentes: AbstractSet[str]) -> Dict[str, int]:
+    """
+    Cuenta registros de entrada frente a la lista en una sola pasada.
+    
+    Args:
+        registros: Registros a contar.
+        existentes: Claves canónicas de los emails de la lista; basta con que
+            admita `in` (ej: IndiceRegistros.emails()).
+    
+    Returns:
+        Diccionario con total, con_vpn, con_paises, existentes y nuevos.
+    """
+    total = con_vpn = con_paises = ya_existen = 0
+    for reg in registros:
+        total += 1
+        if reg.vpn:
+            con_vpn += 1
+        if reg.paises:
+            con_paises += 1
+        if reg.get_clave() in existentes:
+            ya_existen += 1
+    return {
+        'total': total,
+        'con_vpn': con_vpn,
+        'con_paises': con_paises,
+        'existentes': ya_existen,
+        'nuevos': total - ya_existen,
+    }
@@ -0,0 +1,375 @@
+"""
+Servicio de exportación de registros.
+
+Convierte registros a líneas de texto en distintos formatos (TXT, CSV,
+JSONL) con un único formateador por formato, y los escribe en streaming
+por lotes sobre un archivo con buffer.
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..models.registro import RegistroCorreo
+
+
+def _linea_txt(reg: RegistroCorreo) -> str:
+    """Formato de texto: correo | VPN: PAIS1 PAIS2 notas."""
+    linea = reg.correo
+    if reg.vpn or reg.paises:
+        linea += " | VPN:" if reg.vpn else " |"
+        if reg.paises:
+            linea += " " + " ".join(reg.paises)
+    if reg.notas:
+        linea += " " + reg.notas
+    return linea.strip()
+
+
+_requiere_comillas = re.compile(r'[,"\r\n]').search
+
+
+def _campo_csv(valor: str) -> str:
+    """Escapa un campo CSV solo cuando es necesario."""
+    if _requiere_comillas(valor):
+        return '"' + valor.replace('"', '""') + '"'
+    return valor
+
+
+def _linea_csv(reg: RegistroCorreo) -> str:
+    """Formato CSV: correo,vpn,paises,notas."""
+    return ",".join((
+        _campo_csv(reg.correo),
+        "1" if reg.vpn else "0",
+        " ".join(reg.paises),
+        _campo_csv(reg.notas)
+    ))
+
+
+_codificar_json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _linea_jsonl(reg: RegistroCorreo) -> str:
+    """Formato JSON Lines: un objeto por línea."""
+    return _codificar_json({
+        'correo': reg.correo,
+        'vpn': reg.vpn,
+        'paises': reg.paises,
+        'notas': reg.notas
+    })
+
+
+class ExportadorRegistros:
+    """
+    Exportador de registros en streaming.
+    
+    Formatos soportados:
+    - txt: mismo formato que acepta la importación
+    - csv: columnas correo, vpn, paises, notas (con cabecera)
+    - jsonl: un objeto JSON por línea
+    """
+    
+    FORMATEADORES: Dict[str, Callable[[RegistroCorreo], str]] = {
+        'txt': _linea_txt,
+        'csv': _linea_csv,
+        'jsonl': _linea_jsonl,
+    }
+    
+    CABECERAS: Dict[str, str] = {
+        'csv': "correo,vpn,paises,notas\n",
+    }
+    
+    # Tipos de archivo para los diálogos de guardado
+    TIPOS_ARCHIVO = [
+        ("Archivos de texto", "*.txt"),
+        ("CSV", "*.csv"),
+        ("JSON Lines", "*.jsonl"),
+        ("Todos los archivos", "*.*")
+    ]
+    
+    # Líneas por llamada a writelines
+    TAMAÑO_LOTE = 10000
+    
+    # Tamaño del buffer de escritura en bytes
+    TAMAÑO_BUFFER = 1 << 20
+    
+    # Criterios de partición soportados
+    CRITERIOS_PARTICION = ('pais', 'dominio', 'bloque')
+    
+    # Partición para registros sin país
+    PARTICION_SIN_PAIS = "SIN_PAIS"
+    
+    # Archivos abiertos a la vez como máximo al particionar
+    MAX_ARCHIVOS_ABIERTOS = 32
+    
+    # Líneas pendientes por partición antes de escribirlas
+    LOTE_PARTICION = 1000
+    
+    # Líneas pendientes en total antes de vaciar todas las particiones
+    MAX_PENDIENTES = 100000
+    
+    # Buffer por archivo al particionar (hay varios abiertos a la vez)
+    TAMAÑO_BUFFER_PARTICION = 1 << 16
+    
+    NOMBRE_MANIFIESTO = "manifest.json"
+    
+    @classmethod
+    def get_formateador(cls, formato: str = 'txt') -> Callable[[RegistroCorreo], str]:
+        """
+        Obtiene la función que convierte un registro en una línea (sin salto).
+        
+        Args:
+            formato: 'txt', 'csv' o 'jsonl'.
+        
+        Returns:
+            Función registro -> línea.
+        
+        Raises:
+            ValueError: Si el formato no está soportado.
+        """
+        try:
+            return cls.FORMATEADORES[formato]
+        except KeyError:
+            raise ValueError(f"Formato de exportación no soportado: {formato}")
+    
+    @staticmethod
+    def formato_desde_ruta(ruta: str) -> str:
+        """
+        Deduce el formato a partir de la extensión del archivo.
+        
+        Args:
+            ruta: Ruta del archivo de destino.
+        
+        Returns:
+            'csv', 'jsonl' o 'txt' (por defecto).
+        """
+        extension = os.path.splitext(ruta)[1].lower().lstrip('.')
+        if extension in ('csv', 'jsonl'):
+            return extension
+        return 'txt'
+    
+    @classmethod
+    def formatear(cls, registros: Iterable[RegistroCorreo], formato: str = 'txt') -> List[str]:
+        """
+        Formatea registros como líneas sin salto final.
+        
+        Args:
+            registros: Registros a formatear.
+            formato: Formato de salida.
+        
+        Returns:
+            Lista de líneas.
+        """
+        return list(map(cls.get_formateador(formato), registros))
+    
+    @classmethod
+    def lotes_lineas(
+        cls,
+        registros: Iterable[RegistroCorreo],
+        formato: str = 'txt'
+    ) -> Iterator[List[str]]:
+        """
+        Genera lotes de líneas terminadas en salto de línea.
+        
+        Args:
+            registros: Registros a formatear.
+            formato: Formato de salida.
+        
+        Yields:
+            Listas de hasta TAMAÑO_LOTE líneas.
+        """
+        formateador = cls.get_formateador(formato)
+        iterador = iter(registros)
+        while True:
+            lote = [formateador(reg) + "\n" for reg in islice(iterador, cls.TAMAÑO_LOTE)]
+            if not lote:
+                return
+            yield lote
+    
+    @classmethod
+    def escribir(cls, archivo, registros: Iterable[RegistroCorreo], formato: str = 'txt') -> int:
+        """
+        Escribe registros en un archivo ya abierto.
+        
+        Args:
+            archivo: Archivo de texto abierto para escritura.
+            registros: Registros a escribir.
+            formato: Formato de salida.
+        
+        Returns:
+            Cantidad de registros escritos.
+        """
+        escritos = 0
+        cabecera = cls.CABECERAS.get(formato)
+        if cabecera:
+            archivo.write(cabecera)
+        for lote in cls.lotes_lineas(registros, formato):
+            archivo.writelines(lote)
+            escritos += len(lote)
+        return escritos
+    
+    @classmethod
+    def exportar(
+        cls,
+        registros: Iterable[RegistroCorreo],
+        ruta: str,
+        formato: Optional[str] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Exporta registros a un archivo.
+        
+        Args:
+            registros: Registros a exportar.
+            ruta: Ruta del archivo de destino.
+            formato: Formato de salida (None para deducirlo de la extensión).
+        
+        Returns:
+            Tupla con (éxito: bool, mensaje de error o None si éxito).
+        """
+        formato = formato or cls.formato_desde_ruta(ruta)
+        try:
+            with open(ruta, 'w', encoding='utf-8', buffering=cls.TAMAÑO_BUFFER) as f:
+                cls.escribir(f, registros, formato)
+            return True, None
+        except IOError as e:
+            return False, f"No se pudo exportar los registros: {e}"
+    
+    @classmethod
+    def exportar_particionado(
+        cls,
+        registros: Iterable[RegistroCorreo],
+        directorio: str,
+        criterio: str,
+        formato: str = 'txt',
+        tamaño_bloque: int = 10000,
+        prefijo: str = "registros"
+    ) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+        """
+        Exporta registros repartidos en varios archivos en una sola pasada.
+        
+        Criterios:
+        - pais: un archivo por país (un registro con varios países se
+          escribe en cada uno; sin país va a SIN_PAIS)
+        - dominio: un archivo por dominio
+        - bloque: archivos de como máximo tamaño_bloque registros
+        
+        Se mantiene un conjunto acotado de archivos abiertos (LRU); los
+        archivos expulsados se reabren en modo añadir. Al terminar se
+        escribe un manifiesto JSON con los registros por partición.
+        
+        Args:
+            registros: Registros a exportar.
+            directorio: Carpeta de destino (se crea si no existe).
+            criterio: 'pais', 'dominio' o 'bloque'.
+            formato: Formato de salida.
+            tamaño_bloque: Registros por archivo con el criterio 'bloque'.
+            prefijo: Prefijo de los nombres de archivo.
+        
+        Returns:
+            Tupla con (conteo por partición o None, mensaje de error o None si éxito).
+        """
+        if criterio not in cls.CRITERIOS_PARTICION:
+            raise ValueError(f"Criterio de partición no soportado: {criterio}")
+        if criterio == 'bloque' and tamaño_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser mayor que cero")
+        
+        formateador = cls.get_formateador(formato)
+        cabecera = cls.CABECERAS.get(formato, "")
+        
+        conteos: Dict[str, int] = {}
+        archivos: Dict[str, str] = {}
+        pendientes: Dict[str, List[str]] = {}
+        abiertos: "OrderedDict[str, object]" = OrderedDict()
+        total_pendientes = 0
+        total_registros = 0
+        
+        def vaciar(particion: str):
+            lineas = pendientes.pop(particion)
+            archivo = abiertos.get(particion)
+            if archivo is None:
+                if len(abiertos) >= cls.MAX_ARCHIVOS_ABIERTOS:
+                    abiertos.popitem(last=False)[1].close()
+                ruta = os.path.join(directorio, archivos[particion])
+                nuevo = not os.path.exists(ruta)
+                archivo = open(
+                    ruta, 'w' if nuevo else 'a',
+                    encoding='utf-8',
+                    buffering=cls.TAMAÑO_BUFFER_PARTICION
+                )
+                if nuevo and cabecera:
+                    archivo.write(cabecera)
+                abiertos[particion] = archivo
+            else:
+                abiertos.move_to_end(particion)
+            archivo.writelines(lineas)
+        
+        try:
+            os.makedirs(directorio, exist_ok=True)
+            
+            for n, reg in enumerate(registros):
+                total_registros += 1
+                if criterio == 'bloque':
+                    claves = (f"{n // tamaño_bloque + 1:04d}",)
+                elif criterio == 'dominio':
+                    claves = (reg.get_email_base().rpartition('@')[2].lower(),)
+                else:
+                    claves = reg.paises or (cls.PARTICION_SIN_PAIS,)
+                
+                linea = formateador(reg) + "\n"
+                for clave in claves:
+                    lote = pendientes.get(clave)
+                    if lote is None:
+                        if clave not in archivos:
+                            archivos[clave] = cls._nombre_particion(prefijo, clave, formato)
+                            cls._eliminar_si_existe(os.path.join(directorio, archivos[clave]))
+                            conteos[clave] = 0
+                        lote = pendientes[clave] = []
+                    lote.append(linea)
+                    conteos[clave] += 1
+                    total_pendientes += 1
+                    if len(lote) >= cls.LOTE_PARTICION:
+                        total_pendientes -= len(lote)
+                        vaciar(clave)
+                
+                if total_pendientes >= cls.MAX_PENDIENTES:
+                    for clave in list(pendientes):
+                        vaciar(clave)
+                    total_pendientes = 0
+            
+            for clave in list(pendientes):
+                vaciar(clave)
+            
+            manifiesto = {
+                'criterio': criterio,
+                'formato': formato,
+                'total_registros': total_registros,
+                'particiones': [
+                    {'particion': clave, 'archivo': archivos[clave], 'registros': conteos[clave]}
+                    for clave in sorted(conteos)
+                ]
+            }
+            if criterio == 'bloque':
+                manifiesto['tamaño_bloque'] = tamaño_bloque
+            with open(os.path.join(directorio, cls.NOMBRE_MANIFIESTO), 'w', encoding='utf-8') as f:
+                json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+            
+            return conteos, None
+        except IOError as e:
+            return None, f"No se pudo exportar las particiones: {e}"
+        finally:
+            for archivo in abiertos.values():
+                archivo.close()
+    
+    @classmethod
+    def _nombre_particion(cls, prefijo: str, clave: str, formato: str) -> str:
+        """Construye un nombre de archivo seguro para una partición."""
+        segura = re.sub(r'[^A-Za-z0-9._-]', '_', clave) or "_"
+        return f"{prefijo}_{segura}.{formato}"
+    
+    @staticmethod
+    def _eliminar_si_existe(ruta: str):
+        """Elimina el archivo de una exportación anterior para empezar limpio."""
+        if os.path.exists(ruta):
+            os.remove(ruta)
@@ -0,0 +1,178 @@
+"""
+Historial de deshacer/rehacer basado en cambios.
+
+En lugar de copiar la lista de registros antes de cada acción, se anotan
+los cambios elementales que la componen (posiciones insertadas, registros
+quitados con sus posiciones, registros reemplazados con su contenido
+anterior). La memoria usada es proporcional al tamaño de los cambios,
+no al de la lista.
+
+Deshacer un paso aplica el inverso de cada cambio, en orden inverso, a
+través de las mismas mutaciones que lo anotan: los cambios que produce
+forman el paso que se rehace, y viceversa.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Sequence, Union
+
+from ..models.registro import RegistroCorreo
+from ..config import LIMITE_HISTORIAL
+
+
+@dataclass(frozen=True)
+class Insertados:
+    """Registros insertados; posiciones en la lista resultante, ascendentes."""
+    posiciones: Sequence[int]
+
+
+@dataclass(frozen=True)
+class Quitados:
+    """Registros quitados; posiciones en la lista anterior, ascendentes."""
+    posiciones: List[int]
+    registros: List[RegistroCorreo]
+
+
+@dataclass(frozen=True)
+class Reemplazado:
+    """Registro de una posición sustituido; guarda el contenido anterior."""
+    posicion: int
+    anterior: RegistroCorreo
+
+
+Cambio = Union[Insertados, Quitados, Reemplazado]
+
+
+@dataclass
+class Paso:
+    """
+    Acción del usuario que se deshace de una vez.
+    
+    Attributes:
+        descripcion: Texto que se muestra al deshacerla (ej: 'Eliminar 3 correos').
+        cambios: Cambios elementales en el orden en que se aplicaron.
+    """
+    descripcion: str
+    cambios: List[Cambio] = field(default_factory=list)
+
+
+class Historial:
+    """
+    Pilas de deshacer y rehacer.
+    
+    Las mutaciones anotan sus cambios con registrar(); las acciones del
+    usuario los agrupan con accion(). Un cambio anotado fuera de una
+    acción forma un paso propio.
+    """
+    
+    def __init__(self, limite: int = LIMITE_HISTORIAL):
+        """
+        Inicializa el historial.
+        
+        Args:
+            limite: Pasos que se conservan para deshacer.
+        """
+        self.limite = limite
+        self._deshacer: List[Paso] = []
+        self._rehacer: List[Paso] = []
+        # Paso que recibe los cambios anotados (None fuera de una acción)
+        self._abierto: Optional[Paso] = None
+    
+    @contextmanager
+    def accion(self, descripcion: str) -> Iterator[None]:
+        """
+        Agrupa en un solo paso los cambios anotados dentro del bloque.
+        
+        Una acción dentro de otra se une a la exterior.
+        
+        Args:
+            descripcion: Texto del paso.
+        """
+        if self._abierto is not None:
+            yield
+            return
+        paso = Paso(descripcion)
+        self._abierto = paso
+        try:
+            yield
+        finally:
+            self._abierto = None
+            if paso.cambios:
+                self._apilar(self._deshacer, paso)
+                self._rehacer.clear()
+    
+    def registrar(self, cambio: Cambio):
+        """
+        Anota un cambio en el paso abierto.
+        
+        Args:
+            cambio: Cambio elemental ya aplicado a la lista.
+        """
+        if self._abierto is not None:
+            self._abierto.cambios.append(cambio)
+        else:
+            self._apilar(self._deshacer, Paso("Cambio", [cambio]))
+            self._rehacer.clear()
+    
+    def deshacer(self, revertir: Callable[[Cambio], None]) -> Optional[str]:
+        """
+        Deshace el último paso.
+        
+        Args:
+            revertir: Aplica el inverso de un cambio (anotándolo con registrar).
+        
+        Returns:
+            Descripción del paso deshecho, o None si no había ninguno.
+        """
+        return self._mover(self._deshacer, self._rehacer, revertir)
+    
+    def rehacer(self, revertir: Callable[[Cambio], None]) -> Optional[str]:
+        """
+        Rehace el último paso deshecho.
+        
+        Args:
+            revertir: Aplica el inverso de un cambio (anotándolo con registrar).
+        
+        Returns:
+            Descripción del paso rehecho, o None si no había ninguno.
+        """
+        return self._mover(self._rehacer, self._deshacer, revertir)
+    
+    def puede_deshacer(self) -> bool:
+        """Indica si hay algún paso para deshacer."""
+        return bool(self._deshacer)
+    
+    def puede_rehacer(self) -> bool:
+        """Indica si hay algún paso para rehacer."""
+        return bool(self._rehacer)
+    
+    def limpiar(self):
+        """Descarta todos los pasos (ej: al cargar otra lista)."""
+        self._deshacer.clear()
+        self._rehacer.clear()
+    
+    def _mover(
+        self,
+        origen: List[Paso],
+        destino: List[Paso],
+        revertir: Callable[[Cambio], None]
+    ) -> Optional[str]:
+        """Revierte el último paso de una pila y apila su inverso en la otra."""
+        if not origen or self._abierto is not None:
+            return None
+        paso = origen.pop()
+        inverso = Paso(paso.descripcion)
+        self._abierto = inverso
+        try:
+            for cambio in reversed(paso.cambios):
+                revertir(cambio)
+        finally:
+            self._abierto = None
+        self._apilar(destino, inverso)
+        return paso.descripcion
+    
+    def _apilar(self, pila: List[Paso], paso: Paso):
+        """Añade un paso descartando los más antiguos si se supera el límite."""
+        pila.append(paso)
+        if len(pila) > self.limite:
+            del pila[:len(pila) - self.limite]
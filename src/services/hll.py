@@ -0,0 +1,199 @@
+"""
+Conteo aproximado de emails distintos con HyperLogLog.
+
+Para archivos muy grandes, "Contar desde archivo" no necesita guardar
+todos los emails: un sketch HyperLogLog estima los distintos con memoria
+fija (2^precisión bytes) y un error relativo típico de 1.04/sqrt(2^p).
+Se usa un sketch por categoría (únicos, con VPN, con países, existentes
+y nuevos) sobre el archivo leído línea a línea.
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import AbstractSet, Callable, Dict, Iterable, Optional, Tuple
+
+from .parser import ParserCorreos
+from . import instrumentacion
+
+
+# Precisión por defecto: 2^14 registros de un byte (16 KB por sketch, ~0.8% de error típico)
+PRECISION = 14
+
+# Desviaciones típicas del margen informado (2 -> ~95% de confianza)
+SIGMAS_MARGEN = 2
+
+# Cada cuántas líneas se comprueba si se pidió cancelar
+INTERVALO_CANCELACION = 5000
+
+# Categorías que se cuentan, en el orden en que se muestran
+CATEGORIAS = ('unicos', 'con_vpn', 'con_paises', 'existentes', 'nuevos')
+
+
+class HyperLogLog:
+    """
+    Sketch HyperLogLog para estimar la cantidad de valores distintos.
+    
+    Attributes:
+        precision: Bits del hash usados para elegir el registro (4-16).
+    """
+    
+    def __init__(self, precision: int = PRECISION):
+        """
+        Inicializa el sketch vacío.
+        
+        Args:
+            precision: Bits de índice; la memoria es 2^precision bytes.
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("La precisión debe estar entre 4 y 16")
+        self.precision = precision
+        self._m = 1 << precision
+        self._bits_resto = 64 - precision
+        self._mascara_resto = (1 << self._bits_resto) - 1
+        self._registros = bytearray(self._m)
+    
+    def agregar(self, valor: str):
+        """Añade un valor al sketch."""
+        h = int.from_bytes(hashlib.blake2b(valor.encode('utf-8'), digest_size=8).digest(), 'big')
+        indice = h >> self._bits_resto
+        # Posición del primer bit a 1 en el resto del hash (1 = bit más alto)
+        rango = self._bits_resto - (h & self._mascara_resto).bit_length() + 1
+        if rango > self._registros[indice]:
+            self._registros[indice] = rango
+    
+    def combinar(self, otro: 'HyperLogLog'):
+        """Une otro sketch de la misma precisión en este (unión de conjuntos)."""
+        if otro.precision != self.precision:
+            raise ValueError("Solo se pueden combinar sketches de la misma precisión")
+        self._registros = bytearray(map(max, self._registros, otro._registros))
+    
+    def estimar(self) -> int:
+        """Estima la cantidad de valores distintos añadidos."""
+        m = self._m
+        alfa = 0.7213 / (1 + 1.079 / m)
+        suma = math.fsum(2.0 ** -r for r in self._registros)
+        estimacion = alfa * m * m / suma
+        
+        # Corrección para cardinalidades pequeñas (conteo lineal)
+        vacios = self._registros.count(0)
+        if estimacion <= 2.5 * m and vacios:
+            estimacion = m * math.log(m / vacios)
+        return int(round(estimacion))
+    
+    @property
+    def error_relativo(self) -> float:
+        """Error relativo típico (una desviación estándar)."""
+        return 1.04 / math.sqrt(self._m)
+    
+    def __len__(self) -> int:
+        """Retorna la estimación de distintos."""
+        return self.estimar()
+
+
+@dataclass
+class ConteoAproximado:
+    """
+    Resultado de un conteo aproximado.
+    
+    Attributes:
+        lineas: Líneas leídas.
+        validas: Líneas con un correo válido (con repeticiones).
+        estimaciones: Categoría -> emails distintos estimados.
+        error_relativo: Error relativo del margen informado (ej: 0.016).
+        memoria: Bytes usados por los sketches.
+        cancelado: True si el conteo se interrumpió.
+    """
+    lineas: int
+    validas: int
+    estimaciones: Dict[str, int]
+    error_relativo: float
+    memoria: int
+    cancelado: bool = False
+    
+    def margen(self, categoria: str) -> int:
+        """Margen de error absoluto de una categoría."""
+        return int(math.ceil(self.estimaciones[categoria] * self.error_relativo))
+
+
+def contar_aproximado(
+    lineas: Iterable[str],
+    existentes: AbstractSet[str],
+    precision: int = PRECISION,
+    cancelado: Optional[Callable[[], bool]] = None
+) -> ConteoAproximado:
+    """
+    Cuenta emails distintos por categoría con un sketch por categoría.
+    
+    A diferencia del conteo exacto no se guarda qué emails ya se vieron:
+    un email cuenta en una categoría si alguna de sus apariciones cumple
+    la condición (ej: tiene VPN en alguna línea).
+    
+    Args:
+        lineas: Líneas de texto (ej: un archivo abierto).
+        existentes: Claves de los emails de la lista (IndiceRegistros.emails()).
+        precision: Precisión de los sketches.
+        cancelado: Función que indica si se pidió cancelar.
+    
+    Returns:
+        ConteoAproximado con las estimaciones.
+    """
+    sketches = {categoria: HyperLogLog(precision) for categoria in CATEGORIAS}
+    unicos, con_vpn, con_paises = sketches['unicos'], sketches['con_vpn'], sketches['con_paises']
+    ya_existen, nuevos = sketches['existentes'], sketches['nuevos']
+    total_lineas = validas = 0
+    interrumpido = False
+    
+    with instrumentacion.medir('contar.aproximado'):
+        for total_lineas, linea in enumerate(lineas, start=1):
+            if cancelado and total_lineas % INTERVALO_CANCELACION == 0 and cancelado():
+                interrumpido = True
+                break
+            registro = ParserCorreos.parsear_linea(linea)
+            if not registro:
+                continue
+            validas += 1
+            clave = registro.get_clave()
+            unicos.agregar(clave)
+            if registro.vpn:
+                con_vpn.agregar(clave)
+            if registro.paises:
+                con_paises.agregar(clave)
+            (ya_existen if clave in existentes else nuevos).agregar(clave)
+    
+    instrumentacion.contar('contar.lineas', total_lineas)
+    return ConteoAproximado(
+        lineas=total_lineas,
+        validas=validas,
+        estimaciones={categoria: sketch.estimar() for categoria, sketch in sketches.items()},
+        error_relativo=SIGMAS_MARGEN * unicos.error_relativo,
+        memoria=len(sketches) * (1 << precision),
+        cancelado=interrumpido
+    )
+
+
+def contar_archivo_aproximado(
+    ruta: str,
+    existentes: AbstractSet[str],
+    precision: int = PRECISION,
+    cancelado: Optional[Callable[[], bool]] = None
+) -> Tuple[Optional[ConteoAproximado], Optional[str]]:
+    """
+    Cuenta de forma aproximada un archivo leído línea a línea.
+    
+    Args:
+        ruta: Archivo de texto.
+        existentes: Claves de los emails de la lista (IndiceRegistros.emails()).
+        precision: Precisión de los sketches.
+        cancelado: Función que indica si se pidió cancelar.
+    
+    Returns:
+        Tupla con (conteo o None si falló, mensaje de error o None).
+    """
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return contar_aproximado(f, existentes, precision, cancelado), None
+    except UnicodeDecodeError as e:
+        return None, f"El archivo no es texto UTF-8: {e}"
+    except IOError as e:
+        return None, f"No se pudo leer el archivo: {e}"
@@ -0,0 +1,490 @@
+"""
+Servicio de índices para búsqueda y filtrado de registros.
+
+Mantiene índices invertidos y mapas de bits sobre los registros para
+resolver filtros combinados (dominio, país, VPN y subcadena) sin
+recorrer la lista completa.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from typing import AbstractSet, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.registro import RegistroCorreo
+
+
+def _bitmap_desde(slots: Iterable[int]) -> int:
+    """
+    Construye un mapa de bits (entero) a partir de una colección de slots.
+    
+    Args:
+        slots: Posiciones de bit a activar.
+    
+    Returns:
+        Entero con los bits indicados activos.
+    """
+    slots = list(slots)
+    if not slots:
+        return 0
+    bits = bytearray(max(slots) // 8 + 1)
+    for s in slots:
+        bits[s >> 3] |= 1 << (s & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _slots_de_bitmap(bitmap: int) -> List[int]:
+    """
+    Obtiene los slots activos de un mapa de bits en orden ascendente.
+    
+    Args:
+        bitmap: Mapa de bits a recorrer.
+    
+    Returns:
+        Lista ordenada de posiciones de bit activas.
+    """
+    # bin() invertido deja el bit 0 en la posición 0 del string
+    binario = bin(bitmap)[:1:-1]
+    slots = []
+    i = binario.find('1')
+    while i != -1:
+        slots.append(i)
+        i = binario.find('1', i + 1)
+    return slots
+
+
+class IndiceRegistros:
+    """
+    Índices incrementales sobre la lista de registros.
+    
+    Cada registro recibe un slot estable al entrar al índice. Los slots
+    crecen en el mismo orden que la lista, por lo que la posición actual
+    de un slot se obtiene con una búsqueda binaria sobre los slots vivos.
+    
+    Índices mantenidos:
+    - Dominio → conjunto de slots (índice invertido)
+    - País → mapa de bits sobre CODIGOS_PAIS
+    - VPN → mapa de bits
+    - N-gramas de correo y notas → conjunto de slots (búsqueda por subcadena)
+    - Dominio → resumen (registros con VPN, mezcla de países) para la vista agrupada
+    - Clave canónica del email → cantidad de registros (existencia sin recorrer la lista)
+    """
+    
+    TAMAÑO_NGRAMA = 3
+    
+    # Proporción de slots eliminados que dispara una compactación
+    UMBRAL_COMPACTACION = 0.5
+    
+    def __init__(self, registros: Optional[List[RegistroCorreo]] = None):
+        """
+        Inicializa el índice.
+        
+        Args:
+            registros: Registros iniciales (opcional).
+        """
+        # Conteo de registros por clave de email; se vacía y rellena en el
+        # sitio para que las vistas de emails() no queden desconectadas
+        self._por_email: Dict[str, int] = {}
+        self.reconstruir(registros or [])
+    
+    # ==================== Mantenimiento ====================
+    
+    def reconstruir(self, registros: List[RegistroCorreo]):
+        """
+        Reconstruye todos los índices desde cero.
+        
+        Las vistas retornadas por emails() siguen siendo válidas.
+        
+        Args:
+            registros: Lista completa de registros en orden.
+        """
+        self._slots: List[int] = []
+        self._registro_slot: Dict[int, RegistroCorreo] = {}
+        self._por_dominio: Dict[str, Set[int]] = {}
+        self._resumen_dominio: Dict[str, list] = {}
+        self._por_pais: Dict[str, int] = {}
+        self._ngramas: Dict[str, Set[int]] = {}
+        self._por_email.clear()
+        self._vpn = 0
+        self._vivos = 0
+        self._proximo_slot = 0
+        self._eliminados = 0
+        self.agregar(registros)
+    
+    def agregar(self, registros: List[RegistroCorreo]):
+        """
+        Indexa registros añadidos al final de la lista.
+        
+        Args:
+            registros: Registros nuevos, en el orden en que se añadieron.
+        """
+        if not registros:
+            return
+        
+        slots_pais: Dict[str, List[int]] = {}
+        slots_vpn = []
+        inicio = self._proximo_slot
+        
+        for slot, reg in enumerate(registros, start=inicio):
+            self._slots.append(slot)
+            self._registro_slot[slot] = reg
+            self._indexar_conjuntos(slot, reg)
+            for pais in reg.paises:
+                slots_pais.setdefault(pais, []).append(slot)
+            if reg.vpn:
+                slots_vpn.append(slot)
+        
+        self._proximo_slot = inicio + len(registros)
+        
+        # Los mapas de bits se construyen por lotes para no desplazar
+        # enteros grandes una vez por registro
+        for pais, slots in slots_pais.items():
+            self._por_pais[pais] = self._por_pais.get(pais, 0) | _bitmap_desde(slots)
+        self._vpn |= _bitmap_desde(slots_vpn)
+        self._vivos |= _bitmap_desde(range(inicio, self._proximo_slot))
+    
+    def eliminar(self, posiciones: Iterable[int]):
+        """
+        Quita del índice los registros en las posiciones indicadas.
+        
+        Las posiciones se refieren a la lista anterior a la eliminación.
+        
+        Args:
+            posiciones: Posiciones de los registros eliminados.
+        """
+        posiciones = set(posiciones)
+        if not posiciones:
+            return
+        
+        quitados = [self._slots[p] for p in posiciones]
+        for slot in quitados:
+            self._desindexar_conjuntos(slot, self._registro_slot.pop(slot))
+        
+        mascara = ~_bitmap_desde(quitados)
+        for pais in list(self._por_pais):
+            self._por_pais[pais] &= mascara
+            if not self._por_pais[pais]:
+                del self._por_pais[pais]
+        self._vpn &= mascara
+        self._vivos &= mascara
+        
+        self._slots = [s for i, s in enumerate(self._slots) if i not in posiciones]
+        self._eliminados += len(quitados)
+        
+        if self._eliminados > self.UMBRAL_COMPACTACION * self._proximo_slot:
+            self.reconstruir([self._registro_slot[s] for s in self._slots])
+    
+    def insertar(self, posiciones: List[int], registros: List[RegistroCorreo]):
+        """
+        Indexa registros insertados en medio de la lista (ej: al deshacer una eliminación).
+        
+        Cada registro toma un slot libre entre los de sus vecinos, de modo
+        que los slots siguen en el orden de la lista. Los slots de los
+        registros eliminados quedan libres hasta la próxima compactación;
+        si ya no hay hueco, el índice se reconstruye.
+        
+        Args:
+            posiciones: Posiciones en la lista ya con los registros
+                insertados, en orden ascendente.
+            registros: Registros insertados, en el mismo orden.
+        """
+        if not posiciones:
+            return
+        
+        slots = self._slots
+        nuevos_slots: List[int] = []
+        asignados: List[int] = []
+        anterior = -1
+        k = 0
+        for j, posicion in enumerate(posiciones):
+            # Slots existentes que quedan antes de esta posición
+            hasta = posicion - j
+            if hasta > k:
+                nuevos_slots.extend(slots[k:hasta])
+                anterior = slots[hasta - 1]
+                k = hasta
+            slot = anterior + 1
+            if k < len(slots) and slot >= slots[k]:
+                self.reconstruir(self._intercalar(posiciones, registros))
+                return
+            nuevos_slots.append(slot)
+            asignados.append(slot)
+            anterior = slot
+        nuevos_slots.extend(slots[k:])
+        self._slots = nuevos_slots
+        
+        slots_pais: Dict[str, List[int]] = {}
+        slots_vpn = []
+        for slot, reg in zip(asignados, registros):
+            self._registro_slot[slot] = reg
+            self._indexar_conjuntos(slot, reg)
+            for pais in reg.paises:
+                slots_pais.setdefault(pais, []).append(slot)
+            if reg.vpn:
+                slots_vpn.append(slot)
+        
+        for pais, slots_grupo in slots_pais.items():
+            self._por_pais[pais] = self._por_pais.get(pais, 0) | _bitmap_desde(slots_grupo)
+        self._vpn |= _bitmap_desde(slots_vpn)
+        self._vivos |= _bitmap_desde(asignados)
+        
+        self._eliminados -= sum(1 for slot in asignados if slot < self._proximo_slot)
+        self._proximo_slot = max(self._proximo_slot, asignados[-1] + 1)
+    
+    def _intercalar(self, posiciones: List[int], registros: List[RegistroCorreo]) -> List[RegistroCorreo]:
+        """Lista completa de registros con los nuevos intercalados en sus posiciones."""
+        actuales = [self._registro_slot[s] for s in self._slots]
+        resultado = []
+        k = 0
+        for j, (posicion, reg) in enumerate(zip(posiciones, registros)):
+            resultado.extend(actuales[k:posicion - j])
+            resultado.append(reg)
+            k = posicion - j
+        resultado.extend(actuales[k:])
+        return resultado
+    
+    def reemplazar(self, posicion: int, registro: RegistroCorreo):
+        """
+        Actualiza el índice tras editar el registro de una posición.
+        
+        Args:
+            posicion: Posición del registro editado.
+            registro: Nuevo contenido del registro.
+        """
+        slot = self._slots[posicion]
+        anterior = self._registro_slot[slot]
+        self._desindexar_conjuntos(slot, anterior)
+        
+        bit = 1 << slot
+        for pais in anterior.paises:
+            if pais in self._por_pais:
+                self._por_pais[pais] &= ~bit
+                if not self._por_pais[pais]:
+                    del self._por_pais[pais]
+        self._vpn &= ~bit
+        
+        self._registro_slot[slot] = registro
+        self._indexar_conjuntos(slot, registro)
+        for pais in registro.paises:
+            self._por_pais[pais] = self._por_pais.get(pais, 0) | bit
+        if registro.vpn:
+            self._vpn |= bit
+    
+    def _indexar_conjuntos(self, slot: int, registro: RegistroCorreo):
+        """Añade un slot a los índices basados en conjuntos y al resumen de su dominio."""
+        dominio = self._dominio(registro)
+        self._por_dominio.setdefault(dominio, set()).add(slot)
+        
+        resumen = self._resumen_dominio.setdefault(dominio, [0, Counter()])
+        if registro.vpn:
+            resumen[0] += 1
+        resumen[1].update(registro.paises)
+        
+        email = self._email(registro)
+        self._por_email[email] = self._por_email.get(email, 0) + 1
+        
+        for ngrama in self._ngramas_registro(registro):
+            self._ngramas.setdefault(ngrama, set()).add(slot)
+    
+    def _desindexar_conjuntos(self, slot: int, registro: RegistroCorreo):
+        """Quita un slot de los índices basados en conjuntos y del resumen de su dominio."""
+        dominio = self._dominio(registro)
+        slots = self._por_dominio.get(dominio)
+        if slots is not None:
+            slots.discard(slot)
+            if not slots:
+                del self._por_dominio[dominio]
+                del self._resumen_dominio[dominio]
+            else:
+                resumen = self._resumen_dominio[dominio]
+                if registro.vpn:
+                    resumen[0] -= 1
+                paises = resumen[1]
+                for pais in registro.paises:
+                    paises[pais] -= 1
+                    if paises[pais] <= 0:
+                        del paises[pais]
+        
+        email = self._email(registro)
+        restantes = self._por_email.get(email, 0) - 1
+        if restantes > 0:
+            self._por_email[email] = restantes
+        else:
+            self._por_email.pop(email, None)
+        
+        for ngrama in self._ngramas_registro(registro):
+            slots = self._ngramas.get(ngrama)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del self._ngramas[ngrama]
+    
+    # ==================== Consultas ====================
+    
+    def filtrar(
+        self,
+        dominio: Optional[str] = None,
+        pais: Optional[str] = None,
+        vpn: Optional[bool] = None,
+        texto: str = ""
+    ) -> Optional[List[int]]:
+        """
+        Resuelve un filtro combinado (AND) sobre los índices.
+        
+        Args:
+            dominio: Dominio exacto (ej: 'gmail.com').
+            pais: Código de país (ej: 'BR').
+            vpn: True para solo con VPN, False para solo sin VPN.
+            texto: Subcadena a buscar en correo o notas.
+        
+        Returns:
+            Lista ordenada de posiciones que cumplen el filtro,
+            o None si no hay ningún criterio activo.
+        """
+        texto = texto.strip().lower()
+        if not (dominio or pais or vpn is not None or texto):
+            return None
+        
+        conjuntos: List[Set[int]] = []
+        if dominio:
+            conjuntos.append(self._por_dominio.get(dominio.lower(), set()))
+        if len(texto) >= self.TAMAÑO_NGRAMA:
+            conjuntos.extend(
+                self._ngramas.get(ngrama, set())
+                for ngrama in self._ngramas_texto(texto)
+            )
+        
+        mascara = None
+        if pais:
+            mascara = self._por_pais.get(pais.upper(), 0)
+        if vpn is not None:
+            mascara_vpn = self._vpn if vpn else self._vivos & ~self._vpn
+            mascara = mascara_vpn if mascara is None else mascara & mascara_vpn
+        
+        if conjuntos:
+            conjuntos.sort(key=len)
+            candidatos = set(conjuntos[0])
+            for conjunto in conjuntos[1:]:
+                candidatos &= conjunto
+                if not candidatos:
+                    break
+            if mascara is not None:
+                candidatos = _slots_de_bitmap(_bitmap_desde(candidatos) & mascara)
+            else:
+                candidatos = sorted(candidatos)
+        elif mascara is not None:
+            candidatos = _slots_de_bitmap(mascara)
+        else:
+            candidatos = self._slots
+        
+        # Los n-gramas solo descartan: se confirma la subcadena real
+        if texto:
+            candidatos = [
+                s for s in candidatos
+                if self._contiene_texto(self._registro_slot[s], texto)
+            ]
+        
+        return [bisect_left(self._slots, s) for s in candidatos]
+    
+    def resumir_dominios(
+        self,
+        posiciones: Optional[List[int]] = None
+    ) -> List[Tuple[str, int, int, Counter]]:
+        """
+        Obtiene el resumen por dominio para la vista agrupada.
+        
+        Sin posiciones usa los resúmenes mantenidos incrementalmente;
+        con posiciones (resultado de un filtro) los calcula en una pasada.
+        
+        Args:
+            posiciones: Posiciones a agrupar (None para todas).
+        
+        Returns:
+            Lista de (dominio, total, con_vpn, países) ordenada por total
+            descendente y luego por dominio.
+        """
+        if posiciones is None:
+            grupos = [
+                (dominio, len(self._por_dominio[dominio]), resumen[0], resumen[1])
+                for dominio, resumen in self._resumen_dominio.items()
+            ]
+        else:
+            acumulado: Dict[str, list] = {}
+            for p in posiciones:
+                reg = self._registro_slot[self._slots[p]]
+                grupo = acumulado.setdefault(self._dominio(reg), [0, 0, Counter()])
+                grupo[0] += 1
+                if reg.vpn:
+                    grupo[1] += 1
+                grupo[2].update(reg.paises)
+            grupos = [(dominio, *grupo) for dominio, grupo in acumulado.items()]
+        
+        grupos.sort(key=lambda g: (-g[1], g[0]))
+        return grupos
+    
+    def get_dominios(self) -> List[str]:
+        """Retorna los dominios presentes, ordenados alfabéticamente."""
+        return sorted(self._por_dominio)
+    
+    def get_paises(self) -> List[str]:
+        """Retorna los códigos de país presentes, ordenados alfabéticamente."""
+        return sorted(self._por_pais)
+    
+    def contiene_email(self, clave: str) -> bool:
+        """Indica si algún registro tiene la clave canónica dada (ver RegistroCorreo.get_clave)."""
+        return clave in self._por_email
+    
+    def emails(self) -> AbstractSet[str]:
+        """
+        Retorna las claves canónicas de los emails presentes.
+        
+        Es una vista de solo lectura que sigue los cambios del índice:
+        admite `in` en O(1) sin copiar los emails.
+        """
+        return self._por_email.keys()
+    
+    def reindexar_emails(self):
+        """
+        Reconstruye el índice de emails con las claves actuales de los registros.
+        
+        Se usa tras recalcular las claves al cambiar las reglas de
+        normalización. Se actualiza en el sitio para que las vistas
+        retornadas por emails() sigan siendo válidas.
+        """
+        conteos = Counter(self._email(reg) for reg in self._registro_slot.values())
+        self._por_email.clear()
+        self._por_email.update(conteos)
+    
+    def __len__(self) -> int:
+        """Retorna la cantidad de registros indexados."""
+        return len(self._slots)
+    
+    # ==================== Utilidades ====================
+    
+    @staticmethod
+    def _dominio(registro: RegistroCorreo) -> str:
+        """Obtiene el dominio en minúsculas del correo de un registro."""
+        return registro.get_email_base().rpartition('@')[2].lower()
+    
+    @staticmethod
+    def _email(registro: RegistroCorreo) -> str:
+        """Obtiene la clave canónica del email de un registro."""
+        return registro.get_clave()
+    
+    @classmethod
+    def _ngramas_texto(cls, texto: str) -> Set[str]:
+        """Obtiene los n-gramas de un texto ya normalizado."""
+        n = cls.TAMAÑO_NGRAMA
+        return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+    
+    @classmethod
+    def _ngramas_registro(cls, registro: RegistroCorreo) -> Set[str]:
+        """Obtiene los n-gramas indexables de un registro."""
+        ngramas = cls._ngramas_texto(registro.correo.lower())
+        if registro.notas:
+            ngramas |= cls._ngramas_texto(registro.notas.lower())
+        return ngramas
+    
+    @staticmethod
+    def _contiene_texto(registro: RegistroCorreo, texto: str) -> bool:
+        """Verifica si el texto aparece en el correo o las notas."""
+        return texto in registro.correo.lower() or texto in registro.notas.lower()
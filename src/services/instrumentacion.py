@@ -0,0 +1,204 @@
+"""
+Instrumentación ligera de las operaciones críticas.
+
+Proporciona medidores de tiempo (context managers) y contadores para
+parseo, deduplicación, carga y guardado, dibujado de la tabla y
+portapapeles. Se activa con la variable de entorno VIVASPLAY_PERF o
+desde el menú de configuración; desactivada, medir() solo comprueba un
+booleano y devuelve un context manager vacío compartido.
+
+También permite capturar con cProfile la siguiente operación medida y
+guardar el perfil en un archivo.
+"""
+
+import cProfile
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+# Variable de entorno que activa la instrumentación al arrancar
+VARIABLE_ENTORNO = 'VIVASPLAY_PERF'
+
+# Muestras recientes que se conservan por operación
+MAX_MUESTRAS = 500
+
+_activa = bool(os.environ.get(VARIABLE_ENTORNO))
+_muestras: Dict[str, Deque[float]] = {}
+_totales: Dict[str, int] = {}
+_contadores: Dict[str, int] = {}
+_cerrojo = threading.Lock()
+
+# Captura de perfil pendiente: (ruta, callback(ruta, operacion, error))
+_perfil_pendiente: Optional[Tuple[str, Optional[Callable]]] = None
+
+
+class _MedicionNula:
+    """Context manager vacío usado cuando la instrumentación está desactivada."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+_NULA = _MedicionNula()
+
+
+class _Medicion:
+    """Mide la duración de un bloque y la registra al salir."""
+    
+    __slots__ = ('nombre', 'inicio', 'perfil')
+    
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.perfil = None
+    
+    def __enter__(self):
+        global _perfil_pendiente
+        if _perfil_pendiente is not None:
+            with _cerrojo:
+                pendiente, _perfil_pendiente = _perfil_pendiente, None
+            if pendiente is not None:
+                self.perfil = (cProfile.Profile(), pendiente)
+                self.perfil[0].enable()
+        self.inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        registrar(self.nombre, time.perf_counter() - self.inicio)
+        if self.perfil is not None:
+            perfil, (ruta, callback) = self.perfil
+            perfil.disable()
+            error = None
+            try:
+                perfil.dump_stats(ruta)
+            except OSError as e:
+                error = str(e)
+            if callback:
+                callback(ruta, self.nombre, error)
+        return False
+
+
+def esta_activa() -> bool:
+    """Indica si la instrumentación está activa."""
+    return _activa
+
+
+def activar(activa: bool = True):
+    """Activa o desactiva la instrumentación (las muestras se conservan)."""
+    global _activa
+    _activa = activa
+
+
+def medir(nombre: str):
+    """
+    Mide la duración de un bloque `with`.
+    
+    Args:
+        nombre: Nombre de la operación (ej: 'parser.procesar_texto').
+    
+    Returns:
+        Context manager; vacío si la instrumentación está desactivada.
+    """
+    if not _activa:
+        return _NULA
+    return _Medicion(nombre)
+
+
+def registrar(nombre: str, segundos: float):
+    """Registra una duración medida externamente."""
+    muestras = _muestras.get(nombre)
+    if muestras is None:
+        with _cerrojo:
+            muestras = _muestras.setdefault(nombre, deque(maxlen=MAX_MUESTRAS))
+    muestras.append(segundos)
+    _totales[nombre] = _totales.get(nombre, 0) + 1
+
+
+def contar(nombre: str, cantidad: int = 1):
+    """
+    Incrementa un contador.
+    
+    Args:
+        nombre: Nombre del contador (ej: 'parser.lineas').
+        cantidad: Incremento.
+    """
+    if _activa:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+def capturar_perfil(ruta: str, on_capturado: Optional[Callable[[str, str, Optional[str]], None]] = None):
+    """
+    Perfila con cProfile la siguiente operación medida.
+    
+    Activa la instrumentación si no lo estaba. El callback se invoca en
+    el hilo que ejecutó la operación.
+    
+    Args:
+        ruta: Archivo donde guardar el perfil (formato pstats).
+        on_capturado: Callback(ruta, operación, error o None).
+    """
+    global _perfil_pendiente
+    activar(True)
+    with _cerrojo:
+        _perfil_pendiente = (ruta, on_capturado)
+
+
+def hay_perfil_pendiente() -> bool:
+    """Indica si hay una captura de perfil esperando la siguiente operación."""
+    return _perfil_pendiente is not None
+
+
+def _percentil(ordenadas: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ordenada."""
+    indice = min(len(ordenadas), max(1, math.ceil(p / 100 * len(ordenadas)))) - 1
+    return ordenadas[indice]
+
+
+def get_estadisticas() -> List[Tuple[str, int, float, float, float, float, float]]:
+    """
+    Resume las muestras recientes de cada operación.
+    
+    Returns:
+        Lista de (operación, total de mediciones, última, p50, p90, p99,
+        máximo), con tiempos en milisegundos, ordenada por operación.
+    """
+    with _cerrojo:
+        copias = {nombre: list(muestras) for nombre, muestras in _muestras.items()}
+    
+    resumen = []
+    for nombre in sorted(copias):
+        muestras = copias[nombre]
+        if not muestras:
+            continue
+        ordenadas = sorted(muestras)
+        resumen.append((
+            nombre,
+            _totales.get(nombre, len(muestras)),
+            muestras[-1] * 1000,
+            _percentil(ordenadas, 50) * 1000,
+            _percentil(ordenadas, 90) * 1000,
+            _percentil(ordenadas, 99) * 1000,
+            ordenadas[-1] * 1000
+        ))
+    return resumen
+
+
+def get_contadores() -> Dict[str, int]:
+    """Retorna una copia de los contadores."""
+    return dict(_contadores)
+
+
+def limpiar():
+    """Descarta todas las muestras y contadores."""
+    with _cerrojo:
+        _muestras.clear()
+        _totales.clear()
+        _contadores.clear()
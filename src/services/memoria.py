@@ -0,0 +1,213 @@
+"""
+Diagnóstico de uso de memoria.
+
+Con la variable de entorno VIVASPLAY_MEMORIA (o al iniciarlo desde el
+menú de configuración) se sigue la memoria con tracemalloc y se toman
+instantáneas en puntos clave (tras cargar, tras importar, tras dibujar
+la tabla). El informe muestra bytes por registro, los principales sitios
+de asignación y una estimación de la memoria de los items de la tabla
+en Tcl/Tk, que tracemalloc no ve.
+"""
+
+import os
+import sys
+import tracemalloc
+from typing import List, Optional, Sequence, Tuple
+
+from ..models.registro import RegistroCorreo
+from ..config import VARIABLE_MEMORIA as VARIABLE_ENTORNO
+
+
+# Marcos de pila guardados por asignación
+PROFUNDIDAD = 5
+
+# Instantáneas que se conservan como máximo
+MAX_INSTANTANEAS = 10
+
+# Registros que se miden uno a uno para estimar su tamaño
+MUESTRA_REGISTROS = 1000
+
+# Modelo aproximado del coste de un item de ttk::treeview en 64 bits:
+# estructura del item, entrada en la tabla hash e identificador, más
+# la lista de valores y un Tcl_Obj por columna (además del texto)
+COSTE_ITEM_TK = 256
+COSTE_TCL_OBJ = 48
+COSTE_LISTA_TK = 48
+
+# Instantáneas: (etiqueta, instantánea, bytes en uso, registros)
+_instantaneas: List[Tuple[str, tracemalloc.Snapshot, int, int]] = []
+
+
+def iniciar():
+    """Empieza a seguir las asignaciones (si no se estaba haciendo)."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(PROFUNDIDAD)
+
+
+def esta_activo() -> bool:
+    """Indica si se están siguiendo las asignaciones."""
+    return tracemalloc.is_tracing()
+
+
+def detener():
+    """Deja de seguir las asignaciones y descarta las instantáneas."""
+    _instantaneas.clear()
+    tracemalloc.stop()
+
+
+def instantanea(etiqueta: str, registros: int):
+    """
+    Toma una instantánea si el diagnóstico está activo.
+    
+    Args:
+        etiqueta: Punto en el que se toma (ej: 'carga').
+        registros: Registros en memoria en ese momento.
+    """
+    if not tracemalloc.is_tracing():
+        return
+    captura = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    actual, _ = tracemalloc.get_traced_memory()
+    _instantaneas.append((etiqueta, captura, actual, registros))
+    if len(_instantaneas) > MAX_INSTANTANEAS:
+        # Se conserva la primera como referencia
+        del _instantaneas[1]
+
+
+def tamaño_registro(reg: RegistroCorreo) -> int:
+    """Bytes de un registro y sus atributos (las cadenas compartidas cuentan en cada uno)."""
+    tamaño = sys.getsizeof(reg) + sys.getsizeof(reg.__dict__)
+    tamaño += sys.getsizeof(reg.correo) + sys.getsizeof(reg.notas)
+    tamaño += sys.getsizeof(reg.paises) + sum(sys.getsizeof(p) for p in reg.paises)
+    return tamaño
+
+
+def bytes_por_registro(registros: Sequence[RegistroCorreo]) -> float:
+    """Tamaño medio de los registros sobre una muestra repartida por la lista."""
+    if not registros:
+        return 0.0
+    paso = max(1, len(registros) // MUESTRA_REGISTROS)
+    muestra = registros[::paso]
+    return sum(tamaño_registro(reg) for reg in muestra) / len(muestra)
+
+
+def estimar_items_tabla(total_items: int, muestra_valores: Sequence[Sequence]) -> float:
+    """
+    Estima los bytes que ocupan en Tcl/Tk los items de la tabla.
+    
+    Args:
+        total_items: Items insertados en el Treeview.
+        muestra_valores: Valores de algunos items para medir el texto.
+    
+    Returns:
+        Bytes estimados.
+    """
+    if not total_items:
+        return 0.0
+    if muestra_valores:
+        texto = sum(len(str(v).encode('utf-8')) + 1 for valores in muestra_valores for v in valores)
+        columnas = sum(len(valores) for valores in muestra_valores)
+        por_item = (texto + columnas * (COSTE_TCL_OBJ + 8)) / len(muestra_valores)
+    else:
+        por_item = 0.0
+    return total_items * (COSTE_ITEM_TK + COSTE_LISTA_TK + por_item)
+
+
+def _memoria_proceso() -> Optional[int]:
+    """Memoria residente máxima del proceso en bytes (None si no se puede saber)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+
+def _mb(valor: float) -> str:
+    return f"{valor / (1024 * 1024):.1f} MB"
+
+
+def generar_informe(
+    registros: Sequence[RegistroCorreo],
+    total_items: int = 0,
+    muestra_valores: Sequence[Sequence] = (),
+    top: int = 15
+) -> str:
+    """
+    Construye el informe de memoria.
+    
+    Args:
+        registros: Registros en memoria.
+        total_items: Items de la tabla.
+        muestra_valores: Valores de algunos items de la tabla.
+        top: Sitios de asignación a listar.
+    
+    Returns:
+        Texto del informe.
+    """
+    lineas = []
+    if not tracemalloc.is_tracing():
+        lineas.append("El seguimiento con tracemalloc no está activo.")
+        lineas.append(f"Inícialo desde este diálogo o arranca con {VARIABLE_ENTORNO}=1 para medir desde el inicio.")
+    else:
+        actual, pico = tracemalloc.get_traced_memory()
+        lineas.append(f"Memoria Python (tracemalloc): {_mb(actual)} en uso, pico {_mb(pico)}")
+    
+    rss = _memoria_proceso()
+    if rss is not None:
+        lineas.append(f"Memoria residente máxima del proceso: {_mb(rss)}")
+    
+    if _instantaneas:
+        lineas.append("")
+        lineas.append("Instantáneas:")
+        anterior = None
+        for etiqueta, _, bytes_uso, cantidad in _instantaneas:
+            linea = f"  {etiqueta:<14} {_mb(bytes_uso):>10}  {cantidad} registros"
+            if anterior is not None:
+                delta = bytes_uso - anterior[0]
+                linea += f"  ({'+' if delta >= 0 else ''}{_mb(delta)}"
+                if cantidad != anterior[1]:
+                    linea += f", {delta / (cantidad - anterior[1]):.0f} B por registro añadido"
+                linea += ")"
+            lineas.append(linea)
+            anterior = (bytes_uso, cantidad)
+    
+    lineas.append("")
+    lineas.append(
+        f"Registros: {len(registros)}, ~{bytes_por_registro(registros):.0f} B cada uno "
+        f"(objetos RegistroCorreo, sin índices)"
+    )
+    
+    estimacion = estimar_items_tabla(total_items, muestra_valores)
+    if total_items:
+        lineas.append(
+            f"Tabla: {total_items} items, ~{_mb(estimacion)} estimados en Tcl/Tk "
+            f"(~{estimacion / total_items:.0f} B por item; no incluido en tracemalloc)"
+        )
+    
+    if len(_instantaneas) >= 2:
+        (etiqueta_a, anterior, _, _), (etiqueta_b, ultima, _, _) = _instantaneas[-2], _instantaneas[-1]
+        lineas.append("")
+        lineas.append(f"Principales sitios de asignación ({etiqueta_a} -> {etiqueta_b}):")
+        for estadistica in ultima.compare_to(anterior, 'lineno')[:top]:
+            marco = estadistica.traceback[0]
+            lineas.append(
+                f"  {_mb(estadistica.size_diff):>10}  {estadistica.count_diff:>+9} bloques  "
+                f"{os.path.basename(marco.filename)}:{marco.lineno}"
+            )
+    elif _instantaneas:
+        etiqueta, ultima, _, _ = _instantaneas[-1]
+        lineas.append("")
+        lineas.append(f"Principales sitios de asignación ({etiqueta}):")
+        for estadistica in ultima.statistics('lineno')[:top]:
+            marco = estadistica.traceback[0]
+            lineas.append(
+                f"  {_mb(estadistica.size):>10}  {estadistica.count:>9} bloques  "
+                f"{os.path.basename(marco.filename)}:{marco.lineno}"
+            )
+    
+    return "\n".join(lineas)
+
@@ -6,10 +6,68 @@ desde diferentes fuentes de texto.
 """
 
 import re
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from ..models.registro import RegistroCorreo
-from ..config import PATRON_EMAIL, CODIGOS_PAIS
+from ..config import PATRON_EMAIL, CODIGOS_PAIS, NOMBRES_PAIS, NOMBRES_PAIS_AMBIGUOS, SIGLAS_PAIS
+from .aho_corasick import AutomataAhoCorasick
+from . import instrumentacion
+
+
+# Minúsculas con tilde -> sin tilde (uno a uno, conserva las posiciones)
+_SIN_TILDES = str.maketrans('áàäâãåéèëêíìïîóòöôõúùüûñç', 'aaaaaaeeeeiiiiooooouuuunc')
+
+# Caracteres que, pegados a un nombre de país, indican que es parte de
+# otra palabra o de un correo (ej: brasil@dominio.com, españa2023)
+_CONTINUACION_PALABRA = set('@_%+')
+
+# Nombres ambiguos normalizados como los patrones del autómata
+_AMBIGUOS = frozenset(nombre.lower().translate(_SIN_TILDES) for nombre in NOMBRES_PAIS_AMBIGUOS)
+
+# Autómatas de nombres y de siglas de país (se construyen la primera vez que se usan)
+_automata_paises: Optional[AutomataAhoCorasick] = None
+_automata_siglas: Optional[AutomataAhoCorasick] = None
+
+# Las siglas se recorren con el autómata solo si aparece alguna (búsqueda en C)
+_RE_SIGLAS = re.compile('|'.join(
+    re.escape(sigla) for siglas in SIGLAS_PAIS.values() for sigla in siglas
+))
+
+
+def _get_automata_paises() -> AutomataAhoCorasick:
+    """Retorna el autómata de nombres de país, construyéndolo una sola vez."""
+    global _automata_paises
+    if _automata_paises is None:
+        patrones = {}
+        for codigo, nombres in NOMBRES_PAIS.items():
+            for nombre in nombres:
+                patrones[nombre.lower().translate(_SIN_TILDES)] = codigo
+        _automata_paises = AutomataAhoCorasick(patrones)
+    return _automata_paises
+
+
+def _get_automata_siglas() -> AutomataAhoCorasick:
+    """Retorna el autómata de siglas de país (distingue mayúsculas), construyéndolo una sola vez."""
+    global _automata_siglas
+    if _automata_siglas is None:
+        _automata_siglas = AutomataAhoCorasick({
+            sigla: codigo for codigo, siglas in SIGLAS_PAIS.items() for sigla in siglas
+        })
+    return _automata_siglas
+
+
+def _es_limite(texto: str, posicion: int, paso: int) -> bool:
+    """Indica si el carácter vecino a un nombre (posicion) cierra la palabra."""
+    if not 0 <= posicion < len(texto):
+        return True
+    caracter = texto[posicion]
+    if caracter.isalnum() or caracter in _CONTINUACION_PALABRA:
+        return False
+    if caracter in '.-':
+        # "Brasil." cierra la palabra; "brasil.net" o "brasil-2" no
+        siguiente = posicion + paso
+        return not (0 <= siguiente < len(texto) and texto[siguiente].isalnum())
+    return True
 
 
 class ParserCorreos:
@@ -58,22 +116,112 @@ class ParserCorreos:
             return email + puerto
         return None
     
-    @staticmethod
-    def extraer_paises(texto: str) -> List[str]:
+    @classmethod
+    def extraer_paises(cls, texto: str) -> List[str]:
         """
         Extrae códigos de país de un texto.
         
+        Reconoce los códigos de dos letras y los nombres de país en
+        español o inglés, sus alias y sus siglas (ver config.NOMBRES_PAIS
+        y config.SIGLAS_PAIS).
+        
         Args:
-            texto: Texto que puede contener códigos de país.
-            
+            texto: Texto que puede contener códigos o nombres de país.
+        
         Returns:
             Lista de códigos de país encontrados (ISO 3166-1 alpha-2).
         """
-        palabras = re.findall(r'\b([A-Z]{2})\b', texto.upper())
-        return [p for p in palabras if p in CODIGOS_PAIS]
+        return cls._buscar_paises(texto)[0]
+    
+    @staticmethod
+    def buscar_nombres_pais(texto: str, omitir: Optional[str] = None) -> List[Tuple[int, int, str]]:
+        """
+        Busca nombres y siglas de país como palabras completas.
+        
+        Los nombres se comparan sin distinguir mayúsculas ni tildes, salvo
+        los que también son palabras comunes (ver config.NOMBRES_PAIS_AMBIGUOS),
+        que deben empezar con mayúscula; las siglas (ver config.SIGLAS_PAIS),
+        tal cual, para no confundir "USA" con el verbo "usa". Usa un autómata de Aho-Corasick, así que el coste es lineal en la
+        longitud del texto sin importar cuántos nombres haya. Entre
+        nombres solapados gana el que empieza antes y, a igualdad, el más
+        largo (ej: "Corea del Sur" antes que "Corea").
+        
+        Args:
+            texto: Texto donde buscar.
+            omitir: Fragmento del texto que no se recorre (ej: el correo,
+                que no contiene nombres de país como palabras sueltas).
+        
+        Returns:
+            Lista de (inicio, fin, código) en orden de aparición.
+        """
+        normalizado = texto.lower()
+        if not normalizado.isascii():
+            if len(normalizado) != len(texto):
+                # Algunos caracteres cambian de longitud al pasar a minúsculas
+                # (ej: "İ"): se conserva el primero para no desplazar posiciones
+                normalizado = ''.join(c.lower()[:1] for c in texto)
+            normalizado = normalizado.translate(_SIN_TILDES)
+        
+        posicion = texto.find(omitir) if omitir else -1
+        encontrados = []
+        busquedas = [(_get_automata_paises(), normalizado)]
+        if _RE_SIGLAS.search(texto):
+            busquedas.append((_get_automata_siglas(), texto))
+        for automata, recorrido in busquedas:
+            if posicion < 0:
+                candidatos = automata.buscar(recorrido)
+            else:
+                candidatos = automata.buscar(recorrido, 0, posicion) if posicion else []
+                candidatos += automata.buscar(recorrido, posicion + len(omitir))
+            encontrados.extend(
+                (inicio, fin, codigo) for inicio, fin, codigo in candidatos
+                if _es_limite(recorrido, inicio - 1, -1) and _es_limite(recorrido, fin, 1)
+                and (recorrido[inicio:fin] not in _AMBIGUOS or texto[inicio].isupper())
+            )
+        if len(encontrados) < 2:
+            return encontrados
+        
+        encontrados.sort(key=lambda e: (e[0], -e[1]))
+        elegidos = []
+        for encontrado in encontrados:
+            if not elegidos or encontrado[0] >= elegidos[-1][1]:
+                elegidos.append(encontrado)
+        return elegidos
+    
+    @classmethod
+    def _buscar_paises(cls, texto: str, correo: Optional[str] = None) -> Tuple[List[str], List[Tuple[int, int]]]:
+        """Retorna los códigos de país del texto y los tramos de los nombres encontrados."""
+        nombres = cls.buscar_nombres_pais(texto, correo)
+        if not nombres:
+            palabras = re.findall(r'\b([A-Z]{2})\b', texto.upper())
+            return [p for p in palabras if p in CODIGOS_PAIS], []
+        
+        # Los códigos dentro de un nombre no cuentan (ej: "EE" en "EE.UU.")
+        tramos = [(inicio, fin) for inicio, fin, _ in nombres]
+        apariciones = [(inicio, codigo) for inicio, _, codigo in nombres]
+        for match in re.finditer(r'\b([A-Z]{2})\b', texto.upper()):
+            if match.group(1) in CODIGOS_PAIS and not any(
+                inicio <= match.start() < fin for inicio, fin in tramos
+            ):
+                apariciones.append((match.start(), match.group(1)))
+        apariciones.sort()
+        
+        paises = [codigo for _, codigo in apariciones]
+        nombrados = {codigo for _, _, codigo in nombres}
+        # Un país nombrado y también escrito como código cuenta una vez
+        paises = [
+            codigo for i, codigo in enumerate(paises)
+            if codigo not in nombrados or codigo not in paises[:i]
+        ]
+        return paises, tramos
     
     @staticmethod
-    def _extraer_notas(linea: str, correo: str, paises: List[str]) -> str:
+    def _extraer_notas(
+        linea: str,
+        correo: str,
+        paises: List[str],
+        nombres: Sequence[Tuple[int, int]] = ()
+    ) -> str:
         """
         Extrae notas de una línea, excluyendo el correo, VPN y países.
         
@@ -81,10 +229,16 @@ class ParserCorreos:
             linea: Línea original.
             correo: Correo ya extraído.
             paises: Lista de países ya extraídos.
-            
+            nombres: Tramos (inicio, fin) de la línea con nombres de país.
+        
         Returns:
             Texto de notas limpio.
         """
+        # Remover los nombres de país (de atrás hacia adelante para no
+        # desplazar los tramos pendientes)
+        for inicio, fin in reversed(nombres):
+            linea = linea[:inicio] + ' ' + linea[fin:]
+        
         # Remover el correo de la línea
         texto = linea.replace(correo, '')
         
@@ -128,21 +282,28 @@ class ParserCorreos:
         # Determinar si tiene VPN
         tiene_vpn = bool(re.search(r'\bVPN\b', linea, re.IGNORECASE))
         
-        # Extraer países
-        paises = cls.extraer_paises(linea)
+        # Extraer países (códigos y nombres)
+        paises, nombres = cls._buscar_paises(linea, correo)
         
         # Extraer notas
-        notas = cls._extraer_notas(linea, correo, paises)
+        notas = cls._extraer_notas(linea, correo, paises, nombres)
         
-        return RegistroCorreo(
+        registro = RegistroCorreo(
             correo=correo,
             vpn=tiene_vpn,
             paises=paises,
             notas=notas
         )
+        # La clave canónica se calcula una sola vez, al parsear
+        registro.get_clave()
+        return registro
     
     @classmethod
-    def procesar_texto_a_registros(cls, texto: str) -> List[RegistroCorreo]:
+    def procesar_texto_a_registros(
+        cls,
+        texto: str,
+        parsear_linea: Optional[Callable[[str], Optional[RegistroCorreo]]] = None
+    ) -> List[RegistroCorreo]:
         """
         Procesa un texto y extrae registros de correo.
         
@@ -151,23 +312,49 @@ class ParserCorreos:
         
         Args:
             texto: Texto a procesar (múltiples líneas).
-            
+            parsear_linea: Parser de línea a usar en lugar del heurístico
+                (ej: el de una plantilla de formato).
+        
         Returns:
             Lista de registros válidos encontrados (sin duplicados).
         """
         if not texto:
             return []
         
-        registros = []
-        emails_vistos = set()
-        
-        for linea in texto.splitlines():
-            registro = cls.parsear_linea(linea)
-            if registro:
-                # Evitar duplicados por email base
-                email_base = registro.get_email_base().lower()
-                if email_base not in emails_vistos:
-                    emails_vistos.add(email_base)
-                    registros.append(registro)
+        with instrumentacion.medir('parser.procesar_texto'):
+            lineas = texto.splitlines()
+            registros = [registro for _, registro in cls.iterar_registros(lineas, parsear_linea)]
         
+        instrumentacion.contar('parser.lineas', len(lineas))
+        instrumentacion.contar('parser.registros', len(registros))
         return registros
+    
+    @classmethod
+    def iterar_registros(
+        cls,
+        lineas: Iterable[str],
+        parsear_linea: Optional[Callable[[str], Optional[RegistroCorreo]]] = None
+    ) -> Iterator[Tuple[str, RegistroCorreo]]:
+        """
+        Parsea líneas de una en una sin cargarlas todas en memoria.
+        
+        Aplica la misma deduplicación que procesar_texto_a_registros:
+        solo se produce la primera aparición de cada email base.
+        
+        Args:
+            lineas: Líneas de texto (ej: un archivo abierto).
+            parsear_linea: Parser de línea a usar en lugar del heurístico.
+        
+        Yields:
+            Tuplas (línea original, registro).
+        """
+        parsear_linea = parsear_linea or cls.parsear_linea
+        emails_vistos = set()
+        for linea in lineas:
+            registro = parsear_linea(linea)
+            if registro:
+                # Evitar duplicados por clave canónica del email
+                clave = registro.clave
+                if clave not in emails_vistos:
+                    emails_vistos.add(clave)
+                    yield linea, registro
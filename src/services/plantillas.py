@@ -0,0 +1,288 @@
+"""
+Servicio de plantillas de formato de línea.
+
+Una plantilla describe un formato fijo de línea, por ejemplo
+`pais;correo;puerto;vpn;nota`, ya sea como delimitador + orden de campos
+o como expresión regular con grupos con nombre. Se compila una sola vez
+en un parser que lee cada campo directamente, sin la extracción
+heurística de VPN, países y notas de ParserCorreos.parsear_linea.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..models.registro import RegistroCorreo
+from ..config import ARCHIVO_PLANTILLAS, CODIGOS_PAIS, PATRON_EMAIL
+from .parser import ParserCorreos
+
+
+# Campos que puede tener una plantilla ('_' descarta la columna)
+CAMPOS = ('correo', 'puerto', 'vpn', 'paises', 'notas', '_')
+
+# Otros nombres aceptados para los campos
+SINONIMOS = {
+    'email': 'correo',
+    'port': 'puerto',
+    'pais': 'paises',
+    'country': 'paises',
+    'countries': 'paises',
+    'nota': 'notas',
+    'note': 'notas',
+    'notes': 'notas',
+}
+
+# Valores de la columna VPN que se leen como "sí"
+VALORES_VPN = {'1', 'si', 'sí', 's', 'yes', 'y', 'true', 'vpn', 'x', '✓'}
+
+_RE_EMAIL = re.compile(PATRON_EMAIL)
+_RE_SEPARADOR_PAISES = re.compile(r'[\s,;/|]+')
+
+
+def normalizar_campo(nombre: str) -> str:
+    """Convierte un nombre de campo (o sinónimo) al nombre canónico."""
+    nombre = nombre.strip().lower()
+    return SINONIMOS.get(nombre, nombre)
+
+
+@dataclass(frozen=True)
+class PlantillaFormato:
+    """
+    Definición de un formato de línea.
+    
+    Attributes:
+        nombre: Nombre que se muestra al elegirla.
+        delimitador: Separador de columnas (formato delimitado).
+        campos: Campo de cada columna, en orden (formato delimitado).
+        patron: Expresión regular con grupos con nombre (si no está vacía,
+            se usa en lugar de delimitador y campos).
+    """
+    nombre: str
+    delimitador: str = ";"
+    campos: Tuple[str, ...] = ()
+    patron: str = ""
+    
+    @property
+    def es_regex(self) -> bool:
+        """Indica si la plantilla se define con una expresión regular."""
+        return bool(self.patron)
+    
+    def describir(self) -> str:
+        """Resumen legible del formato (ej: 'paises;correo;puerto')."""
+        if self.es_regex:
+            return self.patron
+        return self.delimitador.join(self.campos)
+    
+    def to_dict(self) -> Dict[str, object]:
+        """Convierte la plantilla a diccionario para serialización."""
+        return {
+            'nombre': self.nombre,
+            'delimitador': self.delimitador,
+            'campos': list(self.campos),
+            'patron': self.patron
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> 'PlantillaFormato':
+        """Crea una plantilla desde un diccionario."""
+        return cls(
+            nombre=str(data.get('nombre', '')),
+            delimitador=str(data.get('delimitador', ';')),
+            campos=tuple(normalizar_campo(c) for c in data.get('campos', [])),
+            patron=str(data.get('patron', ''))
+        )
+
+
+class ParserPlantilla:
+    """
+    Parser compilado a partir de una plantilla.
+    
+    Usar compilar_plantilla, que valida la plantilla y reutiliza el
+    parser ya compilado.
+    """
+    
+    def __init__(self, plantilla: PlantillaFormato):
+        """
+        Compila la plantilla.
+        
+        Args:
+            plantilla: Plantilla a compilar.
+        
+        Raises:
+            ValueError: Si la plantilla no es válida.
+        """
+        self.plantilla = plantilla
+        self._regex: Optional[re.Pattern] = None
+        
+        if plantilla.es_regex:
+            try:
+                self._regex = re.compile(plantilla.patron)
+            except re.error as e:
+                raise ValueError(f"La expresión regular no es válida: {e}")
+            campos = list(self._regex.groupindex)
+            desconocidos = [c for c in campos if c not in CAMPOS]
+            if desconocidos:
+                raise ValueError(
+                    f"Grupos desconocidos: {', '.join(desconocidos)}. "
+                    f"Usa: {', '.join(CAMPOS[:-1])}."
+                )
+        else:
+            if not plantilla.delimitador:
+                raise ValueError("Indica el delimitador de columnas.")
+            campos = list(plantilla.campos)
+            desconocidos = [c for c in campos if c not in CAMPOS]
+            if desconocidos:
+                raise ValueError(
+                    f"Campos desconocidos: {', '.join(desconocidos)}. "
+                    f"Usa: {', '.join(CAMPOS)}."
+                )
+            repetidos = {c for c in campos if c != '_' and campos.count(c) > 1}
+            if repetidos:
+                raise ValueError(f"Campos repetidos: {', '.join(sorted(repetidos))}.")
+        
+        if 'correo' not in campos:
+            raise ValueError("La plantilla debe incluir el campo 'correo'.")
+        
+        # Columna de cada campo (formato delimitado)
+        self._columnas = {c: i for i, c in enumerate(campos) if c != '_'}
+        self._total_columnas = len(campos)
+    
+    def parsear_linea(self, linea: str) -> Optional[RegistroCorreo]:
+        """
+        Parsea una línea con el formato de la plantilla.
+        
+        Args:
+            linea: Línea de texto.
+        
+        Returns:
+            RegistroCorreo si la línea tiene un correo válido, None si no.
+        """
+        if not linea.strip():
+            return None
+        
+        if self._regex is not None:
+            match = self._regex.search(linea)
+            if not match:
+                return None
+            valores = match.groupdict('')
+        else:
+            # La última columna se queda con el resto (ej: notas con el delimitador)
+            partes = linea.split(self.plantilla.delimitador, self._total_columnas - 1)
+            valores = {
+                campo: partes[i] if i < len(partes) else ''
+                for campo, i in self._columnas.items()
+            }
+        
+        correo = valores.get('correo', '').strip()
+        puerto = valores.get('puerto', '').strip()
+        if puerto.isdigit() and ':' not in correo:
+            correo = f"{correo}:{puerto}"
+        if not _RE_EMAIL.match(correo):
+            return None
+        
+        registro = RegistroCorreo(
+            correo=correo,
+            vpn=valores.get('vpn', '').strip().lower() in VALORES_VPN,
+            paises=self._paises(valores.get('paises', '')),
+            notas=valores.get('notas', '').strip()
+        )
+        registro.get_clave()
+        return registro
+    
+    @staticmethod
+    def _paises(valor: str) -> List[str]:
+        """Lee una columna de países: códigos y/o nombres de país."""
+        valor = valor.strip()
+        if not valor:
+            return []
+        paises = [
+            token.upper() for token in _RE_SEPARADOR_PAISES.split(valor)
+            if len(token) == 2 and token.upper() in CODIGOS_PAIS
+        ]
+        for _, _, codigo in ParserCorreos.buscar_nombres_pais(valor):
+            if codigo not in paises:
+                paises.append(codigo)
+        return paises
+
+
+# Parsers ya compilados por plantilla
+_compiladas: Dict[PlantillaFormato, ParserPlantilla] = {}
+
+
+def compilar_plantilla(plantilla: PlantillaFormato) -> Tuple[Optional[ParserPlantilla], Optional[str]]:
+    """
+    Compila una plantilla (o reutiliza la ya compilada).
+    
+    Args:
+        plantilla: Plantilla a compilar.
+    
+    Returns:
+        Tupla con (parser o None si no es válida, mensaje de error o None).
+    """
+    parser = _compiladas.get(plantilla)
+    if parser is not None:
+        return parser, None
+    try:
+        parser = ParserPlantilla(plantilla)
+    except ValueError as e:
+        return None, str(e)
+    _compiladas[plantilla] = parser
+    return parser, None
+
+
+class AlmacenPlantillas:
+    """
+    Guarda las plantillas definidas por el usuario en un archivo JSON.
+    
+    Attributes:
+        archivo: Ruta al archivo de plantillas.
+    """
+    
+    def __init__(self, archivo: str = ARCHIVO_PLANTILLAS):
+        """
+        Inicializa el almacén.
+        
+        Args:
+            archivo: Ruta al archivo JSON de plantillas.
+        """
+        self.archivo = archivo
+    
+    def cargar(self) -> Tuple[List[PlantillaFormato], Optional[str]]:
+        """
+        Carga las plantillas (lista vacía si el archivo no existe).
+        
+        Returns:
+            Tupla con (plantillas, mensaje de error o None si éxito).
+        """
+        if not os.path.exists(self.archivo):
+            return [], None
+        try:
+            with open(self.archivo, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except json.JSONDecodeError as e:
+            return [], f"El archivo de formatos está corrupto: {e}"
+        except IOError as e:
+            return [], f"No se pudo leer el archivo de formatos: {e}"
+        
+        if not isinstance(datos, list):
+            return [], "El archivo de formatos tiene un formato inválido."
+        return [PlantillaFormato.from_dict(d) for d in datos if isinstance(d, dict)], None
+    
+    def guardar(self, plantillas: List[PlantillaFormato]) -> Tuple[bool, Optional[str]]:
+        """
+        Guarda las plantillas.
+        
+        Args:
+            plantillas: Plantillas a guardar.
+        
+        Returns:
+            Tupla con (éxito: bool, mensaje de error o None si éxito).
+        """
+        try:
+            with open(self.archivo, 'w', encoding='utf-8') as f:
+                json.dump([p.to_dict() for p in plantillas], f, indent=2, ensure_ascii=False)
+            return True, None
+        except IOError as e:
+            return False, f"No se pudo guardar el archivo de formatos: {e}"
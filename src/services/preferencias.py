@@ -0,0 +1,69 @@
+"""
+Servicio de preferencias del usuario.
+
+Guarda en un archivo JSON las opciones que se cambian desde la interfaz
+(ej: Config → Normalizar correos por proveedor) para que sigan activas
+al volver a abrir la aplicación.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import ARCHIVO_PREFERENCIAS
+
+
+class AlmacenPreferencias:
+    """
+    Guarda las preferencias del usuario en un archivo JSON.
+    
+    Attributes:
+        archivo: Ruta al archivo de preferencias.
+    """
+    
+    def __init__(self, archivo: str = ARCHIVO_PREFERENCIAS):
+        """
+        Inicializa el almacén.
+        
+        Args:
+            archivo: Ruta al archivo JSON de preferencias.
+        """
+        self.archivo = archivo
+    
+    def cargar(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Carga las preferencias (vacías si el archivo no existe).
+        
+        Returns:
+            Tupla con (preferencias, mensaje de error o None si éxito).
+        """
+        if not os.path.exists(self.archivo):
+            return {}, None
+        try:
+            with open(self.archivo, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+        except json.JSONDecodeError as e:
+            return {}, f"El archivo de preferencias está corrupto: {e}"
+        except IOError as e:
+            return {}, f"No se pudo leer el archivo de preferencias: {e}"
+        
+        if not isinstance(datos, dict):
+            return {}, "El archivo de preferencias tiene un formato inválido."
+        return datos, None
+    
+    def guardar(self, preferencias: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        """
+        Guarda las preferencias.
+        
+        Args:
+            preferencias: Preferencias a guardar.
+        
+        Returns:
+            Tupla con (éxito: bool, mensaje de error o None si éxito).
+        """
+        try:
+            with open(self.archivo, 'w', encoding='utf-8') as f:
+                json.dump(preferencias, f, indent=2, ensure_ascii=False)
+            return True, None
+        except IOError as e:
+            return False, f"No se pudo guardar el archivo de preferencias: {e}"
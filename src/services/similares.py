@@ -0,0 +1,255 @@
+"""
+Servicio de detección de correos casi duplicados.
+
+Encuentra grupos de registros cuyos correos difieren en una errata
+(ej: jhon.doe@gmail.com / john.doe@gmail.com o john@gmial.com /
+john@gmail.com) sin comparar todos los pares entre sí:
+
+- Bloqueo por dominio: las partes locales solo se comparan dentro del
+  mismo dominio, y los dominios parecidos solo se cruzan por la misma
+  parte local.
+- Vecindario de borrados: cada cadena se indexa por sí misma y por sus
+  variantes con un carácter borrado. Dos cadenas a distancia de edición 1
+  (inserción, borrado, sustitución o transposición de vecinos) comparten
+  alguna de esas claves, así que los candidatos salen de un diccionario
+  en tiempo lineal en la cantidad de registros.
+- Cada candidato se verifica con una distancia de edición acotada.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..models.registro import RegistroCorreo
+from . import instrumentacion
+
+
+# Distancia de edición máxima entre partes locales o dominios parecidos.
+# El vecindario de borrados encuentra todos los pares a esta distancia
+DISTANCIA_MAXIMA = 1
+
+# Longitud mínima para comparar una parte local o un dominio: en cadenas
+# cortas una sola errata las convierte en otra dirección legítima
+LONGITUD_MINIMA = 4
+
+# Bloques de candidatos más grandes que esto se descartan (son variantes
+# demasiado comunes y compararlos todos volvería cuadrática la búsqueda)
+MAX_BLOQUE = 50
+
+# Cada cuántos registros se comprueba si se pidió cancelar
+INTERVALO_CANCELACION = 5000
+
+
+@dataclass
+class ResultadoSimilares:
+    """
+    Resultado de una búsqueda de casi duplicados.
+    
+    Attributes:
+        grupos: Posiciones de los registros de cada grupo (2 o más),
+            del grupo más grande al más pequeño.
+        comparaciones: Pares candidatos verificados con la distancia.
+        cancelado: True si la búsqueda se interrumpió.
+    """
+    grupos: List[List[int]] = field(default_factory=list)
+    comparaciones: int = 0
+    cancelado: bool = False
+
+
+class _Uniones:
+    """Conjuntos disjuntos (union-find) sobre posiciones."""
+    
+    def __init__(self):
+        self.padre: Dict[int, int] = {}
+    
+    def raiz(self, x: int) -> int:
+        padre = self.padre
+        padre.setdefault(x, x)
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+    
+    def unir(self, a: int, b: int):
+        ra, rb = self.raiz(a), self.raiz(b)
+        if ra != rb:
+            self.padre[max(ra, rb)] = min(ra, rb)
+
+
+def distancia_acotada(a: str, b: str, maximo: int = DISTANCIA_MAXIMA) -> int:
+    """
+    Distancia de edición con transposiciones de vecinos, acotada.
+    
+    Deja de calcular en cuanto la distancia supera el máximo.
+    
+    Args:
+        a: Primera cadena.
+        b: Segunda cadena.
+        maximo: Distancia a partir de la cual no interesa el valor exacto.
+    
+    Returns:
+        La distancia, o maximo + 1 si es mayor que el máximo.
+    """
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    
+    # El prefijo y el sufijo comunes no cambian la distancia
+    inicio = 0
+    while inicio < len(a) and inicio < len(b) and a[inicio] == b[inicio]:
+        inicio += 1
+    fin = 0
+    while fin < len(a) - inicio and fin < len(b) - inicio and a[-1 - fin] == b[-1 - fin]:
+        fin += 1
+    a, b = a[inicio:len(a) - fin], b[inicio:len(b) - fin]
+    if not a or not b:
+        return min(max(len(a), len(b)), maximo + 1)
+    
+    anterior2: List[int] = []
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        actual = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            coste = 0 if a[i - 1] == b[j - 1] else 1
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + coste)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return min(anterior[-1], maximo + 1)
+
+
+def _pares_cercanos(valores: Iterable[str], resultado: ResultadoSimilares) -> Iterator[Tuple[str, str]]:
+    """
+    Produce los pares de valores distintos a distancia ≤ DISTANCIA_MAXIMA.
+    
+    Los valores se agrupan por el hash de cada variante con un carácter
+    borrado; una colisión de hash solo añade un candidato que la
+    verificación descarta.
+    """
+    bloques: Dict[int, list] = {}
+    for valor in valores:
+        if len(valor) < LONGITUD_MINIMA:
+            continue
+        variantes = {valor}
+        variantes.update(valor[:i] + valor[i + 1:] for i in range(len(valor)))
+        for variante in variantes:
+            clave = hash(variante)
+            bloque = bloques.get(clave)
+            if bloque is None:
+                bloques[clave] = [valor]
+            else:
+                bloque.append(valor)
+    
+    comparados = set()
+    for bloque in bloques.values():
+        if len(bloque) < 2 or len(bloque) > MAX_BLOQUE:
+            continue
+        for i, a in enumerate(bloque):
+            for b in bloque[i + 1:]:
+                par = (a, b) if a < b else (b, a)
+                if a == b or par in comparados:
+                    continue
+                comparados.add(par)
+                resultado.comparaciones += 1
+                if distancia_acotada(a, b) <= DISTANCIA_MAXIMA:
+                    yield par
+
+
+def buscar_similares(
+    registros: Sequence[RegistroCorreo],
+    cancelado: Optional[Callable[[], bool]] = None
+) -> ResultadoSimilares:
+    """
+    Agrupa los registros cuyos correos son casi iguales.
+    
+    Dos registros van al mismo grupo si sus claves canónicas (ver
+    RegistroCorreo.get_clave) coinciden, si tienen el mismo dominio y sus
+    partes locales están a distancia ≤ DISTANCIA_MAXIMA, o si tienen la
+    misma parte local y sus dominios están a esa distancia. Los grupos se
+    cierran por transitividad.
+    
+    Args:
+        registros: Registros a revisar.
+        cancelado: Función que indica si se pidió cancelar.
+    
+    Returns:
+        ResultadoSimilares con los grupos encontrados.
+    """
+    resultado = ResultadoSimilares()
+    cancelado = cancelado or (lambda: False)
+    uniones = _Uniones()
+    
+    with instrumentacion.medir('similares.buscar'):
+        # Dominio -> parte local -> primera posición con esa clave
+        por_dominio: Dict[str, Dict[str, int]] = {}
+        for i, reg in enumerate(registros):
+            if i % INTERVALO_CANCELACION == 0 and cancelado():
+                resultado.cancelado = True
+                return resultado
+            local, _, dominio = reg.get_clave().rpartition('@')
+            locales = por_dominio.setdefault(dominio, {})
+            primera = locales.setdefault(local, i)
+            if primera != i:
+                uniones.unir(primera, i)
+        
+        # Erratas en la parte local, bloqueando por dominio
+        for locales in por_dominio.values():
+            if cancelado():
+                resultado.cancelado = True
+                return resultado
+            if len(locales) < 2:
+                continue
+            for a, b in _pares_cercanos(locales, resultado):
+                uniones.unir(locales[a], locales[b])
+        
+        # Erratas en el dominio, cruzando solo las partes locales comunes
+        for a, b in _pares_cercanos(por_dominio, resultado):
+            locales_a, locales_b = por_dominio[a], por_dominio[b]
+            if len(locales_a) > len(locales_b):
+                locales_a, locales_b = locales_b, locales_a
+            for local, posicion in locales_a.items():
+                otra = locales_b.get(local)
+                if otra is not None:
+                    uniones.unir(posicion, otra)
+        
+        grupos: Dict[int, List[int]] = {}
+        for posicion in uniones.padre:
+            grupos.setdefault(uniones.raiz(posicion), []).append(posicion)
+        resultado.grupos = sorted(
+            (sorted(grupo) for grupo in grupos.values() if len(grupo) > 1),
+            key=lambda grupo: (-len(grupo), grupo[0])
+        )
+    
+    instrumentacion.contar('similares.comparaciones', resultado.comparaciones)
+    return resultado
+
+
+def fusionar_registros(conservar: RegistroCorreo, otros: Iterable[RegistroCorreo]) -> RegistroCorreo:
+    """
+    Combina los datos de varios registros en el que se conserva.
+    
+    Args:
+        conservar: Registro cuyo correo se mantiene.
+        otros: Registros que se funden en él.
+    
+    Returns:
+        Nuevo registro con VPN si alguno la tiene, la unión de países (en
+        orden de aparición) y las notas distintas unidas.
+    """
+    vpn = conservar.vpn
+    paises = list(conservar.paises)
+    notas = [conservar.notas] if conservar.notas else []
+    for reg in otros:
+        vpn = vpn or reg.vpn
+        paises.extend(p for p in reg.paises if p not in paises)
+        if reg.notas and reg.notas not in notas:
+            notas.append(reg.notas)
+    return RegistroCorreo(
+        correo=conservar.correo,
+        vpn=vpn,
+        paises=paises,
+        notas=" ".join(notas),
+        clave=conservar.clave
+    )
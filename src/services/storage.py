@@ -11,6 +11,7 @@ from typing import List, Tuple, Optional
 
 from ..models.registro import RegistroCorreo
 from ..config import ARCHIVO_DATOS
+from . import instrumentacion
 
 
 class StorageJSON:
@@ -44,7 +45,7 @@ class StorageJSON:
         
         try:
             if os.path.exists(self.archivo):
-                with open(self.archivo, 'r', encoding='utf-8') as f:
+                with instrumentacion.medir('storage.cargar'), open(self.archivo, 'r', encoding='utf-8') as f:
                     datos = json.load(f)
                     
                     if isinstance(datos, list):
@@ -78,9 +79,11 @@ class StorageJSON:
             Tupla con (éxito: bool, mensaje de error o None si éxito).
         """
         try:
-            datos = [reg.to_dict() for reg in registros]
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                json.dump(datos, f, indent=2, ensure_ascii=False)
+            with instrumentacion.medir('storage.guardar'):
+                datos = [reg.to_dict() for reg in registros]
+                with open(self.archivo, 'w', encoding='utf-8') as f:
+                    json.dump(datos, f, indent=2, ensure_ascii=False)
+            instrumentacion.contar('storage.registros_guardados', len(registros))
             return True, None
         except IOError as e:
             return False, f"No se pudo guardar el archivo: {e}"
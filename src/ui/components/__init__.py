@@ -2,5 +2,6 @@
 from .tabla import TablaCorreos
 from .toolbar import BarraHerramientas
 from .entrada import PanelEntrada
+from .filtros import BarraFiltros
 
-__all__ = ['TablaCorreos', 'BarraHerramientas', 'PanelEntrada']
+__all__ = ['TablaCorreos', 'BarraHerramientas', 'PanelEntrada', 'BarraFiltros']
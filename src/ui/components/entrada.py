@@ -1,7 +1,8 @@
 """
 Panel de entrada con campo de texto y botones de acción.
 
-Incluye indicador de cantidad de elementos seleccionados.
+Incluye indicador de cantidad de elementos seleccionados y resumen
+de estadísticas de la lista.
 """
 
 import tkinter as tk
@@ -47,17 +48,19 @@ class PanelEntrada(ttk.Frame):
         self.entrada.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         self.entrada.bind("<Return>", lambda e: self._handle_agregar())
         
-        ttk.Button(
+        self.boton_agregar = ttk.Button(
             self,
             text="Agregar",
             command=self._handle_agregar
-        ).pack(side=tk.LEFT, padx=2)
+        )
+        self.boton_agregar.pack(side=tk.LEFT, padx=2)
         
-        ttk.Button(
+        self.boton_eliminar = ttk.Button(
             self,
             text="Eliminar",
             command=self._handle_eliminar
-        ).pack(side=tk.LEFT, padx=2)
+        )
+        self.boton_eliminar.pack(side=tk.LEFT, padx=2)
         
         # Separador visual
         ttk.Separator(self, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=10)
@@ -70,6 +73,15 @@ class PanelEntrada(ttk.Frame):
             foreground='#666666'
         )
         self.etiqueta_seleccion.pack(side=tk.LEFT, padx=5)
+        
+        # Etiqueta de estadísticas de la lista
+        self.etiqueta_estadisticas = ttk.Label(
+            self,
+            text="",
+            font=('Segoe UI', 9),
+            foreground='#666666'
+        )
+        self.etiqueta_estadisticas.pack(side=tk.LEFT, padx=5)
     
     def get_texto(self) -> str:
         """Obtiene el texto del campo de entrada."""
@@ -96,6 +108,20 @@ class PanelEntrada(ttk.Frame):
         
         self.etiqueta_seleccion.config(text=texto)
     
+    def mostrar_mensaje(self, texto: str):
+        """Muestra un mensaje de estado en lugar del contador."""
+        self.etiqueta_seleccion.config(text=texto)
+    
+    def mostrar_estadisticas(self, texto: str):
+        """Muestra el resumen de estadísticas de la lista."""
+        self.etiqueta_estadisticas.config(text=texto)
+    
+    def set_habilitado(self, habilitado: bool):
+        """Habilita o deshabilita la entrada y sus botones."""
+        estado = tk.NORMAL if habilitado else tk.DISABLED
+        for widget in (self.entrada, self.boton_agregar, self.boton_eliminar):
+            widget.config(state=estado)
+    
     def _handle_agregar(self):
         """Maneja el evento de agregar."""
         if self.on_agregar:
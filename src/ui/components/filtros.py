@@ -0,0 +1,189 @@
+"""
+Barra de filtros para la tabla de correos.
+
+Permite filtrar por dominio, país, VPN y texto libre. La escritura
+en el campo de búsqueda se procesa con retardo (debounce).
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional
+
+
+class BarraFiltros(ttk.Frame):
+    """
+    Barra de filtros combinables (AND) sobre la tabla.
+    
+    Attributes:
+        on_cambio: Callback cuando cambian los criterios de filtrado.
+        obtener_dominios: Proveedor de los dominios disponibles.
+        obtener_paises: Proveedor de los países disponibles.
+    """
+    
+    OPCION_TODOS = "Todos"
+    OPCIONES_VPN = {"Todos": None, "Con VPN": True, "Sin VPN": False}
+    
+    # Retardo en ms antes de aplicar lo escrito en la búsqueda
+    RETARDO_ESCRITURA = 250
+    
+    def __init__(
+        self,
+        parent,
+        on_cambio: Optional[Callable[[], None]] = None,
+        obtener_dominios: Optional[Callable[[], List[str]]] = None,
+        obtener_paises: Optional[Callable[[], List[str]]] = None
+    ):
+        """
+        Inicializa la barra de filtros.
+        
+        Args:
+            parent: Widget padre.
+            on_cambio: Callback sin argumentos al cambiar algún filtro.
+            obtener_dominios: Callable que retorna los dominios disponibles.
+            obtener_paises: Callable que retorna los países disponibles.
+        """
+        super().__init__(parent)
+        
+        self.on_cambio = on_cambio
+        self.obtener_dominios = obtener_dominios or (lambda: [])
+        self.obtener_paises = obtener_paises or (lambda: [])
+        
+        self._after_id = None
+        
+        self._crear_widgets()
+    
+    def _crear_widgets(self):
+        """Crea los controles de filtrado."""
+        ttk.Label(self, text="Buscar:").pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.var_texto = tk.StringVar()
+        self.var_texto.trace_add("write", lambda *_: self._programar_cambio())
+        ttk.Entry(self, textvariable=self.var_texto, width=25).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Label(self, text="Dominio:").pack(side=tk.LEFT, padx=(10, 5))
+        self.combo_dominio = ttk.Combobox(
+            self,
+            width=20,
+            state='readonly',
+            values=[self.OPCION_TODOS],
+            postcommand=self._refrescar_dominios
+        )
+        self.combo_dominio.set(self.OPCION_TODOS)
+        self.combo_dominio.pack(side=tk.LEFT, padx=2)
+        self.combo_dominio.bind("<<ComboboxSelected>>", lambda e: self._notificar_cambio())
+        
+        ttk.Label(self, text="País:").pack(side=tk.LEFT, padx=(10, 5))
+        self.combo_pais = ttk.Combobox(
+            self,
+            width=7,
+            state='readonly',
+            values=[self.OPCION_TODOS],
+            postcommand=self._refrescar_paises
+        )
+        self.combo_pais.set(self.OPCION_TODOS)
+        self.combo_pais.pack(side=tk.LEFT, padx=2)
+        self.combo_pais.bind("<<ComboboxSelected>>", lambda e: self._notificar_cambio())
+        
+        ttk.Label(self, text="VPN:").pack(side=tk.LEFT, padx=(10, 5))
+        self.combo_vpn = ttk.Combobox(
+            self,
+            width=8,
+            state='readonly',
+            values=list(self.OPCIONES_VPN)
+        )
+        self.combo_vpn.set(self.OPCION_TODOS)
+        self.combo_vpn.pack(side=tk.LEFT, padx=2)
+        self.combo_vpn.bind("<<ComboboxSelected>>", lambda e: self._notificar_cambio())
+        
+        ttk.Button(self, text="Limpiar", command=self.limpiar).pack(side=tk.LEFT, padx=(10, 2))
+        
+        self.var_agrupar = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self,
+            text="Agrupar por dominio",
+            variable=self.var_agrupar,
+            command=self._notificar_cambio
+        ).pack(side=tk.LEFT, padx=(10, 2))
+        
+        self.etiqueta_resultado = ttk.Label(
+            self,
+            text="",
+            font=('Segoe UI', 9),
+            foreground='#666666'
+        )
+        self.etiqueta_resultado.pack(side=tk.LEFT, padx=5)
+    
+    def get_criterios(self) -> Dict[str, Any]:
+        """
+        Obtiene los criterios de filtrado actuales.
+        
+        Returns:
+            Diccionario con las claves dominio, pais, vpn y texto.
+        """
+        dominio = self.combo_dominio.get()
+        pais = self.combo_pais.get()
+        return {
+            'dominio': None if dominio == self.OPCION_TODOS else dominio,
+            'pais': None if pais == self.OPCION_TODOS else pais,
+            'vpn': self.OPCIONES_VPN.get(self.combo_vpn.get()),
+            'texto': self.var_texto.get()
+        }
+    
+    def hay_filtro(self) -> bool:
+        """Indica si algún criterio de filtrado está activo."""
+        criterios = self.get_criterios()
+        return bool(
+            criterios['dominio'] or criterios['pais']
+            or criterios['vpn'] is not None or criterios['texto'].strip()
+        )
+    
+    def get_agrupado(self) -> bool:
+        """Indica si la tabla debe mostrarse agrupada por dominio."""
+        return self.var_agrupar.get()
+    
+    def mostrar_resultado(self, coincidencias: Optional[int], total: int):
+        """
+        Muestra la cantidad de registros que cumplen el filtro.
+        
+        Args:
+            coincidencias: Registros filtrados, o None si no hay filtro activo.
+            total: Total de registros.
+        """
+        if coincidencias is None:
+            texto = ""
+        else:
+            texto = f"{coincidencias} de {total} coinciden"
+        self.etiqueta_resultado.config(text=texto)
+    
+    def limpiar(self):
+        """Restablece todos los filtros."""
+        self.combo_dominio.set(self.OPCION_TODOS)
+        self.combo_pais.set(self.OPCION_TODOS)
+        self.combo_vpn.set(self.OPCION_TODOS)
+        # Cambiar el texto programa la notificación
+        if self.var_texto.get():
+            self.var_texto.set("")
+        else:
+            self._notificar_cambio()
+    
+    def _refrescar_dominios(self):
+        """Actualiza las opciones de dominio al desplegar el combo."""
+        self.combo_dominio.config(values=[self.OPCION_TODOS] + self.obtener_dominios())
+    
+    def _refrescar_paises(self):
+        """Actualiza las opciones de país al desplegar el combo."""
+        self.combo_pais.config(values=[self.OPCION_TODOS] + self.obtener_paises())
+    
+    def _programar_cambio(self):
+        """Agrupa pulsaciones seguidas en una sola notificación."""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(self.RETARDO_ESCRITURA, self._notificar_cambio)
+    
+    def _notificar_cambio(self):
+        """Notifica que los criterios cambiaron."""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        if self.on_cambio:
+            self.on_cambio()
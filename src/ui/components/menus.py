@@ -21,6 +21,7 @@ class MenuContextual:
         on_copiar: Optional[Callable[[], None]] = None,
         on_copiar_fila: Optional[Callable[[], None]] = None,
         on_eliminar: Optional[Callable[[], None]] = None,
+        on_editar_lote: Optional[Callable[[], None]] = None,
         on_seleccionar_todos: Optional[Callable[[], None]] = None,
         on_deseleccionar: Optional[Callable[[], None]] = None
     ):
@@ -32,6 +33,7 @@ class MenuContextual:
             on_copiar: Callback para copiar correos.
             on_copiar_fila: Callback para copiar filas completas.
             on_eliminar: Callback para eliminar selección.
+            on_editar_lote: Callback para editar la selección en lote.
             on_seleccionar_todos: Callback para seleccionar todos.
             on_deseleccionar: Callback para deseleccionar.
         """
@@ -41,6 +43,7 @@ class MenuContextual:
         self.on_copiar = on_copiar
         self.on_copiar_fila = on_copiar_fila
         self.on_eliminar = on_eliminar
+        self.on_editar_lote = on_editar_lote
         self.on_seleccionar_todos = on_seleccionar_todos
         self.on_deseleccionar = on_deseleccionar
     
@@ -84,6 +87,10 @@ class MenuContextual:
                 command=self.on_copiar_fila or (lambda: None)
             )
             self.menu.add_separator()
+            self.menu.add_command(
+                label=f"Editar {cantidad_seleccionados} seleccionados...",
+                command=self.on_editar_lote or (lambda: None)
+            )
             self.menu.add_command(
                 label=f"Eliminar {cantidad_seleccionados} seleccionados",
                 command=self.on_eliminar or (lambda: None)
@@ -4,11 +4,13 @@ Componente de tabla para mostrar registros de correo.
 Incluye funcionalidad de selección múltiple por arrastre del mouse.
 """
 
+import time
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Callable, Optional, Tuple
+from typing import Callable, Counter, Dict, List, Optional, Tuple
 
 from ...models.registro import RegistroCorreo
+from ...services import instrumentacion
 
 
 class TablaCorreos(ttk.Frame):
@@ -20,19 +22,36 @@ class TablaCorreos(ttk.Frame):
     - Selección múltiple por arrastre del mouse
     - Soporte para Ctrl+Click y Shift+Click
     - Scrollbars horizontal y vertical
+    - Carga progresiva por lotes para listas grandes
+    - Vista agrupada por dominio con expansión perezosa de los grupos
     
     Attributes:
         on_doble_click: Callback cuando se hace doble click en una fila.
         on_seleccion_cambio: Callback cuando cambia la selección.
         on_click_derecho: Callback para menú contextual.
+        on_copiar: Callback para Ctrl+C.
+    
+    Cada fila usa como identificador su posición en la lista de registros,
+    de modo que la selección se traduce a índices sin consultar a Tk.
     """
     
+    # Presupuesto de tiempo por lote en la carga progresiva (segundos)
+    PRESUPUESTO_LOTE = 0.012
+    
+    # Filas que se insertan siempre en el primer lote (una pantalla)
+    FILAS_PRIMER_LOTE = 60
+    
+    # Prefijo de los identificadores de nodos de grupo y sus marcadores
+    PREFIJO_GRUPO = "grupo:"
+    SUFIJO_MARCADOR = "::pendiente"
+    
     def __init__(
         self,
         parent,
         on_doble_click: Optional[Callable[[int], None]] = None,
         on_seleccion_cambio: Optional[Callable[[int], None]] = None,
-        on_click_derecho: Optional[Callable[[tk.Event], None]] = None
+        on_click_derecho: Optional[Callable[[tk.Event], None]] = None,
+        on_copiar: Optional[Callable[[], None]] = None
     ):
         """
         Inicializa la tabla de correos.
@@ -42,17 +61,30 @@ class TablaCorreos(ttk.Frame):
             on_doble_click: Callback(indice) al hacer doble click.
             on_seleccion_cambio: Callback(cantidad) cuando cambia la selección.
             on_click_derecho: Callback(event) para menú contextual.
+            on_copiar: Callback al pulsar Ctrl+C.
         """
         super().__init__(parent)
         
         self.on_doble_click = on_doble_click
         self.on_seleccion_cambio = on_seleccion_cambio
         self.on_click_derecho = on_click_derecho
+        self.on_copiar = on_copiar
         
         # Variables para selección por arrastre
         self._arrastre_inicio_item = None
         self._arrastre_activo = False
         
+        # Cargas progresivas en curso por nodo padre ("" es la raíz):
+        # padre -> [token, after_id, insertadas, total]
+        self._cargas: Dict[str, list] = {}
+        
+        # Registros mostrados (las filas se identifican por su posición)
+        self._registros: List[RegistroCorreo] = []
+        
+        # Estado de la vista agrupada
+        self._modo_agrupado = False
+        self._obtener_posiciones: Optional[Callable[[str], List[int]]] = None
+        
         self._crear_widgets()
         self._configurar_bindings()
     
@@ -96,6 +128,14 @@ class TablaCorreos(ttk.Frame):
         self.tabla.heading("Notas", text="Notas")
         
         self.tabla.grid(row=0, column=0, sticky='nsew')
+        
+        # Indicador de carga progresiva (oculto hasta que se usa)
+        self.etiqueta_carga = ttk.Label(
+            self,
+            text="",
+            font=('Segoe UI', 9),
+            foreground='#666666'
+        )
     
     def _configurar_bindings(self):
         """Configura los eventos de la tabla."""
@@ -106,7 +146,7 @@ class TablaCorreos(ttk.Frame):
         self.tabla.bind("<Button-3>", self._handle_click_derecho)
         
         # Copiar con Ctrl+C
-        self.tabla.bind("<Control-c>", lambda e: self._copiar_seleccion())
+        self.tabla.bind("<Control-c>", self._handle_copiar)
         
         # Selección por arrastre
         self.tabla.bind("<Button-1>", self._on_click_inicio)
@@ -116,37 +156,236 @@ class TablaCorreos(ttk.Frame):
         # Cambio de selección
         self.tabla.bind("<<TreeviewSelect>>", self._handle_seleccion_cambio)
         
+        # Expansión perezosa de grupos
+        self.tabla.bind("<<TreeviewOpen>>", self._handle_abrir_grupo)
+        self.tabla.bind("<<TreeviewClose>>", self._handle_cerrar_grupo)
+        
         # Atajos de teclado
         self.tabla.bind("<Control-a>", lambda e: self.seleccionar_todos())
         self.tabla.bind("<Escape>", lambda e: self.deseleccionar_todos())
     
-    def actualizar(self, registros: List[RegistroCorreo]):
+    def actualizar(
+        self,
+        registros: List[RegistroCorreo],
+        indices: Optional[List[int]] = None,
+        progresivo: bool = False
+    ):
         """
         Actualiza la tabla con los registros proporcionados.
         
+        En modo progresivo las filas se insertan en lotes acotados por
+        tiempo mediante after(), de modo que la ventana sigue respondiendo.
+        Una nueva llamada cancela cualquier carga en curso.
+        
         Args:
             registros: Lista de registros a mostrar.
+            indices: Posiciones de los registros a mostrar (None para todos).
+                La columna No. conserva la posición original en la lista.
+            progresivo: Si True, inserta las filas por lotes.
         """
-        # Limpiar tabla
-        for item in self.tabla.get_children():
-            self.tabla.delete(item)
-        
-        # Insertar registros
-        for i, reg in enumerate(registros, start=1):
-            vpn_texto = "✓" if reg.vpn else ""
-            paises_texto = " ".join(reg.paises) if reg.paises else ""
+        with instrumentacion.medir('tabla.actualizar'):
+            self._limpiar()
+            self._set_modo_agrupado(False)
+            self._registros = registros
+            
+            posiciones = range(len(registros)) if indices is None else indices
             
-            self.tabla.insert("", tk.END, values=(
-                i,
-                reg.correo,
-                vpn_texto,
-                paises_texto,
-                reg.notas
-            ))
+            if progresivo:
+                # El primer lote se inserta de inmediato: la primera pantalla
+                # aparece sin esperar al siguiente ciclo de eventos
+                self._iniciar_carga("", registros, posiciones)
+            else:
+                for i in posiciones:
+                    self.tabla.insert("", tk.END, iid=str(i), values=self._valores_fila(i, registros[i]))
+                instrumentacion.contar('tabla.filas', len(posiciones))
         
         # Notificar cambio de selección (ahora es 0)
         self._handle_seleccion_cambio()
     
+    def actualizar_agrupado(
+        self,
+        registros: List[RegistroCorreo],
+        grupos: List[Tuple[str, int, int, Counter]],
+        obtener_posiciones: Callable[[str], List[int]]
+    ):
+        """
+        Muestra un nodo por dominio con su resumen.
+        
+        Las filas hijas solo se insertan al abrir un nodo y se liberan al
+        cerrarlo, por lo que el coste depende de los grupos abiertos y no
+        del total de registros.
+        
+        Args:
+            registros: Lista de registros.
+            grupos: Lista de (dominio, total, con_vpn, países) a mostrar.
+            obtener_posiciones: Callable(dominio) con las posiciones del grupo.
+        """
+        with instrumentacion.medir('tabla.actualizar_agrupado'):
+            self._limpiar()
+            self._set_modo_agrupado(True)
+            self._registros = registros
+            self._obtener_posiciones = obtener_posiciones
+            
+            for dominio, total, con_vpn, paises in grupos:
+                iid = self.PREFIJO_GRUPO + dominio
+                self.tabla.insert("", tk.END, iid=iid, text=dominio, values=(
+                    "",
+                    f"{total} registros",
+                    con_vpn or "",
+                    self._mezcla_paises(paises),
+                    ""
+                ))
+                # Marcador para que el nodo muestre el indicador de expansión
+                self.tabla.insert(iid, tk.END, iid=iid + self.SUFIJO_MARCADOR)
+        
+        self._handle_seleccion_cambio()
+    
+    def actualizar_filas(self, registros: List[RegistroCorreo], posiciones: List[int]):
+        """
+        Vuelve a pintar en su sitio las filas de los registros editados.
+        
+        Solo toca las filas ya insertadas; las que aún no lo están (carga
+        progresiva o grupos cerrados) tomarán el contenido nuevo al
+        insertarse. No cambia qué filas se muestran ni la selección.
+        
+        Args:
+            registros: Lista de registros (ya con los cambios).
+            posiciones: Posiciones de los registros editados.
+        """
+        with instrumentacion.medir('tabla.actualizar_filas'):
+            self._registros = registros
+            existe, item = self.tabla.exists, self.tabla.item
+            for i in posiciones:
+                iid = str(i)
+                if existe(iid):
+                    item(iid, values=self._valores_fila(i, registros[i]))
+    
+    def esta_cargando(self) -> bool:
+        """Indica si hay una carga progresiva en curso."""
+        return bool(self._cargas)
+    
+    @staticmethod
+    def _valores_fila(indice: int, reg: RegistroCorreo) -> tuple:
+        """Construye los valores de la fila de un registro."""
+        vpn_texto = "✓" if reg.vpn else ""
+        paises_texto = " ".join(reg.paises) if reg.paises else ""
+        return (indice + 1, reg.correo, vpn_texto, paises_texto, reg.notas)
+    
+    @staticmethod
+    def _mezcla_paises(paises: Counter, maximo: int = 3) -> str:
+        """Resume los países más frecuentes de un grupo (ej: 'BR 12, US 3 +2')."""
+        principales = paises.most_common(maximo)
+        texto = ", ".join(f"{pais} {cantidad}" for pais, cantidad in principales)
+        if len(paises) > maximo:
+            texto += f" +{len(paises) - maximo}"
+        return texto
+    
+    def _limpiar(self):
+        """Cancela las cargas en curso y vacía la tabla."""
+        self._cancelar_carga()
+        items = self.tabla.get_children()
+        if items:
+            self.tabla.delete(*items)
+    
+    def _set_modo_agrupado(self, agrupado: bool):
+        """Muestra u oculta la columna de árbol según el modo."""
+        self._modo_agrupado = agrupado
+        if agrupado:
+            self.tabla.column("#0", width=220, stretch=tk.NO)
+            self.tabla.heading("#0", text="Dominio")
+        else:
+            self.tabla.column("#0", width=0, stretch=tk.NO)
+            self.tabla.heading("#0", text="")
+            self._obtener_posiciones = None
+    
+    def _es_grupo(self, item_id: str) -> bool:
+        """Indica si un item es un nodo de grupo o su marcador."""
+        return item_id.startswith(self.PREFIJO_GRUPO)
+    
+    # ==================== Carga progresiva ====================
+    
+    def _iniciar_carga(self, padre: str, registros, posiciones):
+        """
+        Comienza a insertar filas bajo un nodo por lotes.
+        
+        Args:
+            padre: Nodo padre ("" para la raíz).
+            registros: Lista de registros.
+            posiciones: Posiciones a insertar.
+        """
+        self._cancelar_carga(padre)
+        token = object()
+        self._cargas[padre] = [token, None, 0, len(posiciones)]
+        self._continuar_carga(padre, token, registros, posiciones, 0)
+    
+    def _continuar_carga(self, padre: str, token, registros, posiciones, inicio: int):
+        """
+        Inserta un lote de filas y programa el siguiente.
+        
+        Args:
+            padre: Nodo padre de las filas.
+            token: Identificador de la carga; si no es la vigente se descarta.
+            registros: Lista de registros.
+            posiciones: Posiciones a insertar.
+            inicio: Primera posición pendiente dentro de posiciones.
+        """
+        carga = self._cargas.get(padre)
+        if carga is None or carga[0] is not token:
+            return
+        carga[1] = None
+        
+        total = len(posiciones)
+        comienzo = time.perf_counter()
+        limite = comienzo + self.PRESUPUESTO_LOTE
+        minimo = inicio + self.FILAS_PRIMER_LOTE if inicio == 0 else inicio
+        actual = inicio
+        insertar = self.tabla.insert
+        
+        while actual < total:
+            i = posiciones[actual]
+            insertar(padre, tk.END, iid=str(i), values=self._valores_fila(i, registros[i]))
+            actual += 1
+            # Consultar el reloj cada pocas filas abarata el bucle
+            if actual >= minimo and actual % 32 == 0 and time.perf_counter() > limite:
+                break
+        
+        if instrumentacion.esta_activa():
+            instrumentacion.registrar('tabla.lote', time.perf_counter() - comienzo)
+            instrumentacion.contar('tabla.filas', actual - inicio)
+        
+        carga[2] = actual
+        if actual < total:
+            carga[1] = self.after(
+                1, self._continuar_carga, padre, token, registros, posiciones, actual
+            )
+        else:
+            del self._cargas[padre]
+        self._actualizar_indicador_carga()
+    
+    def _cancelar_carga(self, padre: Optional[str] = None):
+        """
+        Cancela cargas progresivas en curso.
+        
+        Args:
+            padre: Nodo cuya carga se cancela (None para todas).
+        """
+        padres = list(self._cargas) if padre is None else [padre]
+        for p in padres:
+            carga = self._cargas.pop(p, None)
+            if carga is not None and carga[1] is not None:
+                self.after_cancel(carga[1])
+        self._actualizar_indicador_carga()
+    
+    def _actualizar_indicador_carga(self):
+        """Muestra el progreso agregado de las cargas en curso."""
+        if not self._cargas:
+            self.etiqueta_carga.grid_remove()
+            return
+        insertadas = sum(c[2] for c in self._cargas.values())
+        total = sum(c[3] for c in self._cargas.values())
+        self.etiqueta_carga.config(text=f"Cargando {insertadas}/{total}...")
+        self.etiqueta_carga.grid(row=2, column=0, sticky='w')
+    
     def get_seleccion(self) -> List[Tuple[int, str]]:
         """
         Obtiene los elementos seleccionados.
@@ -154,21 +393,28 @@ class TablaCorreos(ttk.Frame):
         Returns:
             Lista de tuplas (índice, correo) de elementos seleccionados.
         """
-        seleccion = []
-        for item_id in self.tabla.selection():
-            valores = self.tabla.item(item_id, 'values')
-            indice = int(valores[0]) - 1
-            correo = valores[1]
-            seleccion.append((indice, correo))
-        return seleccion
+        registros = self._registros
+        return [(i, registros[i].correo) for i in self.get_indices_seleccion()]
+    
+    def get_indices_seleccion(self) -> List[int]:
+        """
+        Obtiene las posiciones de los registros seleccionados.
+        
+        Returns:
+            Lista de índices en la lista de registros, en orden de la tabla.
+        """
+        return [
+            int(item_id) for item_id in self.tabla.selection()
+            if not self._es_grupo(item_id)
+        ]
     
     def get_cantidad_seleccionados(self) -> int:
         """Retorna la cantidad de elementos seleccionados."""
         return len(self.tabla.selection())
     
     def seleccionar_todos(self):
-        """Selecciona todos los elementos de la tabla."""
-        todos_items = self.tabla.get_children()
+        """Selecciona todos los elementos de la tabla (en la vista agrupada, los de grupos abiertos)."""
+        todos_items = self._get_filas()
         if todos_items:
             self.tabla.selection_set(todos_items)
         return "break"
@@ -178,14 +424,33 @@ class TablaCorreos(ttk.Frame):
         self.tabla.selection_remove(self.tabla.selection())
         return "break"
     
-    def _copiar_seleccion(self) -> List[str]:
+    def muestra_items(self, maximo: int = 200) -> Tuple[int, List[tuple]]:
         """
-        Obtiene los correos seleccionados para copiar.
+        Cuenta los items del Treeview (grupos incluidos) y toma una muestra de sus valores.
+        
+        Args:
+            maximo: Items de los que leer los valores.
         
         Returns:
-            Lista de correos seleccionados.
+            Tupla (total de items, valores de la muestra).
         """
-        return [correo for _, correo in self.get_seleccion()]
+        items = list(self.tabla.get_children())
+        for grupo in [item for item in items if self._es_grupo(item)]:
+            items.extend(self.tabla.get_children(grupo))
+        paso = max(1, len(items) // maximo)
+        return len(items), [self.tabla.item(item, 'values') for item in items[::paso]]
+    
+    def _get_filas(self) -> List[str]:
+        """Obtiene los items de fila visibles, sin nodos de grupo."""
+        if not self._modo_agrupado:
+            return list(self.tabla.get_children())
+        filas = []
+        for grupo in self.tabla.get_children():
+            filas.extend(
+                item for item in self.tabla.get_children(grupo)
+                if not self._es_grupo(item)
+            )
+        return filas
     
     # ==================== Handlers de eventos ====================
     
@@ -196,14 +461,17 @@ class TablaCorreos(ttk.Frame):
             return
         
         row_id = self.tabla.identify_row(event.y)
-        if not row_id:
+        if not row_id or self._es_grupo(row_id):
             return
         
-        valores = self.tabla.item(row_id, 'values')
-        indice = int(valores[0]) - 1
-        
         if self.on_doble_click:
-            self.on_doble_click(indice)
+            self.on_doble_click(int(row_id))
+    
+    def _handle_copiar(self, event=None):
+        """Maneja Ctrl+C."""
+        if self.on_copiar:
+            self.on_copiar()
+        return "break"
     
     def _handle_click_derecho(self, event):
         """Maneja el click derecho para menú contextual."""
@@ -215,6 +483,32 @@ class TablaCorreos(ttk.Frame):
         if self.on_seleccion_cambio:
             self.on_seleccion_cambio(self.get_cantidad_seleccionados())
     
+    def _handle_abrir_grupo(self, event=None):
+        """Inserta las filas de un grupo al abrirlo."""
+        grupo = self.tabla.focus()
+        if not self._modo_agrupado or not self._es_grupo(grupo) or not self._obtener_posiciones:
+            return
+        
+        hijos = self.tabla.get_children(grupo)
+        if hijos:
+            self.tabla.delete(*hijos)
+        
+        dominio = grupo[len(self.PREFIJO_GRUPO):]
+        self._iniciar_carga(grupo, self._registros, self._obtener_posiciones(dominio))
+    
+    def _handle_cerrar_grupo(self, event=None):
+        """Libera las filas de un grupo al cerrarlo."""
+        grupo = self.tabla.focus()
+        if not self._modo_agrupado or not self._es_grupo(grupo):
+            return
+        
+        self._cancelar_carga(grupo)
+        hijos = self.tabla.get_children(grupo)
+        if hijos:
+            self.tabla.delete(*hijos)
+        self.tabla.insert(grupo, tk.END, iid=grupo + self.SUFIJO_MARCADOR)
+        self._handle_seleccion_cambio()
+    
     # ==================== Selección por arrastre ====================
     
     def _on_click_inicio(self, event):
@@ -235,7 +529,8 @@ class TablaCorreos(ttk.Frame):
         if not item_actual:
             return
         
-        todos_items = self.tabla.get_children()
+        # Solo se arrastra entre filas del mismo nivel (misma lista o mismo grupo)
+        todos_items = self.tabla.get_children(self.tabla.parent(self._arrastre_inicio_item))
         if not todos_items:
             return
         
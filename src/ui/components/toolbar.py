@@ -31,32 +31,36 @@ class BarraHerramientas(ttk.Frame):
                 - añadir_archivo, añadir_portapapeles, añadir_ventana
                 - eliminar_archivo, eliminar_portapapeles, eliminar_ventana
                 - contar_archivo, contar_portapapeles, contar_ventana
-                - exportar
+                - conjunto_no_en_lista, conjunto_en_lista, conjunto_faltan
+                - exportar, exportar_particionado
                 - ver_patron
+                - instrumentacion (recibe True/False), rendimiento, memoria
         """
         super().__init__(parent)
         
         self.callbacks = callbacks
         self.iconos_cargados = {}
+        self.acciones_habilitadas = True
         
-        self._cargar_iconos()
         self._crear_widgets()
     
-    def _cargar_iconos(self):
-        """Carga los iconos necesarios para los botones."""
-        for nombre, ruta in ICONOS.items():
+    def _cargar_icono(self, nombre: str) -> Optional[tk.PhotoImage]:
+        """Carga un icono la primera vez que se pide (solo los que se muestran)."""
+        if nombre not in self.iconos_cargados:
+            ruta = ICONOS.get(nombre)
             try:
-                if os.path.exists(ruta):
+                if ruta and os.path.exists(ruta):
                     self.iconos_cargados[nombre] = tk.PhotoImage(file=ruta)
                 else:
                     self.iconos_cargados[nombre] = None
             except tk.TclError:
                 self.iconos_cargados[nombre] = None
+        return self.iconos_cargados[nombre]
     
     def _crear_widgets(self):
         """Crea los botones y menús de la barra."""
         # Botón de acciones (clip)
-        icono_clip = self.iconos_cargados.get('clip')
+        icono_clip = self._cargar_icono('clip')
         if icono_clip:
             self.boton_archivo = tk.Button(self, image=icono_clip)
             self.boton_archivo.image = icono_clip
@@ -65,13 +69,12 @@ class BarraHerramientas(ttk.Frame):
         
         self.boton_archivo.pack(side=tk.LEFT, padx=2)
         
-        # Menú de acciones
-        self.menu_archivo = tk.Menu(self, tearoff=0)
-        self._crear_menu_acciones()
+        # Menú de acciones (se construye al abrirlo por primera vez)
+        self.menu_archivo = None
         self.boton_archivo.bind("<Button-1>", self._mostrar_menu_archivo)
         
         # Botón de configuración (mail)
-        icono_mail = self.iconos_cargados.get('mail')
+        icono_mail = self._cargar_icono('mail')
         if icono_mail:
             self.boton_config = tk.Button(self, image=icono_mail)
             self.boton_config.image = icono_mail
@@ -86,6 +89,35 @@ class BarraHerramientas(ttk.Frame):
             label="Ver patrón Email",
             command=self.callbacks.get('ver_patron', lambda: None)
         )
+        self.menu_config.add_command(
+            label="Formatos de línea...",
+            command=self.callbacks.get('plantillas', lambda: None)
+        )
+        self.var_normalizacion = tk.BooleanVar(value=False)
+        self.menu_config.add_checkbutton(
+            label="Normalizar correos por proveedor",
+            variable=self.var_normalizacion,
+            command=lambda: self.callbacks.get('normalizacion', lambda activa: None)(
+                self.var_normalizacion.get()
+            )
+        )
+        self.menu_config.add_separator()
+        self.var_instrumentacion = tk.BooleanVar(value=False)
+        self.menu_config.add_checkbutton(
+            label="Medir rendimiento",
+            variable=self.var_instrumentacion,
+            command=lambda: self.callbacks.get('instrumentacion', lambda activa: None)(
+                self.var_instrumentacion.get()
+            )
+        )
+        self.menu_config.add_command(
+            label="Rendimiento...",
+            command=self.callbacks.get('rendimiento', lambda: None)
+        )
+        self.menu_config.add_command(
+            label="Informe de memoria...",
+            command=self.callbacks.get('memoria', lambda: None)
+        )
         self.boton_config.bind("<Button-1>", self._mostrar_menu_config)
     
     def _crear_menu_acciones(self):
@@ -138,14 +170,49 @@ class BarraHerramientas(ttk.Frame):
         )
         self.menu_archivo.add_cascade(label="Contar registros", menu=submenu_contar)
         
+        # Submenú Comparar con archivo
+        submenu_comparar = tk.Menu(self.menu_archivo, tearoff=0)
+        submenu_comparar.add_command(
+            label="Líneas que no están en la lista...",
+            command=self.callbacks.get('conjunto_no_en_lista', lambda: None)
+        )
+        submenu_comparar.add_command(
+            label="Líneas que ya están en la lista...",
+            command=self.callbacks.get('conjunto_en_lista', lambda: None)
+        )
+        submenu_comparar.add_command(
+            label="Registros de la lista que faltan en el archivo...",
+            command=self.callbacks.get('conjunto_faltan', lambda: None)
+        )
+        self.menu_archivo.add_cascade(label="Comparar con archivo", menu=submenu_comparar)
+        self.menu_archivo.add_command(
+            label="Buscar casi duplicados...",
+            command=self.callbacks.get('similares', lambda: None)
+        )
+        
         self.menu_archivo.add_separator()
         self.menu_archivo.add_command(
             label="Exportar registros...",
             command=self.callbacks.get('exportar', lambda: None)
         )
+        self.menu_archivo.add_command(
+            label="Exportar particionado...",
+            command=self.callbacks.get('exportar_particionado', lambda: None)
+        )
+    
+    def set_acciones_habilitadas(self, habilitadas: bool):
+        """Habilita o deshabilita el botón de acciones (p. ej. durante la carga)."""
+        self.acciones_habilitadas = habilitadas
+        self.boton_archivo.config(state=tk.NORMAL if habilitadas else tk.DISABLED)
     
     def _mostrar_menu_archivo(self, event):
         """Muestra el menú de acciones."""
+        # El menú se abre con un binding, que no respeta el estado del botón
+        if not self.acciones_habilitadas:
+            return
+        if self.menu_archivo is None:
+            self.menu_archivo = tk.Menu(self, tearoff=0)
+            self._crear_menu_acciones()
         self.menu_archivo.post(event.x_root, event.y_root)
     
     def _mostrar_menu_config(self, event):
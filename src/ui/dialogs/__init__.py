@@ -1,6 +1,48 @@
-"""Diálogos de la aplicación."""
-from .edicion import DialogoEdicion
-from .importar import DialogoImportar
-from .resultado import mostrar_resultado
+"""
+Diálogos de la aplicación.
 
-__all__ = ['DialogoEdicion', 'DialogoImportar', 'mostrar_resultado']
+Los diálogos se importan la primera vez que se accede a ellos
+(PEP 562): su código no se carga durante el arranque.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # No se ejecutan, pero permiten a PyInstaller y a los analizadores
+    # estáticos ver los submódulos que se cargan bajo demanda
+    from .edicion import DialogoEdicion
+    from .edicion_lote import DialogoEdicionLote
+    from .importar import DialogoImportar
+    from .resultado import mostrar_resultado
+    from .exportar import DialogoExportarParticionado
+    from .diferencia import DialogoDiferencia
+    from .rendimiento import DialogoRendimiento
+    from .memoria import DialogoMemoria
+    from .similares import DialogoSimilares
+    from .plantillas import DialogoPlantillas
+
+# Nombre exportado -> submódulo que lo define
+_MODULOS = {
+    'DialogoEdicion': 'edicion',
+    'DialogoEdicionLote': 'edicion_lote',
+    'DialogoImportar': 'importar',
+    'mostrar_resultado': 'resultado',
+    'DialogoExportarParticionado': 'exportar',
+    'DialogoDiferencia': 'diferencia',
+    'DialogoRendimiento': 'rendimiento',
+    'DialogoMemoria': 'memoria',
+    'DialogoSimilares': 'similares',
+    'DialogoPlantillas': 'plantillas',
+}
+
+__all__ = ['DialogoEdicion', 'DialogoEdicionLote', 'DialogoImportar', 'mostrar_resultado', 'DialogoExportarParticionado', 'DialogoDiferencia', 'DialogoRendimiento', 'DialogoMemoria', 'DialogoSimilares', 'DialogoPlantillas']
+
+
+def __getattr__(nombre: str):
+    """Importa bajo demanda el submódulo que define el nombre pedido."""
+    modulo = _MODULOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nombre)
+    globals()[nombre] = valor
+    return valor
@@ -0,0 +1,245 @@
+"""
+Diálogo de vista previa de una importación (dry-run).
+
+Muestra, paginado, qué registros se insertarían, cuáles ya existen,
+cuáles difieren y cuáles se eliminarían, antes de aplicar los cambios.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Sequence, Tuple
+
+from ...models.registro import RegistroCorreo
+from ...services.diferencias import DiferenciaImportacion
+
+
+class _PaginaRegistros(ttk.Frame):
+    """
+    Treeview paginado sobre una secuencia de filas ya calculadas.
+    
+    Solo se insertan en Tk las filas de la página visible.
+    """
+    
+    FILAS_POR_PAGINA = 100
+    
+    def __init__(self, parent, columnas: Sequence[Tuple[str, int]], filas: Sequence[tuple]):
+        """
+        Inicializa la página.
+        
+        Args:
+            parent: Widget padre.
+            columnas: Lista de (título, ancho).
+            filas: Valores de cada fila.
+        """
+        super().__init__(parent)
+        
+        self.filas = filas
+        self.pagina = 0
+        
+        nombres = [titulo for titulo, _ in columnas]
+        self.tabla = ttk.Treeview(self, columns=nombres, show='headings', height=12)
+        for titulo, ancho in columnas:
+            self.tabla.heading(titulo, text=titulo)
+            self.tabla.column(titulo, width=ancho, anchor=tk.W)
+        
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.tabla.yview)
+        self.tabla.config(yscrollcommand=scrollbar.set)
+        
+        self.tabla.grid(row=0, column=0, sticky='nsew')
+        scrollbar.grid(row=0, column=1, sticky='ns')
+        
+        navegacion = ttk.Frame(self)
+        navegacion.grid(row=1, column=0, columnspan=2, pady=(5, 0))
+        ttk.Button(navegacion, text="◀ Anterior", command=lambda: self._ir(-1)).pack(side=tk.LEFT, padx=2)
+        self.etiqueta_pagina = ttk.Label(navegacion, text="")
+        self.etiqueta_pagina.pack(side=tk.LEFT, padx=10)
+        ttk.Button(navegacion, text="Siguiente ▶", command=lambda: self._ir(1)).pack(side=tk.LEFT, padx=2)
+        
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        
+        self._mostrar_pagina()
+    
+    @property
+    def total_paginas(self) -> int:
+        """Cantidad de páginas (al menos una)."""
+        return max(1, -(-len(self.filas) // self.FILAS_POR_PAGINA))
+    
+    def _ir(self, desplazamiento: int):
+        """Cambia de página."""
+        nueva = min(max(self.pagina + desplazamiento, 0), self.total_paginas - 1)
+        if nueva != self.pagina:
+            self.pagina = nueva
+            self._mostrar_pagina()
+    
+    def _mostrar_pagina(self):
+        """Inserta las filas de la página actual."""
+        items = self.tabla.get_children()
+        if items:
+            self.tabla.delete(*items)
+        
+        inicio = self.pagina * self.FILAS_POR_PAGINA
+        for valores in self.filas[inicio:inicio + self.FILAS_POR_PAGINA]:
+            self.tabla.insert("", tk.END, values=valores)
+        
+        self.etiqueta_pagina.config(
+            text=f"Página {self.pagina + 1} de {self.total_paginas} ({len(self.filas)} filas)"
+        )
+
+
+class _FilasRegistros(Sequence):
+    """Vista perezosa de registros como filas (correo, VPN, países, notas)."""
+    
+    def __init__(self, registros: List[RegistroCorreo]):
+        self.registros = registros
+    
+    def __len__(self) -> int:
+        return len(self.registros)
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._fila(reg) for reg in self.registros[item]]
+        return self._fila(self.registros[item])
+    
+    @staticmethod
+    def _fila(reg: RegistroCorreo) -> tuple:
+        return (reg.correo, "✓" if reg.vpn else "", " ".join(reg.paises), reg.notas)
+
+
+class _FilasModificados(Sequence):
+    """Vista perezosa de registros modificados (correo, campo, actual, entrante)."""
+    
+    def __init__(self, modificados: List[Tuple[int, RegistroCorreo, RegistroCorreo, List[str]]]):
+        self.modificados = modificados
+    
+    def __len__(self) -> int:
+        return len(self.modificados)
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._fila(m) for m in self.modificados[item]]
+        return self._fila(self.modificados[item])
+    
+    @staticmethod
+    def _valor(reg: RegistroCorreo, campo: str) -> str:
+        valor = getattr(reg, campo)
+        if campo == 'vpn':
+            return "Sí" if valor else "No"
+        if campo == 'paises':
+            return " ".join(valor)
+        return valor
+    
+    @classmethod
+    def _fila(cls, modificado) -> tuple:
+        indice, actual, entrante, campos = modificado
+        return (
+            f"{indice + 1}. {actual.correo}",
+            ", ".join(campos),
+            " | ".join(cls._valor(actual, c) for c in campos),
+            " | ".join(cls._valor(entrante, c) for c in campos)
+        )
+
+
+class DialogoDiferencia:
+    """
+    Diálogo modal con la vista previa de una importación.
+    
+    Al aplicar llama al callback con (diferencia, actualizar_modificados);
+    la diferencia ya calculada se aplica sin recalcularla.
+    """
+    
+    COLUMNAS_REGISTRO = [("Correo", 260), ("VPN", 50), ("Países", 90), ("Notas", 180)]
+    COLUMNAS_MODIFICADO = [("Registro", 240), ("Campos", 110), ("Actual", 140), ("Entrante", 140)]
+    
+    def __init__(
+        self,
+        parent: tk.Tk,
+        titulo: str,
+        diferencia: DiferenciaImportacion,
+        registros: List[RegistroCorreo],
+        on_aplicar: Callable[[DiferenciaImportacion, bool], None]
+    ):
+        """
+        Inicializa el diálogo.
+        
+        Args:
+            parent: Ventana padre.
+            titulo: Título de la ventana.
+            diferencia: Diferencia calculada.
+            registros: Lista actual (para mostrar los registros a eliminar).
+            on_aplicar: Callback(diferencia, actualizar_modificados).
+        """
+        self.parent = parent
+        self.titulo = titulo
+        self.diferencia = diferencia
+        self.registros = registros
+        self.on_aplicar = on_aplicar
+        
+        self._crear_dialogo()
+    
+    def _crear_dialogo(self):
+        """Crea y muestra el diálogo."""
+        self.dialogo = tk.Toplevel(self.parent)
+        self.dialogo.title(self.titulo)
+        self.dialogo.transient(self.parent)
+        self.dialogo.grab_set()
+        self.dialogo.geometry("760x460")
+        
+        frame = ttk.Frame(self.dialogo, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        dif = self.diferencia
+        ttk.Label(frame, text=self._resumen(), justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        
+        pestañas = ttk.Notebook(frame)
+        pestañas.pack(fill=tk.BOTH, expand=True)
+        
+        if dif.operacion == 'añadir':
+            self._añadir_pestaña(pestañas, "Nuevos", self.COLUMNAS_REGISTRO, _FilasRegistros(dif.nuevos))
+            self._añadir_pestaña(pestañas, "Con diferencias", self.COLUMNAS_MODIFICADO, _FilasModificados(dif.modificados))
+            self._añadir_pestaña(pestañas, "Duplicados", self.COLUMNAS_REGISTRO, _FilasRegistros(dif.duplicados))
+        else:
+            a_eliminar = [self.registros[i] for i in dif.a_eliminar]
+            self._añadir_pestaña(pestañas, "A eliminar", self.COLUMNAS_REGISTRO, _FilasRegistros(a_eliminar))
+            self._añadir_pestaña(pestañas, "No encontrados", self.COLUMNAS_REGISTRO, _FilasRegistros(dif.no_encontrados))
+        
+        self.var_actualizar = tk.BooleanVar(value=False)
+        if dif.operacion == 'añadir' and dif.modificados:
+            ttk.Checkbutton(
+                frame,
+                text=f"Actualizar también los {len(dif.modificados)} registros con diferencias",
+                variable=self.var_actualizar
+            ).pack(anchor=tk.W, pady=(10, 0))
+        
+        frame_botones = ttk.Frame(frame)
+        frame_botones.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(frame_botones, text="Aplicar", command=self._aplicar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Cancelar", command=self.dialogo.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def _resumen(self) -> str:
+        """Construye el texto de resumen de la diferencia."""
+        dif = self.diferencia
+        if dif.operacion == 'añadir':
+            return (
+                f"Registros recibidos: {dif.total_entrada}\n"
+                f"• Nuevos (se insertarán): {len(dif.nuevos)}\n"
+                f"• Ya existen con diferencias: {len(dif.modificados)}\n"
+                f"• Duplicados sin cambios: {len(dif.duplicados)}"
+            )
+        return (
+            f"Registros recibidos: {dif.total_entrada}\n"
+            f"• Se eliminarán: {len(dif.a_eliminar)}\n"
+            f"• No existen en la lista: {len(dif.no_encontrados)}"
+        )
+    
+    @staticmethod
+    def _añadir_pestaña(pestañas: ttk.Notebook, titulo: str, columnas, filas: Sequence[tuple]):
+        """Añade una pestaña paginada."""
+        pagina = _PaginaRegistros(pestañas, columnas, filas)
+        pestañas.add(pagina, text=f"{titulo} ({len(filas)})")
+    
+    def _aplicar(self):
+        """Cierra el diálogo y aplica la diferencia."""
+        actualizar = self.var_actualizar.get()
+        self.dialogo.destroy()
+        self.on_aplicar(self.diferencia, actualizar)
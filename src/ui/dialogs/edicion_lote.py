@@ -0,0 +1,145 @@
+"""
+Diálogo para editar varios registros a la vez.
+
+Permite fijar, vaciar o añadir VPN, países y notas en todos los
+registros seleccionados con una sola operación.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Callable
+
+from ...services.edicion_lote import AÑADIR, FIJAR, MANTENER, VACIAR, EdicionLote
+from ...config import CODIGOS_PAIS
+
+
+class DialogoEdicionLote:
+    """
+    Diálogo modal de edición en lote.
+    
+    No conoce los registros: construye un EdicionLote y lo entrega al
+    callback, que lo aplica a la selección.
+    """
+    
+    # Texto de cada operación en los desplegables
+    OPCIONES_VPN = {"Mantener": None, "Sí": True, "No": False}
+    OPCIONES_PAISES = {
+        "Mantener": MANTENER, "Reemplazar por": FIJAR, "Añadir": AÑADIR, "Vaciar": VACIAR
+    }
+    OPCIONES_NOTAS = {
+        "Mantener": MANTENER, "Reemplazar por": FIJAR, "Añadir al final": AÑADIR, "Vaciar": VACIAR
+    }
+    
+    def __init__(
+        self,
+        parent: tk.Tk,
+        cantidad: int,
+        on_aplicar: Callable[[EdicionLote], None]
+    ):
+        """
+        Inicializa el diálogo.
+        
+        Args:
+            parent: Ventana padre.
+            cantidad: Cantidad de registros seleccionados.
+            on_aplicar: Callback con la edición a aplicar.
+        """
+        self.parent = parent
+        self.cantidad = cantidad
+        self.on_aplicar = on_aplicar
+        
+        self._crear_dialogo()
+    
+    def _crear_dialogo(self):
+        """Crea y muestra el diálogo."""
+        self.dialogo = tk.Toplevel(self.parent)
+        self.dialogo.title("Editar selección")
+        self.dialogo.transient(self.parent)
+        self.dialogo.grab_set()
+        self.dialogo.geometry("500x260")
+        
+        frame = ttk.Frame(self.dialogo, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.grid_columnconfigure(2, weight=1)
+        
+        ttk.Label(
+            frame, text=f"Los cambios se aplican a {self.cantidad} registros seleccionados."
+        ).grid(row=0, column=0, columnspan=3, sticky=tk.W, pady=(0, 10))
+        
+        # VPN
+        ttk.Label(frame, text="VPN:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.combo_vpn = self._crear_combo(frame, self.OPCIONES_VPN, fila=1)
+        
+        # Países
+        ttk.Label(frame, text="Países:").grid(row=2, column=0, sticky=tk.W, pady=5)
+        self.combo_paises = self._crear_combo(frame, self.OPCIONES_PAISES, fila=2)
+        self.entrada_paises = ttk.Entry(frame)
+        self.entrada_paises.grid(row=2, column=2, sticky=tk.EW, pady=5)
+        ttk.Label(
+            frame,
+            text="(separados por espacio, ej: BR US CA)",
+            font=('Segoe UI', 8)
+        ).grid(row=3, column=2, sticky=tk.W)
+        
+        # Notas
+        ttk.Label(frame, text="Notas:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        self.combo_notas = self._crear_combo(frame, self.OPCIONES_NOTAS, fila=4)
+        self.entrada_notas = ttk.Entry(frame)
+        self.entrada_notas.grid(row=4, column=2, sticky=tk.EW, pady=5)
+        
+        # Botones
+        frame_botones = ttk.Frame(frame)
+        frame_botones.grid(row=5, column=0, columnspan=3, pady=20)
+        
+        ttk.Button(frame_botones, text="Aplicar", command=self._aplicar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Cancelar", command=self.dialogo.destroy).pack(side=tk.LEFT, padx=5)
+    
+    @staticmethod
+    def _crear_combo(frame: ttk.Frame, opciones: dict, fila: int) -> ttk.Combobox:
+        """Crea un desplegable de operación con la primera opción elegida."""
+        combo = ttk.Combobox(frame, values=list(opciones), state='readonly', width=16)
+        combo.current(0)
+        combo.grid(row=fila, column=1, sticky=tk.W, padx=(0, 10), pady=5)
+        return combo
+    
+    def _aplicar(self):
+        """Valida la edición y la entrega al callback."""
+        op_paises = self.OPCIONES_PAISES[self.combo_paises.get()]
+        paises = []
+        desconocidos = []
+        for pais in self.entrada_paises.get().strip().upper().split():
+            if pais not in CODIGOS_PAIS:
+                desconocidos.append(pais)
+            elif pais not in paises:
+                paises.append(pais)
+        if op_paises in (FIJAR, AÑADIR):
+            # Un código mal escrito no debe vaciar o dejar a medias los países de toda la selección
+            if desconocidos:
+                messagebox.showwarning(
+                    "Error",
+                    f"Códigos de país desconocidos: {' '.join(desconocidos)}\n\n"
+                    "Usa códigos de dos letras separados por espacio (ej: BR US CA).",
+                    parent=self.dialogo
+                )
+                return
+            if not paises:
+                mensaje = (
+                    "Indica los países a añadir." if op_paises == AÑADIR
+                    else "Indica los países a poner. Para quitarlos todos, elige \"Vaciar\"."
+                )
+                messagebox.showwarning("Error", mensaje, parent=self.dialogo)
+                return
+        
+        edicion = EdicionLote(
+            vpn=self.OPCIONES_VPN[self.combo_vpn.get()],
+            op_paises=op_paises,
+            paises=tuple(paises),
+            op_notas=self.OPCIONES_NOTAS[self.combo_notas.get()],
+            notas=self.entrada_notas.get().strip()
+        )
+        if edicion.es_vacia():
+            messagebox.showinfo("Sin cambios", "No se eligió ningún cambio.", parent=self.dialogo)
+            return
+        
+        self.dialogo.destroy()
+        self.on_aplicar(edicion)
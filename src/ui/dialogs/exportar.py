@@ -0,0 +1,107 @@
+"""
+Diálogo para configurar una exportación particionada.
+
+Permite elegir el criterio de partición, el tamaño de bloque y el formato.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Callable
+
+
+class DialogoExportarParticionado:
+    """
+    Diálogo modal con las opciones de exportación particionada.
+    
+    Al aceptar llama al callback con (criterio, formato, tamaño_bloque).
+    """
+    
+    CRITERIOS = [
+        ('pais', "Por país"),
+        ('dominio', "Por dominio"),
+        ('bloque', "Por bloques de N líneas"),
+    ]
+    
+    FORMATOS = ['txt', 'csv', 'jsonl']
+    
+    def __init__(
+        self,
+        parent: tk.Tk,
+        on_aceptar: Callable[[str, str, int], None]
+    ):
+        """
+        Inicializa el diálogo.
+        
+        Args:
+            parent: Ventana padre.
+            on_aceptar: Callback(criterio, formato, tamaño_bloque).
+        """
+        self.parent = parent
+        self.on_aceptar = on_aceptar
+        
+        self._crear_dialogo()
+    
+    def _crear_dialogo(self):
+        """Crea y muestra el diálogo."""
+        self.dialogo = tk.Toplevel(self.parent)
+        self.dialogo.title("Exportar particionado")
+        self.dialogo.transient(self.parent)
+        self.dialogo.grab_set()
+        self.dialogo.resizable(False, False)
+        
+        frame = ttk.Frame(self.dialogo, padding=15)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(frame, text="Dividir registros:").grid(row=0, column=0, columnspan=2, sticky=tk.W)
+        
+        self.var_criterio = tk.StringVar(value='pais')
+        for fila, (valor, texto) in enumerate(self.CRITERIOS, start=1):
+            ttk.Radiobutton(
+                frame,
+                text=texto,
+                value=valor,
+                variable=self.var_criterio
+            ).grid(row=fila, column=0, columnspan=2, sticky=tk.W, padx=(10, 0))
+        
+        ttk.Label(frame, text="Líneas por archivo:").grid(row=4, column=0, sticky=tk.W, pady=(10, 5))
+        self.var_tamaño = tk.StringVar(value="10000")
+        ttk.Spinbox(
+            frame,
+            from_=1,
+            to=10_000_000,
+            increment=1000,
+            textvariable=self.var_tamaño,
+            width=12
+        ).grid(row=4, column=1, sticky=tk.W, pady=(10, 5))
+        
+        ttk.Label(frame, text="Formato:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        self.combo_formato = ttk.Combobox(frame, values=self.FORMATOS, state='readonly', width=10)
+        self.combo_formato.set(self.FORMATOS[0])
+        self.combo_formato.grid(row=5, column=1, sticky=tk.W, pady=5)
+        
+        ttk.Label(
+            frame,
+            text="Se escribirá un archivo por partición y un manifest.json con los conteos.",
+            font=('Segoe UI', 8)
+        ).grid(row=6, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
+        frame_botones = ttk.Frame(frame)
+        frame_botones.grid(row=7, column=0, columnspan=2, pady=(15, 0))
+        
+        ttk.Button(frame_botones, text="Exportar...", command=self._aceptar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Cancelar", command=self.dialogo.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def _aceptar(self):
+        """Valida las opciones y llama al callback."""
+        try:
+            tamaño = int(self.var_tamaño.get())
+        except ValueError:
+            tamaño = 0
+        
+        criterio = self.var_criterio.get()
+        if criterio == 'bloque' and tamaño < 1:
+            messagebox.showwarning("Valor inválido", "Las líneas por archivo deben ser un número mayor que cero.")
+            return
+        
+        self.dialogo.destroy()
+        self.on_aceptar(criterio, self.combo_formato.get(), max(tamaño, 1))
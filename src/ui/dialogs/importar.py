@@ -4,13 +4,17 @@ Diálogo para importar registros desde texto.
 Permite pegar texto con múltiples registros y procesarlos.
 """
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, List
+from collections import Counter
+from typing import AbstractSet, Callable, Dict, List, Optional, Sequence, Union
 
 from ...models.registro import RegistroCorreo
 from ...services.parser import ParserCorreos
+from ...services.plantillas import PlantillaFormato, compilar_plantilla
 from ...config import MENSAJES
+from ..tareas import TareaSegundoPlano
 
 
 class DialogoImportar:
@@ -21,13 +25,42 @@ class DialogoImportar:
     - Área de texto para pegar contenido
     - Pega automáticamente desde portapapeles
     - Procesa múltiples formatos de entrada
+    - Validación en vivo: al editar solo se vuelven a parsear las líneas
+      cambiadas y se resaltan las válidas e inválidas
+    - Modo vista previa para portapapeles grandes: el texto se analiza
+      directamente en segundo plano y solo se muestran las primeras líneas
+    - Selector de formato: detección automática o una plantilla de formato
+      definida por el usuario (ver services/plantillas.py)
     """
     
+    # Opción del selector de formato que usa el parser heurístico
+    FORMATO_AUTOMATICO = "Automático"
+    
+    # Tamaño del portapapeles (caracteres) a partir del cual se usa la vista previa
+    UMBRAL_VISTA_PREVIA = 256 * 1024
+    
+    # Líneas que se muestran en la vista previa
+    LINEAS_VISTA_PREVIA = 200
+    
+    # Intervalo de refresco de los conteos en milisegundos
+    INTERVALO_CONTEOS = 100
+    
+    # Retardo de la validación en vivo tras la última edición (ms)
+    RETARDO_VALIDACION = 300
+    
+    # Por encima de estas líneas no se valida en vivo
+    MAX_LINEAS_EN_VIVO = 50000
+    
+    # Entradas máximas de la caché de líneas parseadas
+    MAX_CACHE_LINEAS = 100000
+    
     def __init__(
         self,
         parent: tk.Tk,
         titulo: str,
-        on_procesar: Callable[[List[RegistroCorreo]], None]
+        on_procesar: Callable[[List[RegistroCorreo]], None],
+        obtener_existentes: Optional[Callable[[], AbstractSet[str]]] = None,
+        plantillas: Sequence[PlantillaFormato] = ()
     ):
         """
         Inicializa el diálogo de importación.
@@ -36,10 +69,37 @@ class DialogoImportar:
             parent: Ventana padre.
             titulo: Título de la ventana.
             on_procesar: Callback con los registros procesados.
+            obtener_existentes: Callable con los emails base ya existentes
+                (para contar los nuevos en la vista previa).
+            plantillas: Plantillas de formato que se pueden elegir.
         """
         self.parent = parent
         self.titulo = titulo
         self.on_procesar = on_procesar
+        self.obtener_existentes = obtener_existentes
+        self.plantillas = {p.nombre: p for p in plantillas}
+        
+        # Parser de línea del formato elegido
+        self._parsear_linea: Callable[[str], Optional[RegistroCorreo]] = ParserCorreos.parsear_linea
+        
+        # Estado de la vista previa
+        self._vista_previa = False
+        self._texto_completo = ""
+        self._tarea: Optional[TareaSegundoPlano] = None
+        # Aviso de cancelación del análisis en curso (lo consulta el hilo auxiliar)
+        self._cancelado: Optional[threading.Event] = None
+        self._registros_analizados: Optional[List[RegistroCorreo]] = None
+        self._conteos = {}
+        
+        # Estado de la validación en vivo: por línea, None (vacía),
+        # False (inválida) o el email base (válida)
+        self._validacion_after_id = None
+        self._hashes_lineas: List[int] = []
+        self._estados_lineas: List[Union[None, bool, str]] = []
+        self._cache_lineas: Dict[str, Union[None, bool, str]] = {}
+        self._bases = Counter()
+        self._validas = 0
+        self._invalidas = 0
         
         self._crear_dialogo()
     
@@ -70,6 +130,23 @@ class DialogoImportar:
             font=('Consolas', 9)
         ).pack(anchor=tk.W, pady=(0, 10))
         
+        # Selector de formato
+        frame_formato = ttk.Frame(frame_principal)
+        frame_formato.pack(fill=tk.X, pady=(0, 10))
+        ttk.Label(frame_formato, text="Formato:").pack(side=tk.LEFT)
+        self.var_formato = tk.StringVar(value=self.FORMATO_AUTOMATICO)
+        combo_formato = ttk.Combobox(
+            frame_formato,
+            textvariable=self.var_formato,
+            values=[self.FORMATO_AUTOMATICO] + list(self.plantillas),
+            state='readonly',
+            width=30
+        )
+        combo_formato.pack(side=tk.LEFT, padx=5)
+        combo_formato.bind("<<ComboboxSelected>>", self._on_formato_cambiado)
+        self.etiqueta_formato = ttk.Label(frame_formato, text="", foreground='gray')
+        self.etiqueta_formato.pack(side=tk.LEFT, padx=5)
+        
         # Área de texto con scrollbar
         frame_texto = ttk.Frame(frame_principal)
         frame_texto.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -87,6 +164,14 @@ class DialogoImportar:
         scrollbar.config(command=self.texto_area.yview)
         self.texto_area.focus_set()
         
+        self.texto_area.tag_configure("linea_valida", foreground='#1b5e20')
+        self.texto_area.tag_configure("linea_invalida", background='#fde2e2')
+        self.texto_area.bind("<<Modified>>", self._on_modificado)
+        
+        # Conteos en vivo (validación o vista previa)
+        self.etiqueta_conteos = ttk.Label(frame_principal, text="", justify=tk.LEFT)
+        self.etiqueta_conteos.pack(anchor=tk.W, pady=(0, 10), before=frame_texto)
+        
         # Intentar pegar automáticamente desde portapapeles
         self._pegar_portapapeles()
         
@@ -103,9 +188,19 @@ class DialogoImportar:
         ttk.Button(
             frame_botones,
             text="Cancelar",
-            command=self.dialogo.destroy
+            command=self._cerrar
         ).pack(side=tk.LEFT, padx=5)
         
+        self.boton_texto_completo = ttk.Button(
+            frame_botones,
+            text="Editar texto completo",
+            command=self._salir_vista_previa
+        )
+        if self._vista_previa:
+            self.boton_texto_completo.pack(side=tk.RIGHT, padx=5)
+        
+        self.dialogo.protocol("WM_DELETE_WINDOW", self._cerrar)
+        
         # Atajo Ctrl+Enter para procesar
         self.texto_area.bind("<Control-Return>", lambda e: self._procesar())
     
@@ -113,14 +208,350 @@ class DialogoImportar:
         """Intenta pegar contenido del portapapeles automáticamente."""
         try:
             contenido = self.parent.clipboard_get()
-            if contenido.strip():
-                self.texto_area.insert("1.0", contenido)
-                self.texto_area.tag_add("sel", "1.0", tk.END)
         except tk.TclError:
-            pass
+            return
+        
+        if not contenido.strip():
+            return
+        
+        if len(contenido) > self.UMBRAL_VISTA_PREVIA:
+            self._iniciar_vista_previa(contenido)
+        else:
+            self.texto_area.insert("1.0", contenido)
+            self.texto_area.tag_add("sel", "1.0", tk.END)
+    
+    # ==================== Vista previa ====================
+    
+    def _iniciar_vista_previa(self, contenido: str):
+        """
+        Muestra solo las primeras líneas y analiza el texto en segundo plano.
+        
+        Args:
+            contenido: Texto completo del portapapeles.
+        """
+        self._vista_previa = True
+        self._texto_completo = contenido
+        
+        # Cortar en la N-ésima línea sin partir el texto completo
+        fin = -1
+        for _ in range(self.LINEAS_VISTA_PREVIA):
+            fin = contenido.find('\n', fin + 1)
+            if fin == -1:
+                break
+        muestra = contenido if fin == -1 else contenido[:fin]
+        total_lineas = contenido.count('\n') + 1
+        
+        self.texto_area.insert("1.0", muestra)
+        if fin != -1:
+            self.texto_area.insert(
+                tk.END,
+                f"\n\n… mostrando {self.LINEAS_VISTA_PREVIA} de {total_lineas} líneas"
+            )
+        self.texto_area.config(state=tk.DISABLED, background='#f4f4f4')
+        
+        self._conteos = {'lineas': total_lineas, 'procesadas': 0}
+        self._iniciar_analisis()
+    
+    def _iniciar_analisis(self):
+        """Analiza en segundo plano el texto completo de la vista previa."""
+        self._registros_analizados = None
+        self._refrescar_conteos()
+        self._cancelado = threading.Event()
+        self._tarea = TareaSegundoPlano(
+            self.dialogo,
+            self._analizar,
+            self._texto_completo,
+            self._parsear_linea,
+            self._cancelado,
+            on_terminado=self._analisis_terminado,
+            on_error=self._analisis_fallido
+        )
+    
+    def _analizar(
+        self,
+        contenido: str,
+        parsear_linea: Callable[[str], Optional[RegistroCorreo]],
+        cancelado: threading.Event
+    ) -> List[RegistroCorreo]:
+        """
+        Analiza el texto completo (hilo auxiliar) actualizando los conteos.
+        
+        Aplica la misma deduplicación por email base que
+        ParserCorreos.procesar_texto_a_registros.
+        
+        Args:
+            contenido: Texto completo a analizar.
+            parsear_linea: Parser de línea del formato elegido.
+            cancelado: Se activa al cancelar este análisis (cerrar el diálogo,
+                salir de la vista previa o cambiar de formato).
+        """
+        existentes = self.obtener_existentes() if self.obtener_existentes else set()
+        conteos = {
+            'lineas': self._conteos['lineas'],
+            'procesadas': 0,
+            'validas': 0,
+            'duplicadas': 0,
+            'nuevas': 0,
+            'vpn': 0,
+            'con_paises': 0
+        }
+        self._conteos = conteos
+        
+        registros = []
+        vistos = set()
+        for n, linea in enumerate(contenido.splitlines(), start=1):
+            if n % 5000 == 0:
+                if cancelado.is_set():
+                    return []
+                conteos['procesadas'] = n
+            
+            registro = parsear_linea(linea)
+            if not registro:
+                continue
+            conteos['validas'] += 1
+            
+            clave = registro.get_clave()
+            if clave in vistos:
+                conteos['duplicadas'] += 1
+                continue
+            vistos.add(clave)
+            registros.append(registro)
+            
+            if clave not in existentes:
+                conteos['nuevas'] += 1
+            if registro.vpn:
+                conteos['vpn'] += 1
+            if registro.paises:
+                conteos['con_paises'] += 1
+        
+        conteos['procesadas'] = conteos['lineas']
+        return registros
+    
+    def _refrescar_conteos(self):
+        """Actualiza la etiqueta de conteos mientras dura el análisis."""
+        if not self._vista_previa:
+            return
+        
+        c = self._conteos
+        texto = f"Líneas: {c.get('procesadas', 0)}/{c.get('lineas', 0)}"
+        if 'validas' in c:
+            texto += (
+                f"   •  Válidas: {c['validas']}"
+                f"   •  Duplicadas: {c['duplicadas']}"
+                f"   •  Nuevas: {c['nuevas']}"
+                f"   •  Con VPN: {c['vpn']}"
+                f"   •  Con países: {c['con_paises']}"
+            )
+        if self._registros_analizados is None:
+            texto += "   (analizando...)"
+            self.dialogo.after(self.INTERVALO_CONTEOS, self._refrescar_conteos)
+        self.etiqueta_conteos.config(text=texto)
+    
+    def _analisis_terminado(self, registros: List[RegistroCorreo]):
+        """Guarda el resultado del análisis de la vista previa."""
+        self._tarea = None
+        self._registros_analizados = registros
+        self._refrescar_conteos()
+    
+    def _analisis_fallido(self, error: BaseException):
+        """Informa de un error durante el análisis."""
+        self._tarea = None
+        self._registros_analizados = []
+        self._refrescar_conteos()
+        messagebox.showerror("Error", f"No se pudo analizar el texto: {error}", parent=self.dialogo)
+    
+    def _cancelar_analisis(self):
+        """Detiene el análisis en segundo plano en curso, si lo hay."""
+        if self._tarea is not None:
+            self._cancelado.set()
+            self._tarea.cancelar()
+            self._tarea = None
+    
+    def _salir_vista_previa(self):
+        """Carga el texto completo en el área de texto para editarlo."""
+        if not self._vista_previa:
+            return
+        self._cancelar_analisis()
+        
+        self._vista_previa = False
+        self.etiqueta_conteos.config(text="")
+        self.boton_texto_completo.pack_forget()
+        
+        self.texto_area.config(state=tk.NORMAL, background='white')
+        self.texto_area.delete("1.0", tk.END)
+        self.texto_area.insert("1.0", self._texto_completo)
+        self._texto_completo = ""
+        self._registros_analizados = None
+    
+    # ==================== Formato ====================
+    
+    def _on_formato_cambiado(self, event=None):
+        """Cambia el parser de línea y vuelve a validar o analizar el texto."""
+        nombre = self.var_formato.get()
+        plantilla = self.plantillas.get(nombre)
+        if plantilla is None:
+            self._parsear_linea = ParserCorreos.parsear_linea
+            self.etiqueta_formato.config(text="")
+        else:
+            parser, error = compilar_plantilla(plantilla)
+            if error:
+                messagebox.showerror("Formato inválido", error, parent=self.dialogo)
+                self.var_formato.set(self.FORMATO_AUTOMATICO)
+                self._on_formato_cambiado()
+                return
+            self._parsear_linea = parser.parsear_linea
+            self.etiqueta_formato.config(text=plantilla.describir())
+        
+        if self._vista_previa:
+            self._cancelar_analisis()
+            self._conteos = {'lineas': self._conteos.get('lineas', 0), 'procesadas': 0}
+            self._iniciar_analisis()
+        else:
+            self._cache_lineas.clear()
+            self._reiniciar_validacion()
+            self._validar_en_vivo()
+    
+    # ==================== Validación en vivo ====================
+    
+    def _on_modificado(self, event=None):
+        """Programa la validación tras una edición del texto."""
+        if not self.texto_area.edit_modified():
+            return
+        self.texto_area.edit_modified(False)
+        if self._vista_previa:
+            return
+        
+        if self._validacion_after_id is not None:
+            self.dialogo.after_cancel(self._validacion_after_id)
+        self._validacion_after_id = self.dialogo.after(
+            self.RETARDO_VALIDACION, self._validar_en_vivo
+        )
+    
+    def _validar_en_vivo(self):
+        """
+        Vuelve a validar solo el tramo de líneas que cambió.
+        
+        Compara los hashes de las líneas con los de la pasada anterior:
+        el prefijo y el sufijo comunes se conservan, y solo el tramo
+        intermedio se parsea y se vuelve a etiquetar.
+        """
+        self._validacion_after_id = None
+        if self._vista_previa:
+            return
+        
+        lineas = self.texto_area.get("1.0", "end-1c").split("\n")
+        if len(lineas) > self.MAX_LINEAS_EN_VIVO:
+            self._reiniciar_validacion()
+            self.etiqueta_conteos.config(
+                text=f"Validación en vivo desactivada ({len(lineas)} líneas)."
+            )
+            return
+        
+        hashes = [hash(linea) for linea in lineas]
+        anteriores = self._hashes_lineas
+        
+        inicio = 0
+        limite = min(len(anteriores), len(hashes))
+        while inicio < limite and anteriores[inicio] == hashes[inicio]:
+            inicio += 1
+        
+        fin_anterior, fin_nuevo = len(anteriores), len(hashes)
+        while (fin_anterior > inicio and fin_nuevo > inicio
+               and anteriores[fin_anterior - 1] == hashes[fin_nuevo - 1]):
+            fin_anterior -= 1
+            fin_nuevo -= 1
+        
+        for estado in self._estados_lineas[inicio:fin_anterior]:
+            self._contar_estado(estado, -1)
+        
+        nuevos = [self._estado_linea(linea) for linea in lineas[inicio:fin_nuevo]]
+        for estado in nuevos:
+            self._contar_estado(estado, 1)
+        
+        self._estados_lineas[inicio:fin_anterior] = nuevos
+        self._hashes_lineas = hashes
+        
+        if nuevos:
+            desde, hasta = f"{inicio + 1}.0", f"{fin_nuevo}.end"
+            self.texto_area.tag_remove("linea_valida", desde, hasta)
+            self.texto_area.tag_remove("linea_invalida", desde, hasta)
+            for numero, estado in enumerate(nuevos, start=inicio + 1):
+                if estado is None:
+                    continue
+                tag = "linea_invalida" if estado is False else "linea_valida"
+                self.texto_area.tag_add(tag, f"{numero}.0", f"{numero}.end")
+        
+        self._mostrar_totales_en_vivo()
+    
+    def _estado_linea(self, linea: str) -> Union[None, bool, str]:
+        """Parsea una línea (con caché) y retorna su estado."""
+        estado = self._cache_lineas.get(linea, True)
+        if estado is not True:
+            return estado
+        
+        if not linea.strip():
+            estado = None
+        else:
+            registro = self._parsear_linea(linea)
+            estado = registro.get_clave() if registro else False
+        
+        if len(self._cache_lineas) >= self.MAX_CACHE_LINEAS:
+            self._cache_lineas.clear()
+        self._cache_lineas[linea] = estado
+        return estado
+    
+    def _contar_estado(self, estado: Union[None, bool, str], signo: int):
+        """Suma o resta el estado de una línea a los totales."""
+        if estado is None:
+            return
+        if estado is False:
+            self._invalidas += signo
+            return
+        self._validas += signo
+        self._bases[estado] += signo
+        if self._bases[estado] <= 0:
+            del self._bases[estado]
+    
+    def _reiniciar_validacion(self):
+        """Descarta el estado de la validación en vivo."""
+        self._hashes_lineas = []
+        self._estados_lineas = []
+        self._bases = Counter()
+        self._validas = 0
+        self._invalidas = 0
+        self.texto_area.tag_remove("linea_valida", "1.0", tk.END)
+        self.texto_area.tag_remove("linea_invalida", "1.0", tk.END)
+    
+    def _mostrar_totales_en_vivo(self):
+        """Muestra los totales de la validación en vivo."""
+        if not (self._validas or self._invalidas):
+            self.etiqueta_conteos.config(text="")
+            return
+        duplicadas = self._validas - len(self._bases)
+        self.etiqueta_conteos.config(text=(
+            f"Válidas: {self._validas}"
+            f"   •  Inválidas: {self._invalidas}"
+            f"   •  Duplicadas: {duplicadas}"
+            f"   •  Únicas: {len(self._bases)}"
+        ))
+    
+    # ==================== Acciones ====================
+    
+    def _cerrar(self):
+        """Cierra el diálogo cancelando el análisis en curso."""
+        self._cancelar_analisis()
+        if self._validacion_after_id is not None:
+            self.dialogo.after_cancel(self._validacion_after_id)
+            self._validacion_after_id = None
+        self._vista_previa = False
+        self.dialogo.destroy()
     
     def _procesar(self):
         """Procesa el texto y llama al callback."""
+        if self._vista_previa:
+            self._procesar_vista_previa()
+            return
+        
         texto = self.texto_area.get("1.0", tk.END).strip()
         
         if not texto:
@@ -130,7 +561,7 @@ class DialogoImportar:
             )
             return
         
-        registros = ParserCorreos.procesar_texto_a_registros(texto)
+        registros = ParserCorreos.procesar_texto_a_registros(texto, self._parsear_linea)
         
         if not registros:
             messagebox.showwarning(*MENSAJES['sin_correos_validos'])
@@ -138,3 +569,21 @@ class DialogoImportar:
         
         self.dialogo.destroy()
         self.on_procesar(registros)
+    
+    def _procesar_vista_previa(self):
+        """Confirma los registros ya analizados sin volver a parsear."""
+        if self._registros_analizados is None:
+            messagebox.showinfo(
+                "Analizando",
+                "El texto todavía se está analizando. Espera a que terminen los conteos.",
+                parent=self.dialogo
+            )
+            return
+        
+        registros = self._registros_analizados
+        if not registros:
+            messagebox.showwarning(*MENSAJES['sin_correos_validos'], parent=self.dialogo)
+            return
+        
+        self._cerrar()
+        self.on_procesar(registros)
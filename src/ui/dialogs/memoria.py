@@ -0,0 +1,117 @@
+"""
+Diálogo de diagnóstico de memoria.
+
+Muestra el informe de memoria (instantáneas de tracemalloc, bytes por
+registro, sitios de asignación y estimación de la tabla en Tcl/Tk) y
+permite tomar instantáneas manuales y guardar el informe.
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from typing import Callable
+
+from ...services import memoria
+
+
+class DialogoMemoria:
+    """Ventana (no modal) con el informe de memoria."""
+    
+    def __init__(
+        self,
+        parent: tk.Tk,
+        obtener_informe: Callable[[], str],
+        on_instantanea: Callable[[], None]
+    ):
+        """
+        Inicializa el diálogo.
+        
+        Args:
+            parent: Ventana padre.
+            obtener_informe: Función que genera el texto del informe.
+            on_instantanea: Callback que toma una instantánea manual.
+        """
+        self.parent = parent
+        self.obtener_informe = obtener_informe
+        self.on_instantanea = on_instantanea
+        
+        self._crear_dialogo()
+        self._refrescar()
+    
+    def _crear_dialogo(self):
+        """Crea y muestra el diálogo."""
+        self.dialogo = tk.Toplevel(self.parent)
+        self.dialogo.title("Memoria")
+        self.dialogo.transient(self.parent)
+        self.dialogo.geometry("760x480")
+        
+        frame = ttk.Frame(self.dialogo, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        frame_texto = ttk.Frame(frame)
+        frame_texto.pack(fill=tk.BOTH, expand=True)
+        self.texto = tk.Text(frame_texto, wrap=tk.NONE, font=('Consolas', 9))
+        scroll = ttk.Scrollbar(frame_texto, orient=tk.VERTICAL, command=self.texto.yview)
+        self.texto.configure(yscrollcommand=scroll.set)
+        self.texto.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        frame_botones = ttk.Frame(frame)
+        frame_botones.pack(fill=tk.X, pady=(10, 0))
+        self.boton_seguimiento = ttk.Button(frame_botones, command=self._alternar_seguimiento)
+        self.boton_seguimiento.pack(side=tk.LEFT, padx=5)
+        self.boton_instantanea = ttk.Button(
+            frame_botones,
+            text="Tomar instantánea",
+            command=self._tomar_instantanea
+        )
+        self.boton_instantanea.pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Guardar informe...", command=self._guardar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Cerrar", command=self.dialogo.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def _refrescar(self):
+        """Regenera el informe y actualiza los botones."""
+        self.dialogo.config(cursor='watch')
+        self.dialogo.update_idletasks()
+        try:
+            informe = self.obtener_informe()
+        finally:
+            self.dialogo.config(cursor='')
+        
+        self.texto.config(state=tk.NORMAL)
+        self.texto.delete('1.0', tk.END)
+        self.texto.insert('1.0', informe)
+        self.texto.config(state=tk.DISABLED)
+        
+        activo = memoria.esta_activo()
+        self.boton_seguimiento.config(text="Detener seguimiento" if activo else "Iniciar seguimiento")
+        self.boton_instantanea.config(state=tk.NORMAL if activo else tk.DISABLED)
+    
+    def _alternar_seguimiento(self):
+        """Inicia o detiene tracemalloc."""
+        if memoria.esta_activo():
+            memoria.detener()
+        else:
+            memoria.iniciar()
+            self.on_instantanea()
+        self._refrescar()
+    
+    def _tomar_instantanea(self):
+        """Toma una instantánea manual y refresca el informe."""
+        self.on_instantanea()
+        self._refrescar()
+    
+    def _guardar(self):
+        """Guarda el informe actual en un archivo de texto."""
+        ruta = filedialog.asksaveasfilename(
+            parent=self.dialogo,
+            title="Guardar informe de memoria",
+            defaultextension=".txt",
+            filetypes=[("Texto", "*.txt"), ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        try:
+            with open(ruta, 'w', encoding='utf-8') as f:
+                f.write(self.texto.get('1.0', tk.END))
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar el informe: {e}", parent=self.dialogo)
@@ -0,0 +1,219 @@
+"""
+Diálogo de gestión de plantillas de formato de línea.
+
+Permite crear, editar, probar y eliminar las plantillas que luego se
+eligen en el diálogo de importación (ver services/plantillas.py).
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Callable, List, Optional
+
+from ...services.plantillas import CAMPOS, PlantillaFormato, compilar_plantilla, normalizar_campo
+
+
+class DialogoPlantillas:
+    """
+    Diálogo con la lista de plantillas y un formulario para editarlas.
+    
+    Cada cambio guardado se entrega completo al callback, que se encarga
+    de persistirlo.
+    """
+    
+    def __init__(
+        self,
+        parent: tk.Tk,
+        plantillas: List[PlantillaFormato],
+        on_guardar: Callable[[List[PlantillaFormato]], bool]
+    ):
+        """
+        Inicializa el diálogo.
+        
+        Args:
+            parent: Ventana padre.
+            plantillas: Plantillas actuales.
+            on_guardar: Callback con la lista completa de plantillas;
+                retorna True si se pudieron guardar.
+        """
+        self.parent = parent
+        self.plantillas = list(plantillas)
+        self.on_guardar = on_guardar
+        
+        self._crear_dialogo()
+        self._refrescar_lista()
+    
+    def _crear_dialogo(self):
+        """Crea y muestra el diálogo."""
+        self.dialogo = tk.Toplevel(self.parent)
+        self.dialogo.title("Formatos de línea")
+        self.dialogo.transient(self.parent)
+        self.dialogo.grab_set()
+        self.dialogo.geometry("720x400")
+        
+        frame = ttk.Frame(self.dialogo, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Lista de plantillas
+        frame_lista = ttk.Frame(frame)
+        frame_lista.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 10))
+        self.lista = tk.Listbox(frame_lista, width=24, exportselection=False)
+        self.lista.pack(fill=tk.Y, expand=True)
+        self.lista.bind("<<ListboxSelect>>", self._on_seleccion)
+        ttk.Button(frame_lista, text="Nueva", command=self._nueva).pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(frame_lista, text="Eliminar", command=self._eliminar).pack(fill=tk.X, pady=(5, 0))
+        
+        # Formulario
+        formulario = ttk.Frame(frame)
+        formulario.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        formulario.grid_columnconfigure(1, weight=1)
+        
+        self.var_nombre = tk.StringVar()
+        self.var_tipo = tk.StringVar(value='delimitado')
+        self.var_delimitador = tk.StringVar(value=';')
+        self.var_campos = tk.StringVar()
+        self.var_patron = tk.StringVar()
+        self.var_prueba = tk.StringVar()
+        
+        ttk.Label(formulario, text="Nombre:").grid(row=0, column=0, sticky='w', pady=2)
+        ttk.Entry(formulario, textvariable=self.var_nombre).grid(row=0, column=1, sticky='ew', pady=2)
+        
+        frame_tipo = ttk.Frame(formulario)
+        frame_tipo.grid(row=1, column=0, columnspan=2, sticky='w', pady=(6, 2))
+        ttk.Radiobutton(
+            frame_tipo, text="Delimitador y campos", value='delimitado',
+            variable=self.var_tipo, command=self._actualizar_prueba
+        ).pack(side=tk.LEFT)
+        ttk.Radiobutton(
+            frame_tipo, text="Expresión regular", value='regex',
+            variable=self.var_tipo, command=self._actualizar_prueba
+        ).pack(side=tk.LEFT, padx=10)
+        
+        ttk.Label(formulario, text="Delimitador:").grid(row=2, column=0, sticky='w', pady=2)
+        ttk.Entry(formulario, textvariable=self.var_delimitador, width=6).grid(row=2, column=1, sticky='w', pady=2)
+        ttk.Label(formulario, text="Campos:").grid(row=3, column=0, sticky='w', pady=2)
+        ttk.Entry(formulario, textvariable=self.var_campos).grid(row=3, column=1, sticky='ew', pady=2)
+        ttk.Label(
+            formulario,
+            text=f"En orden y separados por el delimitador. Campos: {', '.join(CAMPOS)} ('_' ignora la columna)",
+            foreground='gray', wraplength=420, justify=tk.LEFT
+        ).grid(row=4, column=1, sticky='w')
+        
+        ttk.Label(formulario, text="Patrón:").grid(row=5, column=0, sticky='w', pady=(8, 2))
+        ttk.Entry(formulario, textvariable=self.var_patron).grid(row=5, column=1, sticky='ew', pady=(8, 2))
+        ttk.Label(
+            formulario,
+            text="Grupos con nombre, ej: ^(?P<correo>\\S+) \\[(?P<paises>[^\\]]*)\\] (?P<notas>.*)$",
+            foreground='gray', wraplength=420, justify=tk.LEFT
+        ).grid(row=6, column=1, sticky='w')
+        
+        ttk.Label(formulario, text="Probar línea:").grid(row=7, column=0, sticky='w', pady=(12, 2))
+        ttk.Entry(formulario, textvariable=self.var_prueba).grid(row=7, column=1, sticky='ew', pady=(12, 2))
+        self.etiqueta_prueba = ttk.Label(formulario, text="", wraplength=420, justify=tk.LEFT)
+        self.etiqueta_prueba.grid(row=8, column=1, sticky='w')
+        
+        for variable in (self.var_delimitador, self.var_campos, self.var_patron, self.var_prueba):
+            variable.trace_add('write', lambda *_: self._actualizar_prueba())
+        
+        frame_botones = ttk.Frame(formulario)
+        frame_botones.grid(row=9, column=0, columnspan=2, sticky='ew', pady=(15, 0))
+        ttk.Button(frame_botones, text="Guardar formato", command=self._guardar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Cerrar", command=self.dialogo.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def _refrescar_lista(self, seleccionar: Optional[str] = None):
+        """Vuelve a llenar la lista de plantillas."""
+        self.lista.delete(0, tk.END)
+        for i, plantilla in enumerate(self.plantillas):
+            self.lista.insert(tk.END, plantilla.nombre)
+            if plantilla.nombre == seleccionar:
+                self.lista.selection_set(i)
+    
+    def _on_seleccion(self, event=None):
+        """Carga en el formulario la plantilla seleccionada."""
+        seleccion = self.lista.curselection()
+        if not seleccion:
+            return
+        plantilla = self.plantillas[seleccion[0]]
+        self.var_nombre.set(plantilla.nombre)
+        self.var_tipo.set('regex' if plantilla.es_regex else 'delimitado')
+        self.var_delimitador.set(plantilla.delimitador)
+        self.var_campos.set(plantilla.delimitador.join(plantilla.campos))
+        self.var_patron.set(plantilla.patron)
+    
+    def _nueva(self):
+        """Limpia el formulario para una plantilla nueva."""
+        self.lista.selection_clear(0, tk.END)
+        self.var_nombre.set("")
+        self.var_tipo.set('delimitado')
+        self.var_delimitador.set(';')
+        self.var_campos.set("")
+        self.var_patron.set("")
+    
+    def _plantilla_formulario(self) -> PlantillaFormato:
+        """Construye la plantilla con los valores del formulario."""
+        if self.var_tipo.get() == 'regex':
+            return PlantillaFormato(self.var_nombre.get().strip(), patron=self.var_patron.get())
+        delimitador = self.var_delimitador.get()
+        texto = self.var_campos.get()
+        campos = texto.split(delimitador) if delimitador else [texto]
+        return PlantillaFormato(
+            self.var_nombre.get().strip(),
+            delimitador=delimitador,
+            campos=tuple(normalizar_campo(c) for c in campos if c.strip())
+        )
+    
+    def _actualizar_prueba(self):
+        """Muestra cómo se lee la línea de prueba con el formulario actual."""
+        linea = self.var_prueba.get()
+        if not linea:
+            self.etiqueta_prueba.config(text="", foreground='')
+            return
+        parser, error = compilar_plantilla(self._plantilla_formulario())
+        if error:
+            self.etiqueta_prueba.config(text=error, foreground='#b71c1c')
+            return
+        registro = parser.parsear_linea(linea)
+        if registro is None:
+            self.etiqueta_prueba.config(text="La línea no tiene un correo válido.", foreground='#b71c1c')
+            return
+        self.etiqueta_prueba.config(
+            text=(
+                f"Correo: {registro.correo}   VPN: {'Sí' if registro.vpn else 'No'}\n"
+                f"Países: {' '.join(registro.paises) or '-'}   Notas: {registro.notas or '-'}"
+            ),
+            foreground='#1b5e20'
+        )
+    
+    def _guardar(self):
+        """Valida y guarda la plantilla del formulario."""
+        plantilla = self._plantilla_formulario()
+        if not plantilla.nombre:
+            messagebox.showwarning("Sin nombre", "Indica un nombre para el formato.", parent=self.dialogo)
+            return
+        _, error = compilar_plantilla(plantilla)
+        if error:
+            messagebox.showerror("Formato inválido", error, parent=self.dialogo)
+            return
+        
+        seleccion = self.lista.curselection()
+        anterior = self.plantillas[seleccion[0]].nombre if seleccion else plantilla.nombre
+        plantillas = [p for p in self.plantillas if p.nombre not in (anterior, plantilla.nombre)]
+        plantillas.append(plantilla)
+        if self.on_guardar(plantillas):
+            self.plantillas = plantillas
+            self._refrescar_lista(seleccionar=plantilla.nombre)
+    
+    def _eliminar(self):
+        """Elimina la plantilla seleccionada."""
+        seleccion = self.lista.curselection()
+        if not seleccion:
+            return
+        plantilla = self.plantillas[seleccion[0]]
+        if not messagebox.askyesno(
+            "Eliminar formato", f"¿Eliminar el formato \"{plantilla.nombre}\"?", parent=self.dialogo
+        ):
+            return
+        plantillas = [p for p in self.plantillas if p is not plantilla]
+        if self.on_guardar(plantillas):
+            self.plantillas = plantillas
+            self._refrescar_lista()
+            self._nueva()
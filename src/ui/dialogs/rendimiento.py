@@ -0,0 +1,165 @@
+"""
+Diálogo de rendimiento.
+
+Muestra los tiempos recientes de las operaciones instrumentadas con sus
+percentiles y los contadores, y permite capturar un perfil de cProfile
+de la siguiente operación.
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog
+from typing import Callable, Optional
+
+from ...services import instrumentacion
+
+
+class DialogoRendimiento:
+    """
+    Ventana (no modal) con las estadísticas de instrumentación.
+    
+    Se refresca sola mientras está abierta.
+    """
+    
+    # Intervalo de refresco en milisegundos
+    INTERVALO_REFRESCO = 1000
+    
+    COLUMNAS = [
+        ("Operación", 190),
+        ("Veces", 60),
+        ("Última (ms)", 80),
+        ("p50 (ms)", 70),
+        ("p90 (ms)", 70),
+        ("p99 (ms)", 70),
+        ("Máx (ms)", 70),
+    ]
+    
+    def __init__(
+        self,
+        parent: tk.Tk,
+        on_alternar: Optional[Callable[[bool], None]] = None
+    ):
+        """
+        Inicializa el diálogo.
+        
+        Args:
+            parent: Ventana padre.
+            on_alternar: Callback(activa) al activar o desactivar la instrumentación.
+        """
+        self.parent = parent
+        self.on_alternar = on_alternar
+        self._after_id = None
+        self._mensaje_perfil = ""
+        
+        self._crear_dialogo()
+        self._refrescar()
+    
+    def _crear_dialogo(self):
+        """Crea y muestra el diálogo."""
+        self.dialogo = tk.Toplevel(self.parent)
+        self.dialogo.title("Rendimiento")
+        self.dialogo.transient(self.parent)
+        self.dialogo.geometry("700x460")
+        self.dialogo.protocol("WM_DELETE_WINDOW", self._cerrar)
+        
+        frame = ttk.Frame(self.dialogo, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.var_activa = tk.BooleanVar(value=instrumentacion.esta_activa())
+        ttk.Checkbutton(
+            frame,
+            text="Instrumentación activa",
+            variable=self.var_activa,
+            command=self._alternar
+        ).pack(anchor=tk.W)
+        
+        nombres = [titulo for titulo, _ in self.COLUMNAS]
+        self.tabla = ttk.Treeview(frame, columns=nombres, show='headings', height=10)
+        for titulo, ancho in self.COLUMNAS:
+            self.tabla.heading(titulo, text=titulo)
+            self.tabla.column(titulo, width=ancho, anchor=tk.W if titulo == "Operación" else tk.E)
+        self.tabla.pack(fill=tk.BOTH, expand=True, pady=(10, 5))
+        
+        ttk.Label(frame, text="Contadores:").pack(anchor=tk.W)
+        self.etiqueta_contadores = ttk.Label(frame, text="", justify=tk.LEFT, font=('Consolas', 9))
+        self.etiqueta_contadores.pack(anchor=tk.W, pady=(0, 5))
+        
+        self.etiqueta_perfil = ttk.Label(frame, text="", foreground='#666666')
+        self.etiqueta_perfil.pack(anchor=tk.W)
+        
+        frame_botones = ttk.Frame(frame)
+        frame_botones.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(
+            frame_botones,
+            text="Perfilar siguiente operación...",
+            command=self._capturar_perfil
+        ).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Limpiar", command=self._limpiar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Cerrar", command=self._cerrar).pack(side=tk.RIGHT, padx=5)
+    
+    def _refrescar(self):
+        """Vuelve a leer las estadísticas y programa el siguiente refresco."""
+        items = self.tabla.get_children()
+        if items:
+            self.tabla.delete(*items)
+        for nombre, veces, ultima, p50, p90, p99, maximo in instrumentacion.get_estadisticas():
+            self.tabla.insert("", tk.END, values=(
+                nombre, veces,
+                f"{ultima:.1f}", f"{p50:.1f}", f"{p90:.1f}", f"{p99:.1f}", f"{maximo:.1f}"
+            ))
+        
+        contadores = instrumentacion.get_contadores()
+        self.etiqueta_contadores.config(
+            text="\n".join(f"  {nombre}: {valor}" for nombre, valor in sorted(contadores.items()))
+            or "  (sin datos)"
+        )
+        
+        if instrumentacion.hay_perfil_pendiente():
+            texto = "Perfil pendiente: se capturará la siguiente operación medida."
+        else:
+            texto = self._mensaje_perfil
+        self.etiqueta_perfil.config(text=texto)
+        
+        self._after_id = self.dialogo.after(self.INTERVALO_REFRESCO, self._refrescar)
+    
+    def _alternar(self):
+        """Activa o desactiva la instrumentación."""
+        activa = self.var_activa.get()
+        if self.on_alternar:
+            self.on_alternar(activa)
+        else:
+            instrumentacion.activar(activa)
+    
+    def _capturar_perfil(self):
+        """Pide el archivo de salida y deja pendiente la captura."""
+        ruta = filedialog.asksaveasfilename(
+            parent=self.dialogo,
+            title="Guardar perfil",
+            defaultextension=".prof",
+            filetypes=[("Perfil cProfile", "*.prof"), ("Todos los archivos", "*.*")]
+        )
+        if not ruta:
+            return
+        
+        instrumentacion.capturar_perfil(ruta, self._perfil_capturado)
+        self.var_activa.set(True)
+        if self.on_alternar:
+            self.on_alternar(True)
+    
+    def _perfil_capturado(self, ruta: str, operacion: str, error: Optional[str]):
+        """Guarda el resultado de la captura (puede llamarse desde otro hilo)."""
+        if error:
+            self._mensaje_perfil = f"No se pudo guardar el perfil: {error}"
+        else:
+            self._mensaje_perfil = f"Perfil de '{operacion}' guardado en {ruta}"
+    
+    def _limpiar(self):
+        """Descarta las muestras acumuladas."""
+        instrumentacion.limpiar()
+        self._mensaje_perfil = ""
+    
+    def _cerrar(self):
+        """Cancela el refresco y cierra la ventana."""
+        if self._after_id is not None:
+            self.dialogo.after_cancel(self._after_id)
+            self._after_id = None
+        self.dialogo.destroy()
@@ -0,0 +1,170 @@
+"""
+Diálogo de correos casi duplicados.
+
+Muestra los grupos de registros con correos casi iguales (ver
+services/similares.py) y permite fusionar cada grupo en uno de sus
+registros o eliminar los registros seleccionados.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Callable, Dict, List, Tuple
+
+from ...models.registro import RegistroCorreo
+
+
+class DialogoSimilares:
+    """
+    Diálogo con los grupos de casi duplicados.
+    
+    Los cambios se aplican a través de los callbacks, que reciben los
+    registros (no posiciones) para que sigan siendo válidos aunque la
+    lista cambie entre una acción y otra.
+    """
+    
+    COLUMNAS = [("VPN", 50), ("Países", 90), ("Notas", 200)]
+    
+    # Grupos que se insertan en la tabla (los más grandes primero)
+    MAX_GRUPOS_VISIBLES = 500
+    
+    def __init__(
+        self,
+        parent: tk.Tk,
+        grupos: List[List[RegistroCorreo]],
+        on_fusionar: Callable[[List[Tuple[RegistroCorreo, List[RegistroCorreo]]]], None],
+        on_eliminar: Callable[[List[RegistroCorreo]], None]
+    ):
+        """
+        Inicializa el diálogo.
+        
+        Args:
+            parent: Ventana padre.
+            grupos: Registros de cada grupo de casi duplicados.
+            on_fusionar: Callback con la lista de (registro a conservar, resto del grupo).
+            on_eliminar: Callback con los registros a eliminar.
+        """
+        self.parent = parent
+        self.grupos = grupos
+        self.on_fusionar = on_fusionar
+        self.on_eliminar = on_eliminar
+        
+        # iid de fila -> (número de grupo, registro)
+        self._filas: Dict[str, Tuple[int, RegistroCorreo]] = {}
+        
+        self._crear_dialogo()
+    
+    def _crear_dialogo(self):
+        """Crea y muestra el diálogo."""
+        self.dialogo = tk.Toplevel(self.parent)
+        self.dialogo.title("Correos casi duplicados")
+        self.dialogo.transient(self.parent)
+        self.dialogo.grab_set()
+        self.dialogo.geometry("760x460")
+        
+        frame = ttk.Frame(self.dialogo, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        total = sum(len(grupo) for grupo in self.grupos)
+        resumen = f"Se encontraron {len(self.grupos)} grupos con {total} registros en total."
+        if len(self.grupos) > self.MAX_GRUPOS_VISIBLES:
+            resumen += f"\nSe muestran los {self.MAX_GRUPOS_VISIBLES} grupos más grandes."
+        resumen += "\nSelecciona el registro a conservar de cada grupo para fusionarlo, o los registros a eliminar."
+        ttk.Label(frame, text=resumen, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 10))
+        
+        frame_tabla = ttk.Frame(frame)
+        frame_tabla.pack(fill=tk.BOTH, expand=True)
+        
+        nombres = [titulo for titulo, _ in self.COLUMNAS]
+        self.tabla = ttk.Treeview(frame_tabla, columns=nombres, show='tree headings', height=14)
+        self.tabla.heading('#0', text="Correo")
+        self.tabla.column('#0', width=320, anchor=tk.W)
+        for titulo, ancho in self.COLUMNAS:
+            self.tabla.heading(titulo, text=titulo)
+            self.tabla.column(titulo, width=ancho, anchor=tk.W)
+        
+        scrollbar = ttk.Scrollbar(frame_tabla, orient=tk.VERTICAL, command=self.tabla.yview)
+        self.tabla.config(yscrollcommand=scrollbar.set)
+        self.tabla.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        for numero, grupo in enumerate(self.grupos[:self.MAX_GRUPOS_VISIBLES]):
+            padre = self.tabla.insert(
+                "", tk.END, iid=f"g{numero}",
+                text=f"Grupo {numero + 1} ({len(grupo)})", open=True
+            )
+            for posicion, reg in enumerate(grupo):
+                iid = f"{numero}.{posicion}"
+                self.tabla.insert(padre, tk.END, iid=iid, text=reg.correo, values=(
+                    "✓" if reg.vpn else "", " ".join(reg.paises), reg.notas
+                ))
+                self._filas[iid] = (numero, reg)
+        
+        frame_botones = ttk.Frame(frame)
+        frame_botones.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(frame_botones, text="Fusionar en el seleccionado", command=self._fusionar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Eliminar seleccionados", command=self._eliminar).pack(side=tk.LEFT, padx=5)
+        ttk.Button(frame_botones, text="Cerrar", command=self.dialogo.destroy).pack(side=tk.RIGHT, padx=5)
+    
+    def _seleccion(self) -> List[str]:
+        """Filas de registro seleccionadas (sin las cabeceras de grupo)."""
+        return [iid for iid in self.tabla.selection() if iid in self._filas]
+    
+    def _registros_grupo(self, numero: int) -> List[Tuple[str, RegistroCorreo]]:
+        """Filas que quedan en un grupo, con su registro."""
+        return [(iid, self._filas[iid][1]) for iid in self.tabla.get_children(f"g{numero}")]
+    
+    def _quitar_filas(self, iids: List[str]):
+        """Quita filas de la tabla y los grupos que se quedan con menos de dos."""
+        grupos = {self._filas.pop(iid)[0] for iid in iids}
+        self.tabla.delete(*iids)
+        for numero in grupos:
+            restantes = self.tabla.get_children(f"g{numero}")
+            if len(restantes) < 2:
+                for iid in restantes:
+                    self._filas.pop(iid, None)
+                self.tabla.delete(f"g{numero}")
+    
+    def _fusionar(self):
+        """Fusiona cada grupo con selección en su primer registro seleccionado."""
+        conservar: Dict[int, str] = {}
+        for iid in self._seleccion():
+            conservar.setdefault(self._filas[iid][0], iid)
+        if not conservar:
+            messagebox.showinfo(
+                "Sin selección", "Selecciona el registro a conservar de cada grupo.", parent=self.dialogo
+            )
+            return
+        
+        fusiones = []
+        quitar = []
+        for numero, elegido in conservar.items():
+            filas = self._registros_grupo(numero)
+            fusiones.append((self._filas[elegido][1], [reg for iid, reg in filas if iid != elegido]))
+            quitar.extend(iid for iid, _ in filas)
+        
+        otros = sum(len(resto) for _, resto in fusiones)
+        if not messagebox.askyesno(
+            "Confirmar fusión",
+            f"Se fusionarán {len(fusiones)} grupos y se eliminarán {otros} registros.\n\n"
+            "El registro conservado recibe la VPN, los países y las notas del resto.",
+            parent=self.dialogo
+        ):
+            return
+        self._quitar_filas(quitar)
+        self.on_fusionar(fusiones)
+    
+    def _eliminar(self):
+        """Elimina los registros seleccionados."""
+        seleccion = self._seleccion()
+        if not seleccion:
+            messagebox.showinfo("Sin selección", "Selecciona los registros a eliminar.", parent=self.dialogo)
+            return
+        if not messagebox.askyesno(
+            "Confirmar eliminación",
+            f"¿Eliminar {len(seleccion)} registro(s) de la lista?",
+            parent=self.dialogo
+        ):
+            return
+        registros = [self._filas[iid][1] for iid in seleccion]
+        self._quitar_filas(seleccion)
+        self.on_eliminar(registros)
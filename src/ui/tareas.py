@@ -0,0 +1,95 @@
+"""
+Ejecución de tareas en segundo plano para la interfaz.
+
+Tkinter no es seguro entre hilos: el trabajo pesado se hace en un hilo
+auxiliar y el resultado se recoge desde el hilo de la interfaz mediante
+after(), donde se invocan los callbacks.
+"""
+
+import threading
+import tkinter as tk
+from typing import Any, Callable, Optional
+
+
+# Intervalo de sondeo del resultado en milisegundos
+INTERVALO_SONDEO = 50
+
+
+class TareaSegundoPlano:
+    """
+    Tarea ejecutada en un hilo auxiliar con callbacks en el hilo de la interfaz.
+    
+    Attributes:
+        terminada: Indica si la función ya retornó (o falló).
+        cancelada: Indica si se pidió cancelar; la función puede consultarlo.
+    """
+    
+    def __init__(
+        self,
+        widget: tk.Misc,
+        funcion: Callable[..., Any],
+        *args,
+        on_terminado: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None
+    ):
+        """
+        Lanza la tarea.
+        
+        Args:
+            widget: Widget cuyo bucle de eventos recoge el resultado.
+            funcion: Función a ejecutar en el hilo auxiliar.
+            *args: Argumentos para la función.
+            on_terminado: Callback(resultado) en el hilo de la interfaz.
+            on_error: Callback(excepción) en el hilo de la interfaz.
+        """
+        self.widget = widget
+        self.on_terminado = on_terminado
+        self.on_error = on_error
+        
+        self.terminada = False
+        self.cancelada = False
+        self._resultado = None
+        self._error: Optional[BaseException] = None
+        
+        self._hilo = threading.Thread(target=self._ejecutar, args=(funcion, args), daemon=True)
+        self._hilo.start()
+        self._after_id = widget.after(INTERVALO_SONDEO, self._sondear)
+    
+    def cancelar(self):
+        """Descarta el resultado; la función sigue hasta que consulte `cancelada`."""
+        self.cancelada = True
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+    
+    def _ejecutar(self, funcion: Callable[..., Any], args: tuple):
+        """Cuerpo del hilo auxiliar."""
+        try:
+            self._resultado = funcion(*args)
+        except Exception as e:
+            self._error = e
+        self.terminada = True
+    
+    def _sondear(self):
+        """Comprueba desde el hilo de la interfaz si la tarea terminó."""
+        self._after_id = None
+        if self.cancelada:
+            return
+        if not self.terminada:
+            try:
+                self._after_id = self.widget.after(INTERVALO_SONDEO, self._sondear)
+            except tk.TclError:
+                # El widget fue destruido mientras la tarea seguía en curso
+                self.cancelada = True
+            return
+        
+        if self._error is not None:
+            if self.on_error:
+                self.on_error(self._error)
+            else:
+                raise self._error
+        elif self.on_terminado:
+            self.on_terminado(self._resultado)